@@ -0,0 +1,206 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import aiohttp
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    method: str
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+    payload: Optional[Any] = None
+
+
+@dataclass
+class HttpOutcome:
+    status_code: Optional[int]
+    latency_ms: float
+    response_bytes: int
+    error: Optional[str]
+    body: Optional[bytes] = None
+    corrected_latency_ms: Optional[float] = None
+
+
+async def send_request(
+    session: aiohttp.ClientSession,
+    spec: RequestSpec,
+    keep_body: bool = False,
+) -> HttpOutcome:
+    started = time.perf_counter()
+    try:
+        async with session.request(spec.method, spec.url, headers=spec.headers, json=spec.payload) as response:
+            body = await response.read()
+            latency_ms = (time.perf_counter() - started) * 1000
+            return HttpOutcome(
+                status_code=response.status,
+                latency_ms=latency_ms,
+                response_bytes=len(body),
+                error=None,
+                body=body if keep_body else None,
+            )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        latency_ms = (time.perf_counter() - started) * 1000
+        return HttpOutcome(
+            status_code=None,
+            latency_ms=latency_ms,
+            response_bytes=0,
+            error=type(exc).__name__,
+        )
+
+
+def create_session(concurrency: int, timeout_sec: float) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency, keepalive_timeout=60)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout_sec),
+    )
+
+
+async def _wait_until(start_at: Optional[float]) -> None:
+    if start_at is not None:
+        delay = start_at - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _run_closed_loop(
+    spec_for: Callable[[int], RequestSpec],
+    limit: Optional[int],
+    duration_sec: Optional[float],
+    concurrency: int,
+    timeout_sec: float,
+    warmup_specs: list[RequestSpec],
+    keep_body: bool,
+    start_at: Optional[float],
+    on_outcome: Optional[Callable[[HttpOutcome], None]],
+) -> tuple[list[HttpOutcome], float]:
+    async with create_session(concurrency, timeout_sec) as session:
+        for spec in warmup_specs:
+            await send_request(session, spec)
+        await _wait_until(start_at)
+
+        outcomes: list[HttpOutcome] = []
+        record = on_outcome or outcomes.append
+        next_index = 0
+        started = time.perf_counter()
+        deadline = started + duration_sec if duration_sec is not None else None
+
+        async def worker() -> None:
+            nonlocal next_index
+            while (limit is None or next_index < limit) and (deadline is None or time.perf_counter() < deadline):
+                spec = spec_for(next_index)
+                next_index += 1
+                record(await send_request(session, spec, keep_body))
+
+        workers = concurrency if limit is None else min(concurrency, limit)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return outcomes, time.perf_counter() - started
+
+
+async def _run_open_loop(
+    spec: RequestSpec,
+    rate: float,
+    duration_sec: float,
+    concurrency: int,
+    timeout_sec: float,
+    warmup_specs: list[RequestSpec],
+    start_at: Optional[float],
+    on_outcome: Optional[Callable[[HttpOutcome], None]],
+) -> tuple[list[HttpOutcome], float]:
+    async with create_session(concurrency, timeout_sec) as session:
+        for warmup_spec in warmup_specs:
+            await send_request(session, warmup_spec)
+        await _wait_until(start_at)
+
+        outcomes: list[HttpOutcome] = []
+        record = on_outcome or outcomes.append
+        in_flight = asyncio.Semaphore(concurrency)
+        total_requests = max(int(rate * duration_sec), 1)
+
+        async def fire(intended_at: float) -> None:
+            async with in_flight:
+                outcome = await send_request(session, spec)
+            outcome.corrected_latency_ms = (time.perf_counter() - intended_at) * 1000
+            record(outcome)
+
+        loop = asyncio.get_running_loop()
+        tasks: set[asyncio.Task] = set()
+        started = time.perf_counter()
+        for index in range(total_requests):
+            intended_at = started + index / rate
+            delay = intended_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = loop.create_task(fire(intended_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return outcomes, time.perf_counter() - started
+
+
+def run_open_loop(
+    spec: RequestSpec,
+    rate: float,
+    duration_sec: float,
+    concurrency: int,
+    timeout_sec: float,
+    warmup_specs: Optional[list[RequestSpec]] = None,
+    start_at: Optional[float] = None,
+    on_outcome: Optional[Callable[[HttpOutcome], None]] = None,
+) -> tuple[list[HttpOutcome], float]:
+    return asyncio.run(
+        _run_open_loop(spec, rate, duration_sec, concurrency, timeout_sec, warmup_specs or [], start_at, on_outcome)
+    )
+
+
+def run_requests(
+    specs: list[RequestSpec],
+    concurrency: int,
+    timeout_sec: float,
+    warmup_specs: Optional[list[RequestSpec]] = None,
+    keep_body: bool = False,
+    start_at: Optional[float] = None,
+    on_outcome: Optional[Callable[[HttpOutcome], None]] = None,
+) -> tuple[list[HttpOutcome], float]:
+    return asyncio.run(
+        _run_closed_loop(
+            specs.__getitem__,
+            len(specs),
+            None,
+            concurrency,
+            timeout_sec,
+            warmup_specs or [],
+            keep_body,
+            start_at,
+            on_outcome,
+        )
+    )
+
+
+def run_for_duration(
+    spec_for: Callable[[int], RequestSpec],
+    duration_sec: float,
+    concurrency: int,
+    timeout_sec: float,
+    warmup_specs: Optional[list[RequestSpec]] = None,
+    keep_body: bool = False,
+    start_at: Optional[float] = None,
+    on_outcome: Optional[Callable[[HttpOutcome], None]] = None,
+) -> tuple[list[HttpOutcome], float]:
+    return asyncio.run(
+        _run_closed_loop(
+            spec_for,
+            None,
+            duration_sec,
+            concurrency,
+            timeout_sec,
+            warmup_specs or [],
+            keep_body,
+            start_at,
+            on_outcome,
+        )
+    )
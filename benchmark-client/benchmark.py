@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 import argparse
+import itertools
 import json
-import math
-import statistics
 import threading
 import time
 import warnings
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 # Suppress urllib3 LibreSSL runtime warning on macOS system Python.
 warnings.filterwarnings(
@@ -20,8 +19,13 @@ warnings.filterwarnings(
 
 import requests
 
+from histogram import LatencyHistogram
+from resource_sampler import add_sampler_args, sampler_from_args
+from timeseries import TimeSeriesWriter
+
 
 thread_local = threading.local()
+DEFAULT_OPEN_LOOP_DURATION_SEC = 10.0
 
 
 @dataclass
@@ -31,23 +35,90 @@ class RequestResult:
     latency_ms: float
     response_bytes: int
     error: Optional[str]
+    corrected_latency_ms: Optional[float] = None
+
+
+@dataclass
+class LoadJob:
+    url: str
+    method: str
+    timeout_sec: float
+    headers: dict[str, str]
+    payload: Optional[Any]
+    requests: int
+    concurrency: int
+    warmup_requests: int
+    engine: str
+    rate: Optional[float] = None
+    duration_sec: Optional[float] = None
+    histogram_digits: int = 3
+
+
+class ResultRecorder:
+    def __init__(self, significant_digits: int = 3) -> None:
+        self.latency = LatencyHistogram(significant_digits)
+        self.corrected_latency = LatencyHistogram(significant_digits)
+        self.total_requests = 0
+        self.success_count = 0
+        self.size_min = 0
+        self.size_max = 0
+        self.size_sum = 0
+        self.status_codes: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def record(self, result: RequestResult) -> None:
+        self.total_requests += 1
+        self.latency.record(result.latency_ms)
+        if result.corrected_latency_ms is not None:
+            self.corrected_latency.record(result.corrected_latency_ms)
+        self.status_codes[str(result.status_code) if result.status_code is not None else "exception"] += 1
+        if result.ok:
+            size = result.response_bytes
+            self.size_min = size if self.success_count == 0 else min(self.size_min, size)
+            self.size_max = max(self.size_max, size)
+            self.size_sum += size
+            self.success_count += 1
+        elif result.error is not None:
+            self.errors[result.error] += 1
 
+    def merge(self, other: "ResultRecorder") -> None:
+        self.latency.merge(other.latency)
+        self.corrected_latency.merge(other.corrected_latency)
+        if other.success_count:
+            self.size_min = other.size_min if self.success_count == 0 else min(self.size_min, other.size_min)
+            self.size_max = max(self.size_max, other.size_max)
+        self.total_requests += other.total_requests
+        self.success_count += other.success_count
+        self.size_sum += other.size_sum
+        self.status_codes.update(other.status_codes)
+        self.errors.update(other.errors)
 
-def percentile(sorted_values: list[float], p: float) -> float:
-    if not sorted_values:
-        return 0.0
-    if p <= 0:
-        return sorted_values[0]
-    if p >= 100:
-        return sorted_values[-1]
-    k = (len(sorted_values) - 1) * (p / 100.0)
-    f = math.floor(k)
-    c = math.ceil(k)
-    if f == c:
-        return sorted_values[int(k)]
-    d0 = sorted_values[f] * (c - k)
-    d1 = sorted_values[c] * (k - f)
-    return d0 + d1
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "latency": self.latency.to_dict(),
+            "corrected_latency": self.corrected_latency.to_dict(),
+            "total_requests": self.total_requests,
+            "success_count": self.success_count,
+            "size_min": self.size_min,
+            "size_max": self.size_max,
+            "size_sum": self.size_sum,
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ResultRecorder":
+        recorder = cls()
+        recorder.latency = LatencyHistogram.from_dict(data["latency"])
+        recorder.corrected_latency = LatencyHistogram.from_dict(data["corrected_latency"])
+        recorder.total_requests = data["total_requests"]
+        recorder.success_count = data["success_count"]
+        recorder.size_min = data["size_min"]
+        recorder.size_max = data["size_max"]
+        recorder.size_sum = data["size_sum"]
+        recorder.status_codes = Counter(data["status_codes"])
+        recorder.errors = Counter(data["errors"])
+        return recorder
 
 
 def get_session() -> requests.Session:
@@ -93,46 +164,252 @@ def run_single_request(
         )
 
 
-def build_report(results: list[RequestResult], wall_time_sec: float) -> dict[str, Any]:
-    latencies = sorted(r.latency_ms for r in results)
-    successes = [r for r in results if r.ok]
-    failures = [r for r in results if not r.ok]
-    sizes = [r.response_bytes for r in successes]
-    status_codes = Counter(
-        str(r.status_code) if r.status_code is not None else "exception" for r in results
+def run_thread_load(
+    url: str,
+    method: str,
+    timeout_sec: float,
+    headers: dict[str, str],
+    payload: Optional[dict[str, Any]],
+    total_requests: int,
+    concurrency: int,
+    histogram_digits: int = 3,
+    duration_sec: Optional[float] = None,
+    observer: Optional[Callable[[RequestResult], None]] = None,
+) -> tuple[ResultRecorder, float]:
+    claimed = itertools.count()
+    started = time.perf_counter()
+    deadline = started + duration_sec if duration_sec is not None else None
+
+    def has_next() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return next(claimed) < total_requests
+
+    def worker() -> ResultRecorder:
+        recorder = ResultRecorder(histogram_digits)
+        while has_next():
+            result = run_single_request(url, method, timeout_sec, headers, payload)
+            recorder.record(result)
+            if observer is not None:
+                observer(result)
+        return recorder
+
+    workers = concurrency if deadline is not None else min(concurrency, total_requests)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(worker) for _ in range(workers)]
+    wall_time_sec = time.perf_counter() - started
+
+    recorder = ResultRecorder(histogram_digits)
+    for future in futures:
+        recorder.merge(future.result())
+    return recorder, wall_time_sec
+
+
+def run_scheduled_request(
+    url: str,
+    method: str,
+    timeout_sec: float,
+    headers: dict[str, str],
+    payload: Optional[dict[str, Any]],
+    intended_at: float,
+) -> RequestResult:
+    result = run_single_request(url, method, timeout_sec, headers, payload)
+    result.corrected_latency_ms = (time.perf_counter() - intended_at) * 1000
+    return result
+
+
+def run_thread_open_loop(
+    url: str,
+    method: str,
+    timeout_sec: float,
+    headers: dict[str, str],
+    payload: Optional[dict[str, Any]],
+    rate: float,
+    duration_sec: float,
+    concurrency: int,
+    histogram_digits: int = 3,
+    observer: Optional[Callable[[RequestResult], None]] = None,
+) -> tuple[ResultRecorder, float]:
+    total_requests = max(int(rate * duration_sec), 1)
+    recorder = ResultRecorder(histogram_digits)
+    record_lock = threading.Lock()
+
+    def record(future) -> None:
+        result = future.result()
+        with record_lock:
+            recorder.record(result)
+        if observer is not None:
+            observer(result)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        for index in range(total_requests):
+            intended_at = started + index / rate
+            delay = intended_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(
+                run_scheduled_request,
+                url,
+                method,
+                timeout_sec,
+                headers,
+                payload,
+                intended_at,
+            ).add_done_callback(record)
+    return recorder, time.perf_counter() - started
+
+
+def run_asyncio_open_loop(
+    url: str,
+    method: str,
+    timeout_sec: float,
+    headers: dict[str, str],
+    payload: Optional[dict[str, Any]],
+    rate: float,
+    duration_sec: float,
+    concurrency: int,
+    warmup_requests: int,
+    start_at: Optional[float] = None,
+    histogram_digits: int = 3,
+    observer: Optional[Callable[[RequestResult], None]] = None,
+) -> tuple[ResultRecorder, float]:
+    from async_engine import RequestSpec, run_open_loop
+
+    recorder = ResultRecorder(histogram_digits)
+    spec = RequestSpec(method=method, url=url, headers=headers, payload=payload)
+    _, wall_time_sec = run_open_loop(
+        spec,
+        rate=rate,
+        duration_sec=duration_sec,
+        concurrency=concurrency,
+        timeout_sec=timeout_sec,
+        warmup_specs=[spec] * warmup_requests,
+        start_at=start_at,
+        on_outcome=recording_callback(recorder, observer),
     )
-    errors = Counter(r.error for r in failures if r.error is not None)
+    return recorder, wall_time_sec
+
 
+def recording_callback(
+    recorder: ResultRecorder,
+    observer: Optional[Callable[[RequestResult], None]],
+) -> Callable[[Any], None]:
+    def on_outcome(outcome: Any) -> None:
+        result = to_request_result(outcome)
+        recorder.record(result)
+        if observer is not None:
+            observer(result)
+
+    return on_outcome
+
+
+def to_request_result(outcome: Any) -> RequestResult:
+    return RequestResult(
+        ok=outcome.status_code is not None and 200 <= outcome.status_code < 300,
+        status_code=outcome.status_code,
+        latency_ms=outcome.latency_ms,
+        response_bytes=outcome.response_bytes,
+        error=outcome.error,
+        corrected_latency_ms=outcome.corrected_latency_ms,
+    )
+
+
+def run_asyncio_load(
+    url: str,
+    method: str,
+    timeout_sec: float,
+    headers: dict[str, str],
+    payload: Optional[dict[str, Any]],
+    total_requests: int,
+    concurrency: int,
+    warmup_requests: int,
+    start_at: Optional[float] = None,
+    histogram_digits: int = 3,
+    duration_sec: Optional[float] = None,
+    observer: Optional[Callable[[RequestResult], None]] = None,
+) -> tuple[ResultRecorder, float]:
+    from async_engine import RequestSpec, run_for_duration, run_requests
+
+    recorder = ResultRecorder(histogram_digits)
+    spec = RequestSpec(method=method, url=url, headers=headers, payload=payload)
+    if duration_sec is not None:
+        _, wall_time_sec = run_for_duration(
+            lambda _: spec,
+            duration_sec,
+            concurrency=concurrency,
+            timeout_sec=timeout_sec,
+            warmup_specs=[spec] * warmup_requests,
+            start_at=start_at,
+            on_outcome=recording_callback(recorder, observer),
+        )
+        return recorder, wall_time_sec
+    _, wall_time_sec = run_requests(
+        [spec] * total_requests,
+        concurrency=concurrency,
+        timeout_sec=timeout_sec,
+        warmup_specs=[spec] * warmup_requests,
+        start_at=start_at,
+        on_outcome=recording_callback(recorder, observer),
+    )
+    return recorder, wall_time_sec
+
+
+def latency_stats(histogram: LatencyHistogram) -> dict[str, float]:
+    if histogram.count == 0:
+        return {key: 0.0 for key in ("min", "avg", "median", "p90", "p95", "p99", "max", "stdev")}
+    return {
+        "min": round(histogram.min_ms, 2),
+        "avg": round(histogram.mean(), 2),
+        "median": round(histogram.percentile(50), 2),
+        "p90": round(histogram.percentile(90), 2),
+        "p95": round(histogram.percentile(95), 2),
+        "p99": round(histogram.percentile(99), 2),
+        "max": round(histogram.max_ms, 2),
+        "stdev": round(histogram.stdev(), 2),
+    }
+
+
+def build_report(
+    recorder: ResultRecorder,
+    wall_time_sec: float,
+    target_rate: Optional[float] = None,
+) -> dict[str, Any]:
+    total = recorder.total_requests
+    successes = recorder.success_count
     report = {
         "summary": {
-            "total_requests": len(results),
-            "success_count": len(successes),
-            "failure_count": len(failures),
-            "success_rate_pct": round((len(successes) / len(results)) * 100, 2) if results else 0.0,
-            "throughput_req_per_sec": round((len(results) / wall_time_sec), 2) if wall_time_sec > 0 else 0.0,
+            "total_requests": total,
+            "success_count": successes,
+            "failure_count": total - successes,
+            "success_rate_pct": round((successes / total) * 100, 2) if total else 0.0,
+            "throughput_req_per_sec": round((total / wall_time_sec), 2) if wall_time_sec > 0 else 0.0,
             "total_wall_time_sec": round(wall_time_sec, 3),
         },
-        "latency_ms": {
-            "min": round(min(latencies), 2) if latencies else 0.0,
-            "avg": round(statistics.mean(latencies), 2) if latencies else 0.0,
-            "median": round(statistics.median(latencies), 2) if latencies else 0.0,
-            "p90": round(percentile(latencies, 90), 2) if latencies else 0.0,
-            "p95": round(percentile(latencies, 95), 2) if latencies else 0.0,
-            "p99": round(percentile(latencies, 99), 2) if latencies else 0.0,
-            "max": round(max(latencies), 2) if latencies else 0.0,
-            "stdev": round(statistics.pstdev(latencies), 2) if len(latencies) > 1 else 0.0,
-        },
+        "latency_ms": latency_stats(recorder.latency),
         "response_size_bytes_success_only": {
-            "min": min(sizes) if sizes else 0,
-            "avg": round(statistics.mean(sizes), 2) if sizes else 0.0,
-            "max": max(sizes) if sizes else 0,
+            "min": recorder.size_min,
+            "avg": round(recorder.size_sum / successes, 2) if successes else 0.0,
+            "max": recorder.size_max,
         },
-        "status_code_distribution": dict(status_codes),
-        "error_distribution": dict(errors),
+        "status_code_distribution": dict(recorder.status_codes),
+        "error_distribution": dict(recorder.errors),
+        "latency_histogram": recorder.latency.to_dict(),
     }
+    if target_rate is not None:
+        report["open_loop"] = {
+            "target_rate_req_per_sec": target_rate,
+            "achieved_rate_req_per_sec": report["summary"]["throughput_req_per_sec"],
+        }
+        report["corrected_latency_ms"] = latency_stats(recorder.corrected_latency)
+        report["corrected_latency_histogram"] = recorder.corrected_latency.to_dict()
     return report
 
 
+def summary_view(report: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in report.items() if not key.endswith("_histogram")}
+
+
 def parse_headers(values: list[str]) -> dict[str, str]:
     headers: dict[str, str] = {}
     for value in values:
@@ -154,9 +431,129 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--payload-file", help="JSON payload file path for request body")
     parser.add_argument("--warmup-requests", type=int, default=5, help="Warm-up requests before benchmark")
     parser.add_argument("--output-json", help="Optional path to write full report JSON")
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "asyncio"],
+        default="thread",
+        help="Load engine: thread pool with requests, or asyncio with aiohttp keep-alive pools",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop mode: send requests on a fixed timetable at this many requests per second "
+        "(ignores --requests; --concurrency caps in-flight requests)",
+    )
+    parser.add_argument(
+        "--duration-sec",
+        type=float,
+        help="Run for this many seconds instead of a fixed --requests count "
+        f"(open-loop runs default to {DEFAULT_OPEN_LOOP_DURATION_SEC:g}s)",
+    )
+    parser.add_argument(
+        "--timeseries-file",
+        help="Stream per-interval throughput, errors and latency percentiles to this NDJSON file during the run",
+    )
+    parser.add_argument(
+        "--interval-sec",
+        type=float,
+        default=1.0,
+        help="Time-series interval length in seconds",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Split the load across this many worker processes (requests, rate and concurrency are divided)",
+    )
+    parser.add_argument(
+        "--histogram-digits",
+        type=int,
+        default=3,
+        help="Significant digits kept by the latency histogram (1-5); higher is more precise and uses more memory",
+    )
+    parser.add_argument(
+        "--start-delay-sec",
+        type=float,
+        default=2.0,
+        help="With --processes, how far ahead the coordinator schedules the common start time",
+    )
+    add_sampler_args(parser)
     return parser.parse_args()
 
 
+def wait_until(start_at: Optional[float]) -> None:
+    if start_at is not None:
+        delay = start_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_load(
+    job: LoadJob,
+    start_at: Optional[float] = None,
+    observer: Optional[Callable[[RequestResult], None]] = None,
+) -> tuple[ResultRecorder, float]:
+    if job.engine == "asyncio":
+        if job.rate is not None:
+            return run_asyncio_open_loop(
+                job.url,
+                job.method,
+                job.timeout_sec,
+                job.headers,
+                job.payload,
+                job.rate,
+                job.duration_sec or DEFAULT_OPEN_LOOP_DURATION_SEC,
+                job.concurrency,
+                job.warmup_requests,
+                start_at,
+                job.histogram_digits,
+                observer,
+            )
+        return run_asyncio_load(
+            job.url,
+            job.method,
+            job.timeout_sec,
+            job.headers,
+            job.payload,
+            job.requests,
+            job.concurrency,
+            job.warmup_requests,
+            start_at,
+            job.histogram_digits,
+            job.duration_sec,
+            observer,
+        )
+
+    for _ in range(job.warmup_requests):
+        run_single_request(job.url, job.method, job.timeout_sec, job.headers, job.payload)
+    wait_until(start_at)
+    if job.rate is not None:
+        return run_thread_open_loop(
+            job.url,
+            job.method,
+            job.timeout_sec,
+            job.headers,
+            job.payload,
+            job.rate,
+            job.duration_sec or DEFAULT_OPEN_LOOP_DURATION_SEC,
+            job.concurrency,
+            job.histogram_digits,
+            observer,
+        )
+    return run_thread_load(
+        job.url,
+        job.method,
+        job.timeout_sec,
+        job.headers,
+        job.payload,
+        job.requests,
+        job.concurrency,
+        job.histogram_digits,
+        job.duration_sec,
+        observer,
+    )
+
+
 def main() -> None:
     args = parse_args()
     if args.requests <= 0:
@@ -165,6 +562,18 @@ def main() -> None:
         raise SystemExit("--concurrency must be greater than 0")
     if args.warmup_requests < 0:
         raise SystemExit("--warmup-requests must be 0 or greater")
+    if args.rate is not None and args.rate <= 0:
+        raise SystemExit("--rate must be greater than 0")
+    if args.duration_sec is not None and args.duration_sec <= 0:
+        raise SystemExit("--duration-sec must be greater than 0")
+    if args.interval_sec <= 0:
+        raise SystemExit("--interval-sec must be greater than 0")
+    if args.timeseries_file and args.processes > 1:
+        raise SystemExit("--timeseries-file is not supported together with --processes")
+    if args.processes <= 0:
+        raise SystemExit("--processes must be greater than 0")
+    if not 1 <= args.histogram_digits <= 5:
+        raise SystemExit("--histogram-digits must be between 1 and 5")
 
     headers = parse_headers(args.header)
     payload = None
@@ -172,31 +581,43 @@ def main() -> None:
         with open(args.payload_file, "r", encoding="utf-8") as f:
             payload = json.load(f)
 
-    method = args.method.upper()
+    job = LoadJob(
+        url=args.url,
+        method=args.method.upper(),
+        timeout_sec=args.timeout_sec,
+        headers=headers,
+        payload=payload,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup_requests=args.warmup_requests,
+        engine=args.engine,
+        rate=args.rate,
+        duration_sec=args.duration_sec,
+        histogram_digits=args.histogram_digits,
+    )
 
-    for _ in range(args.warmup_requests):
-        run_single_request(args.url, method, args.timeout_sec, headers, payload)
+    sampler = sampler_from_args(args)
+    if sampler is not None:
+        sampler.start()
+    try:
+        if args.processes > 1:
+            from distributed import run_coordinator
 
-    started = time.perf_counter()
-    results: list[RequestResult] = []
-    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
-        futures = [
-            executor.submit(
-                run_single_request,
-                args.url,
-                method,
-                args.timeout_sec,
-                headers,
-                payload,
-            )
-            for _ in range(args.requests)
-        ]
-        for future in as_completed(futures):
-            results.append(future.result())
-    wall_time_sec = time.perf_counter() - started
+            report = run_coordinator(job, args.processes, args.start_delay_sec)
+        elif args.timeseries_file:
+            with TimeSeriesWriter(args.timeseries_file, args.interval_sec) as timeseries:
+                recorder, wall_time_sec = run_load(job, observer=timeseries.record)
+            report = build_report(recorder, wall_time_sec, target_rate=args.rate)
+        else:
+            recorder, wall_time_sec = run_load(job)
+            report = build_report(recorder, wall_time_sec, target_rate=args.rate)
+    finally:
+        if sampler is not None:
+            sampler.stop()
+    if sampler is not None:
+        report["resources"] = sampler.report(report["summary"]["total_requests"])
 
-    report = build_report(results, wall_time_sec)
-    print(json.dumps(report, indent=2))
+    print(json.dumps(summary_view(report), indent=2))
 
     if args.output_json:
         with open(args.output_json, "w", encoding="utf-8") as f:
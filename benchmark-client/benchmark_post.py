@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import itertools
 import json
 import math
 import os
@@ -9,12 +10,11 @@ import threading
 import time
 import warnings
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import Any, Callable, Optional
 
-import psycopg
 
 # Suppress urllib3 LibreSSL runtime warning on macOS system Python.
 warnings.filterwarnings(
@@ -25,6 +25,10 @@ warnings.filterwarnings(
 
 import requests
 
+from dataset_reset import DEFAULT_DELETE_BATCH_SIZE, delete_created_bills
+from resource_sampler import add_sampler_args, sampler_from_args
+from timeseries import TimeSeriesWriter
+
 
 thread_local = threading.local()
 
@@ -69,16 +73,7 @@ def run_single_post(url: str, timeout_sec: float, payload: dict) -> PostResult:
         response = session.post(url=url, timeout=timeout_sec, json=payload)
         latency_ms = (time.perf_counter() - started) * 1000
         body = response.content or b""
-        bill_id = None
-        if 200 <= response.status_code < 300:
-            try:
-                body_json = response.json()
-                if isinstance(body_json, dict):
-                    maybe_id = body_json.get("id")
-                    if isinstance(maybe_id, int):
-                        bill_id = maybe_id
-            except (json.JSONDecodeError, ValueError):
-                pass
+        bill_id = parse_bill_id(response.status_code, body)
 
         return PostResult(
             ok=200 <= response.status_code < 300,
@@ -100,6 +95,104 @@ def run_single_post(url: str, timeout_sec: float, payload: dict) -> PostResult:
         )
 
 
+def parse_bill_id(status_code: int, body: bytes) -> Optional[int]:
+    if not 200 <= status_code < 300:
+        return None
+    try:
+        body_json = json.loads(body)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    if isinstance(body_json, dict):
+        maybe_id = body_json.get("id")
+        if isinstance(maybe_id, int):
+            return maybe_id
+    return None
+
+
+def run_thread_posts(
+    url: str,
+    timeout_sec: float,
+    payload_for: Callable[[int], dict],
+    total_requests: Optional[int],
+    concurrency: int,
+    duration_sec: Optional[float] = None,
+    observer: Optional[Callable[[PostResult], None]] = None,
+) -> tuple[list[PostResult], float]:
+    claimed = itertools.count()
+    results: list[PostResult] = []
+    started = time.perf_counter()
+    deadline = started + duration_sec if duration_sec is not None else None
+
+    def worker() -> None:
+        while deadline is None or time.perf_counter() < deadline:
+            idx = next(claimed)
+            if total_requests is not None and idx >= total_requests:
+                return
+            result = run_single_post(url, timeout_sec, payload_for(idx))
+            results.append(result)
+            if observer is not None:
+                observer(result)
+
+    workers = concurrency if total_requests is None else min(concurrency, total_requests)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker) for _ in range(workers)]
+    # Re-raise worker failures (payload_for, observer) instead of reporting a silently shorter run.
+    for future in futures:
+        future.result()
+    return results, time.perf_counter() - started
+
+
+def to_post_result(outcome: Any) -> PostResult:
+    return PostResult(
+        ok=outcome.status_code is not None and 200 <= outcome.status_code < 300,
+        status_code=outcome.status_code,
+        latency_ms=outcome.latency_ms,
+        response_bytes=outcome.response_bytes,
+        error=outcome.error,
+        bill_id=parse_bill_id(outcome.status_code, outcome.body or b"") if outcome.status_code else None,
+    )
+
+
+def run_asyncio_posts(
+    url: str,
+    timeout_sec: float,
+    payload_for: Callable[[int], dict],
+    total_requests: Optional[int],
+    concurrency: int,
+    duration_sec: Optional[float] = None,
+    observer: Optional[Callable[[PostResult], None]] = None,
+) -> tuple[list[PostResult], float]:
+    from async_engine import RequestSpec, run_for_duration, run_requests
+
+    results: list[PostResult] = []
+
+    def on_outcome(outcome: Any) -> None:
+        result = to_post_result(outcome)
+        results.append(result)
+        if observer is not None:
+            observer(result)
+
+    if duration_sec is not None:
+        _, wall_time_sec = run_for_duration(
+            lambda idx: RequestSpec(method="POST", url=url, payload=payload_for(idx)),
+            duration_sec,
+            concurrency=concurrency,
+            timeout_sec=timeout_sec,
+            keep_body=True,
+            on_outcome=on_outcome,
+        )
+    else:
+        specs = [RequestSpec(method="POST", url=url, payload=payload_for(idx)) for idx in range(total_requests)]
+        _, wall_time_sec = run_requests(
+            specs,
+            concurrency=concurrency,
+            timeout_sec=timeout_sec,
+            keep_body=True,
+            on_outcome=on_outcome,
+        )
+    return results, wall_time_sec
+
+
 def build_payload(prefix: str, idx: int, lines_count: int, rng: random.Random) -> dict:
     concepts = [
         "Cloud Hosting",
@@ -141,47 +234,6 @@ def build_payload(prefix: str, idx: int, lines_count: int, rng: random.Random) -
     }
 
 
-def cleanup_by_prefix(
-    prefix: str,
-    db_host: str,
-    db_port: int,
-    db_name: str,
-    db_user: str,
-    db_password: str,
-) -> dict:
-    conninfo = (
-        f"host={db_host} port={db_port} dbname={db_name} "
-        f"user={db_user} password={db_password}"
-    )
-    try:
-        with psycopg.connect(conninfo) as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    DELETE FROM bill
-                    WHERE bill_number LIKE %s
-                       OR customer_name LIKE %s
-                    RETURNING id;
-                    """,
-                    (f"{prefix}%", f"{prefix}%"),
-                )
-                deleted_ids = [row[0] for row in cur.fetchall()]
-            conn.commit()
-        return {
-            "attempted": True,
-            "deleted_bill_count": len(deleted_ids),
-            "deleted_bill_ids": deleted_ids,
-            "error": None,
-        }
-    except Exception as exc:  # noqa: BLE001
-        return {
-            "attempted": True,
-            "deleted_bill_count": 0,
-            "deleted_bill_ids": [],
-            "error": str(exc),
-        }
-
-
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Benchmark POST /bills with generated data and optional cleanup"
@@ -196,8 +248,31 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--prefix", help="Prefix marker for billNumber/customerName")
     parser.add_argument("--seed", type=int, default=42, help="Random seed for payload generation")
     parser.add_argument("--skip-cleanup", action="store_true", help="Do not delete generated benchmark bills")
+    parser.add_argument(
+        "--cleanup-batch-size",
+        type=int,
+        default=DEFAULT_DELETE_BATCH_SIZE,
+        help="Created bill ids deleted per statement during cleanup",
+    )
     parser.add_argument("--quiet", action="store_true", help="Suppress summary line output")
     parser.add_argument("--output-json", help="Optional path to write full report JSON")
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "asyncio"],
+        default="thread",
+        help="Load engine: thread pool with requests, or asyncio with aiohttp keep-alive pools",
+    )
+    parser.add_argument(
+        "--duration-sec",
+        type=float,
+        help="Keep creating bills for this many seconds instead of a fixed --requests count",
+    )
+    parser.add_argument(
+        "--timeseries-file",
+        help="Stream per-interval throughput, errors and latency percentiles to this NDJSON file during the run",
+    )
+    parser.add_argument("--interval-sec", type=float, default=1.0, help="Time-series interval length in seconds")
+    add_sampler_args(parser)
 
     parser.add_argument("--db-host", default=os.getenv("POSTGRES_HOST", "localhost"), help="Postgres host")
     parser.add_argument("--db-port", type=int, default=int(os.getenv("POSTGRES_PORT", "5440")), help="Postgres port")
@@ -217,27 +292,66 @@ def main() -> None:
         raise SystemExit("--min-lines and --max-lines must be greater than 0")
     if args.min_lines > args.max_lines:
         raise SystemExit("--min-lines cannot be greater than --max-lines")
+    if args.duration_sec is not None and args.duration_sec <= 0:
+        raise SystemExit("--duration-sec must be greater than 0")
+    if args.interval_sec <= 0:
+        raise SystemExit("--interval-sec must be greater than 0")
+    if args.cleanup_batch_size <= 0:
+        raise SystemExit("--cleanup-batch-size must be greater than 0")
 
     prefix = args.prefix or f"BENCH-POST-{int(time.time())}"
     rng = random.Random(args.seed)
 
-    payloads = []
     lines_per_bill: list[int] = []
-    for idx in range(1, args.requests + 1):
-        lines_count = rng.randint(args.min_lines, args.max_lines)
-        lines_per_bill.append(lines_count)
-        payloads.append(build_payload(prefix, idx, lines_count, rng))
-
-    started = time.perf_counter()
-    results: list[PostResult] = []
-    with ThreadPoolExecutor(max_workers=min(args.concurrency, args.requests)) as executor:
-        futures = [
-            executor.submit(run_single_post, args.url, args.timeout_sec, payload)
-            for payload in payloads
-        ]
-        for future in as_completed(futures):
-            results.append(future.result())
-    wall_time_sec = time.perf_counter() - started
+    if args.duration_sec is None:
+        payloads = []
+        for idx in range(1, args.requests + 1):
+            lines_count = rng.randint(args.min_lines, args.max_lines)
+            lines_per_bill.append(lines_count)
+            payloads.append(build_payload(prefix, idx, lines_count, rng))
+        total_requests: Optional[int] = args.requests
+
+        def payload_for(idx: int) -> dict:
+            return payloads[idx]
+
+    else:
+        # Duration runs do not know the request count up front, so every payload gets its own seeded generator.
+        total_requests = None
+
+        def payload_for(idx: int) -> dict:
+            payload_rng = random.Random(f"{args.seed}:{idx}")
+            lines_count = payload_rng.randint(args.min_lines, args.max_lines)
+            lines_per_bill.append(lines_count)
+            return build_payload(prefix, idx + 1, lines_count, payload_rng)
+
+    run_posts = run_asyncio_posts if args.engine == "asyncio" else run_thread_posts
+    sampler = sampler_from_args(args)
+    if sampler is not None:
+        sampler.start()
+    try:
+        if args.timeseries_file:
+            with TimeSeriesWriter(args.timeseries_file, args.interval_sec) as timeseries:
+                results, wall_time_sec = run_posts(
+                    args.url,
+                    args.timeout_sec,
+                    payload_for,
+                    total_requests,
+                    args.concurrency,
+                    args.duration_sec,
+                    timeseries.record,
+                )
+        else:
+            results, wall_time_sec = run_posts(
+                args.url,
+                args.timeout_sec,
+                payload_for,
+                total_requests,
+                args.concurrency,
+                args.duration_sec,
+            )
+    finally:
+        if sampler is not None:
+            sampler.stop()
 
     latencies = sorted(item.latency_ms for item in results)
     successes = [item for item in results if item.ok]
@@ -245,17 +359,26 @@ def main() -> None:
     status_codes = Counter(str(item.status_code) if item.status_code is not None else "exception" for item in results)
     errors = Counter(item.error for item in failures if item.error is not None)
     created_ids = [item.bill_id for item in successes if item.bill_id is not None]
+    # Same rule as benchmark_scenario.py: a rejected request (4xx) created nothing, but a timeout, a 5xx or a 2xx
+    # without a parseable id may have left a bill behind whose id is unknown.
+    ids_complete = not any(
+        item.bill_id is None
+        and (item.status_code is None or item.status_code >= 500 or 200 <= item.status_code < 300)
+        for item in results
+    )
 
     report = {
         "target": {"name": args.name, "url": args.url},
         "run": {
             "prefix": prefix,
-            "requests": args.requests,
+            "requests": args.requests if args.duration_sec is None else len(results),
+            "duration_sec": args.duration_sec,
             "concurrency": args.concurrency,
             "timeout_sec": args.timeout_sec,
             "min_lines": args.min_lines,
             "max_lines": args.max_lines,
             "seed": args.seed,
+            "engine": args.engine,
             "lines_per_bill": lines_per_bill,
         },
         "summary": {
@@ -286,16 +409,21 @@ def main() -> None:
         "error_distribution": dict(errors),
         "created_bill_ids": created_ids,
     }
-
-    cleanup = {"attempted": False, "deleted_bill_count": 0, "deleted_bill_ids": [], "error": None}
-    if not args.skip_cleanup:
-        cleanup = cleanup_by_prefix(
-            prefix=prefix,
+    if sampler is not None:
+        report["resources"] = sampler.report(len(results))
+
+    cleanup = {"attempted": False, "deleted_bill_count": 0, "batches": 0, "error": None}
+    if (created_ids or not ids_complete) and not args.skip_cleanup:
+        cleanup = delete_created_bills(
+            created_ids,
+            prefix,
+            ids_complete,
             db_host=args.db_host,
             db_port=args.db_port,
             db_name=args.db_name,
             db_user=args.db_user,
             db_password=args.db_password,
+            batch_size=args.cleanup_batch_size,
         )
     report["cleanup"] = cleanup
 
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from async_engine import HttpOutcome, RequestSpec, create_session, send_request
+from benchmark import ResultRecorder, build_report, summary_view, to_request_result
+from benchmark_post import build_payload, parse_bill_id
+from dataset_reset import DEFAULT_DELETE_BATCH_SIZE, delete_created_bills
+from resource_sampler import add_sampler_args, sampler_from_args
+
+
+@dataclass
+class Operation:
+    name: str
+    method: str
+    url: str
+    weight: float
+    headers: dict[str, str]
+    payload_for: Optional[Callable[[int, random.Random], Any]]
+
+
+@dataclass
+class Stage:
+    duration_sec: float
+    users: int
+
+
+def bill_payload_generator(prefix: str, options: dict[str, Any]) -> Callable[[int, random.Random], dict]:
+    min_lines = int(options.get("min_lines", 10))
+    max_lines = int(options.get("max_lines", 15))
+    if min_lines <= 0 or min_lines > max_lines:
+        raise SystemExit("Bill payloads need 0 < min_lines <= max_lines")
+
+    def generate(idx: int, rng: random.Random) -> dict:
+        return build_payload(prefix, idx, rng.randint(min_lines, max_lines), rng)
+
+    return generate
+
+
+PAYLOAD_GENERATORS = {
+    "bill": bill_payload_generator,
+}
+
+
+def load_operations(scenario: dict[str, Any], base_url: str, prefix: str) -> list[Operation]:
+    operations = []
+    for item in scenario["operations"]:
+        payload = item.get("payload")
+        payload_for = None
+        if isinstance(payload, str):
+            if payload not in PAYLOAD_GENERATORS:
+                raise SystemExit(f"Unknown payload generator '{payload}' in operation '{item['name']}'")
+            payload_for = PAYLOAD_GENERATORS[payload](prefix, item)
+        elif payload is not None:
+            payload_for = lambda _idx, _rng, literal=payload: literal  # noqa: E731
+        weight = float(item.get("weight", 1))
+        if weight <= 0:
+            raise SystemExit(f"Operation '{item['name']}' needs a weight greater than 0")
+        operations.append(
+            Operation(
+                name=item["name"],
+                method=item.get("method", "GET").upper(),
+                url=item.get("url") or base_url.rstrip("/") + item["path"],
+                weight=weight,
+                headers=dict(item.get("headers", {})),
+                payload_for=payload_for,
+            )
+        )
+    if not operations:
+        raise SystemExit("Scenario needs at least one operation")
+    return operations
+
+
+def load_stages(scenario: dict[str, Any]) -> list[Stage]:
+    stages = [Stage(float(item["duration_sec"]), int(item["users"])) for item in scenario["stages"]]
+    if not stages or any(stage.duration_sec <= 0 or stage.users < 0 for stage in stages):
+        raise SystemExit("Scenario needs stages with duration_sec > 0 and users >= 0")
+    return stages
+
+
+def think_time_sampler(think_time: dict[str, Any]) -> Callable[[random.Random], float]:
+    if "mean_ms" in think_time:
+        mean_sec = float(think_time["mean_ms"]) / 1000
+        return lambda rng: rng.expovariate(1 / mean_sec) if mean_sec > 0 else 0.0
+    low = float(think_time.get("min_ms", 0)) / 1000
+    high = float(think_time.get("max_ms", 0)) / 1000
+    return lambda rng: rng.uniform(low, high)
+
+
+async def run_stages(
+    operations: list[Operation],
+    stages: list[Stage],
+    think_time: Callable[[random.Random], float],
+    seed: int,
+    timeout_sec: float,
+    on_outcome: Callable[[Operation, int, HttpOutcome], None],
+) -> float:
+    weights = [operation.weight for operation in operations]
+    sequence = itertools.count(1)
+    stage_index = 0
+    target_users = 0
+    stopping = False
+
+    async with create_session(max(max(stage.users for stage in stages), 1), timeout_sec) as session:
+
+        async def virtual_user(user: int) -> None:
+            rng = random.Random(f"{seed}:{user}")
+            while not stopping and user < target_users:
+                operation = rng.choices(operations, weights)[0]
+                idx = next(sequence)
+                payload = operation.payload_for(idx, rng) if operation.payload_for is not None else None
+                spec = RequestSpec(operation.method, operation.url, operation.headers, payload)
+                outcome = await send_request(session, spec, keep_body=operation.method == "POST")
+                on_outcome(operation, stage_index, outcome)
+                pause = think_time(rng)
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+        users: dict[int, asyncio.Task] = {}
+        started = time.perf_counter()
+        previous_users = 0
+        for stage_index, stage in enumerate(stages):
+            stage_started = time.perf_counter()
+            while True:
+                elapsed = time.perf_counter() - stage_started
+                if elapsed >= stage.duration_sec:
+                    break
+                # Users ramp linearly from the previous stage's count to this stage's count.
+                target_users = round(previous_users + (stage.users - previous_users) * elapsed / stage.duration_sec)
+                for user in range(target_users):
+                    if user not in users or users[user].done():
+                        users[user] = asyncio.create_task(virtual_user(user))
+                await asyncio.sleep(0.05)
+            previous_users = stage.users
+        stopping = True
+        await asyncio.gather(*users.values())
+        return time.perf_counter() - started
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a weighted mixed-workload scenario against one API")
+    parser.add_argument("--scenario", required=True, help="Scenario JSON file")
+    parser.add_argument("--base-url", help="Base URL for operation paths (overrides the scenario's base_url)")
+    parser.add_argument("--name", help="Human friendly target name")
+    parser.add_argument("--timeout-sec", type=float, default=10.0, help="Request timeout in seconds")
+    parser.add_argument("--prefix", help="Prefix marker for generated billNumber/customerName")
+    parser.add_argument("--seed", type=int, help="Random seed (overrides the scenario's seed)")
+    parser.add_argument("--skip-cleanup", action="store_true", help="Do not delete generated benchmark bills")
+    parser.add_argument(
+        "--cleanup-batch-size",
+        type=int,
+        default=DEFAULT_DELETE_BATCH_SIZE,
+        help="Created bill ids deleted per statement during cleanup",
+    )
+    parser.add_argument("--output-json", help="Optional path to write full report JSON")
+    add_sampler_args(parser)
+
+    parser.add_argument("--db-host", default=os.getenv("POSTGRES_HOST", "localhost"), help="Postgres host")
+    parser.add_argument("--db-port", type=int, default=int(os.getenv("POSTGRES_PORT", "5440")), help="Postgres port")
+    parser.add_argument("--db-name", default=os.getenv("POSTGRES_DB", "api_lang_arena"), help="Postgres database")
+    parser.add_argument("--db-user", default=os.getenv("POSTGRES_USER", "api_lang_user"), help="Postgres user")
+    parser.add_argument("--db-password", default=os.getenv("POSTGRES_PASSWORD", "api_lang_password"), help="Postgres password")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with open(args.scenario, "r", encoding="utf-8") as f:
+        scenario = json.load(f)
+
+    base_url = args.base_url or scenario.get("base_url")
+    if not base_url and any("url" not in item for item in scenario.get("operations", [])):
+        raise SystemExit("--base-url or the scenario's base_url is required for path-only operations")
+    prefix = args.prefix or f"BENCH-SCN-{int(time.time())}"
+    seed = args.seed if args.seed is not None else int(scenario.get("seed", 42))
+    operations = load_operations(scenario, base_url or "", prefix)
+    stages = load_stages(scenario)
+    think_time = think_time_sampler(scenario.get("think_time", {}))
+
+    overall = ResultRecorder()
+    per_operation = {operation.name: ResultRecorder() for operation in operations}
+    per_stage = [ResultRecorder() for _ in stages]
+    created_ids: list[int] = []
+    ids_complete = True
+
+    def on_outcome(operation: Operation, stage_index: int, outcome: HttpOutcome) -> None:
+        result = to_request_result(outcome)
+        overall.record(result)
+        per_operation[operation.name].record(result)
+        per_stage[stage_index].record(result)
+        nonlocal ids_complete
+        if operation.method == "POST":
+            bill_id = parse_bill_id(outcome.status_code, outcome.body or b"") if outcome.status_code else None
+            if bill_id is not None:
+                created_ids.append(bill_id)
+            elif outcome.status_code is None or outcome.status_code >= 500 or 200 <= outcome.status_code < 300:
+                # Timed out, failed server-side or unparseable: the bill may exist without a known id.
+                ids_complete = False
+
+    sampler = sampler_from_args(args)
+    if sampler is not None:
+        sampler.start()
+    try:
+        wall_time_sec = asyncio.run(run_stages(operations, stages, think_time, seed, args.timeout_sec, on_outcome))
+    finally:
+        if sampler is not None:
+            sampler.stop()
+
+    total_weight = sum(operation.weight for operation in operations)
+    report = summary_view(build_report(overall, wall_time_sec))
+    report["target"] = {"name": args.name or scenario.get("name", "scenario"), "base_url": base_url}
+    report["scenario"] = {
+        "file": args.scenario,
+        "name": scenario.get("name"),
+        "seed": seed,
+        "prefix": prefix,
+        "stages": [{"duration_sec": stage.duration_sec, "users": stage.users} for stage in stages],
+        "think_time": scenario.get("think_time", {}),
+    }
+    report["operations"] = {}
+    for operation in operations:
+        operation_report = build_report(per_operation[operation.name], wall_time_sec)
+        operation_report["configured_share_pct"] = round(operation.weight / total_weight * 100, 2)
+        operation_report["actual_share_pct"] = (
+            round(per_operation[operation.name].total_requests / overall.total_requests * 100, 2)
+            if overall.total_requests
+            else 0.0
+        )
+        report["operations"][operation.name] = summary_view(operation_report)
+    report["stages"] = [
+        summary_view(build_report(recorder, stage.duration_sec)) for recorder, stage in zip(per_stage, stages)
+    ]
+    report["created_bill_ids"] = created_ids
+    if sampler is not None:
+        report["resources"] = sampler.report(overall.total_requests)
+
+    cleanup = {"attempted": False, "deleted_bill_count": 0, "batches": 0, "error": None}
+    if (created_ids or not ids_complete) and not args.skip_cleanup:
+        cleanup = delete_created_bills(
+            created_ids,
+            prefix,
+            ids_complete,
+            db_host=args.db_host,
+            db_port=args.db_port,
+            db_name=args.db_name,
+            db_user=args.db_user,
+            db_password=args.db_password,
+            batch_size=args.cleanup_batch_size,
+        )
+    report["cleanup"] = cleanup
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{report['target']['name']} | {overall.total_requests} requests in {wall_time_sec:.1f}s")
+    print(f"{'Operation':<24} {'Share%':>8} {'Req/s':>10} {'Success%':>9} {'Median':>9} {'P95':>9} {'P99':>9}")
+    for name, item in report["operations"].items():
+        print(
+            f"{name:<24} {item['actual_share_pct']:>8} {item['summary']['throughput_req_per_sec']:>10} "
+            f"{item['summary']['success_rate_pct']:>9} {item['latency_ms']['median']:>9} "
+            f"{item['latency_ms']['p95']:>9} {item['latency_ms']['p99']:>9}"
+        )
+    print(
+        f"{'(all)':<24} {100.0:>8} {report['summary']['throughput_req_per_sec']:>10} "
+        f"{report['summary']['success_rate_pct']:>9} {report['latency_ms']['median']:>9} "
+        f"{report['latency_ms']['p95']:>9} {report['latency_ms']['p99']:>9}"
+    )
+    if args.output_json:
+        print(f"\nReport written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
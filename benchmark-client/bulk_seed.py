@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Optional
+
+import psycopg
+
+from dataset_reset import build_conninfo
+
+
+# Same customers and concepts as db/seed.sql, so bulk datasets look like the default one.
+CUSTOMERS = [
+    "Northwind Traders", "Acme Corp", "Globex Inc", "Soylent Labs",
+    "Initech", "Umbrella Group", "Stark Industries", "Wayne Enterprises",
+    "Hooli", "Wonka Industries", "Pied Piper", "Aperture Labs",
+]
+CONCEPTS = [
+    "Cloud Hosting", "API Requests", "Data Processing", "Consulting Hours",
+    "Software License", "Support Plan", "Storage Usage", "Bandwidth",
+    "Database Backups", "Security Monitoring", "Email Service", "SMS Service",
+    "Training Session", "Integration Fee", "Premium Feature", "Bug Fix Package",
+]
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS bill (
+  id BIGSERIAL PRIMARY KEY,
+  bill_number TEXT NOT NULL UNIQUE,
+  issued_at DATE NOT NULL,
+  customer_name TEXT NOT NULL,
+  currency CHAR(3) NOT NULL DEFAULT 'USD',
+  subtotal NUMERIC(12,2) NOT NULL DEFAULT 0,
+  tax NUMERIC(12,2) NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS bill_line (
+  id BIGSERIAL PRIMARY KEY,
+  bill_id BIGINT NOT NULL REFERENCES bill(id) ON DELETE CASCADE,
+  line_no INTEGER NOT NULL,
+  concept TEXT NOT NULL,
+  quantity NUMERIC(10,2) NOT NULL,
+  unit_amount NUMERIC(12,2) NOT NULL,
+  line_amount NUMERIC(12,2) NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  UNIQUE (bill_id, line_no)
+);
+"""
+
+COPY_BILL = "COPY bill (id, bill_number, issued_at, customer_name, currency, subtotal, tax) FROM STDIN"
+COPY_BILL_LINE = "COPY bill_line (id, bill_id, line_no, concept, quantity, unit_amount, line_amount) FROM STDIN"
+# db/partition_bills.sql layout: bill_line also carries its bill's issued_at, the partition key.
+COPY_PARTITIONED_BILL_LINE = (
+    "COPY bill_line (id, bill_id, line_no, concept, quantity, unit_amount, line_amount, issued_at) FROM STDIN"
+)
+COPY_FLUSH_ROWS = 5000
+
+_worker_conn: Optional[psycopg.Connection] = None
+
+
+def cents(value: int) -> str:
+    return f"{value // 100}.{value % 100:02d}"
+
+
+def line_counts(seed: int, chunk: int, bills: int, distribution: str, min_lines: int, max_lines: int) -> list[int]:
+    # Line counts use their own stream so the coordinator can size every chunk's id range without generating rows.
+    rng = random.Random(f"{seed}:{chunk}:lines")
+    if distribution == "uniform":
+        return [rng.randint(min_lines, max_lines) for _ in range(bills)]
+    # Log-normal with its median halfway through the range: most bills are small, a long tail is large.
+    mu = math.log((min_lines + max_lines) / 2)
+    return [min(max(round(rng.lognormvariate(mu, 0.6)), min_lines), max_lines) for _ in range(bills)]
+
+
+def _init_worker(conninfo: str) -> None:
+    global _worker_conn
+    _worker_conn = psycopg.connect(conninfo)
+    _worker_conn.execute("SET synchronous_commit = off")
+
+
+def load_chunk(task: dict[str, Any]) -> tuple[int, int]:
+    rng = random.Random(f"{task['seed']}:{task['chunk']}")
+    base_date = date.fromisoformat(task["base_date"])
+    counts = line_counts(
+        task["seed"], task["chunk"], task["bills"], task["distribution"], task["min_lines"], task["max_lines"]
+    )
+    bill_rows: list[str] = []
+    line_rows: list[str] = []
+    line_id = task["first_line_id"]
+
+    with _worker_conn.cursor() as cur:
+        with cur.copy(COPY_PARTITIONED_BILL_LINE if task["partitioned"] else COPY_BILL_LINE) as line_copy:
+            for offset, count in enumerate(counts):
+                bill_id = task["first_bill_id"] + offset
+                subtotal = 0
+                bill_lines = []
+                for line_no in range(1, count + 1):
+                    quantity = rng.randint(100, 500)
+                    unit_amount = rng.randint(1000, 50000)
+                    # Integer cents, rounded half up like NUMERIC round() for positive amounts.
+                    line_amount = (quantity * unit_amount + 50) // 100
+                    subtotal += line_amount
+                    bill_lines.append(
+                        f"{line_id}\t{bill_id}\t{line_no}\t{rng.choice(CONCEPTS)}\t"
+                        f"{cents(quantity)}\t{cents(unit_amount)}\t{cents(line_amount)}"
+                    )
+                    line_id += 1
+                tax = (subtotal * rng.randint(500, 1200) + 5000) // 10000
+                issued_at = base_date - timedelta(days=rng.randint(0, task["days"]))
+                # The issue date is drawn after the lines, so lines are finished here to keep the random stream
+                # (and the generated data) the same for both layouts.
+                line_end = f"\t{issued_at.isoformat()}\n" if task["partitioned"] else "\n"
+                line_rows.extend(line + line_end for line in bill_lines)
+                bill_rows.append(
+                    f"{bill_id}\tBILL-{bill_id:04d}\t{issued_at.isoformat()}\t{rng.choice(CUSTOMERS)}\tUSD\t"
+                    f"{cents(subtotal)}\t{cents(tax)}\n"
+                )
+                if len(line_rows) >= COPY_FLUSH_ROWS:
+                    line_copy.write("".join(line_rows))
+                    line_rows.clear()
+            if line_rows:
+                line_copy.write("".join(line_rows))
+        # Bill rows need their subtotal, so lines stream first; the foreign key is only rebuilt after the load.
+        with cur.copy(COPY_BILL) as bill_copy:
+            for start in range(0, len(bill_rows), COPY_FLUSH_ROWS):
+                bill_copy.write("".join(bill_rows[start : start + COPY_FLUSH_ROWS]))
+    _worker_conn.commit()
+    return len(counts), line_id - task["first_line_id"]
+
+
+def capture_constraints(conn: psycopg.Connection) -> dict[str, list[tuple[str, str, str]]]:
+    constraints = conn.execute(
+        """
+        SELECT conrelid::regclass::text, conname, contype, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid IN ('bill'::regclass, 'bill_line'::regclass) AND contype IN ('p', 'u', 'f')
+        ORDER BY conname
+        """
+    ).fetchall()
+    indexes = conn.execute(
+        """
+        SELECT indrelid::regclass::text, indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+        FROM pg_index i
+        WHERE indrelid IN ('bill'::regclass, 'bill_line'::regclass)
+          AND NOT EXISTS (
+            SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid AND c.contype IN ('p', 'u', 'x')
+          )
+        """
+    ).fetchall()
+    return {
+        "keys": [(table, name, definition) for table, name, kind, definition in constraints if kind != "f"],
+        "foreign_keys": [(table, name, definition) for table, name, kind, definition in constraints if kind == "f"],
+        "indexes": indexes,
+    }
+
+
+def drop_constraints(conn: psycopg.Connection, captured: dict[str, list[tuple[str, str, str]]]) -> None:
+    for table, name, _ in captured["foreign_keys"] + captured["keys"]:
+        conn.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    for _, name, _ in captured["indexes"]:
+        conn.execute(f"DROP INDEX {name}")
+
+
+def restore_constraints(
+    conninfo: str,
+    captured: dict[str, list[tuple[str, str, str]]],
+    workers: int,
+    maintenance_work_mem: str,
+) -> None:
+    def run(statement: str) -> None:
+        with psycopg.connect(conninfo, autocommit=True) as conn:
+            conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+            conn.execute(statement)
+
+    statements = [f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}' for table, name, definition in captured["keys"]]
+    statements += [definition for _, _, definition in captured["indexes"]]
+    # Index builds on different tables do not block each other; foreign keys need the referenced keys first.
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(statements)))) as executor:
+        list(executor.map(run, statements))
+    for table, name, definition in captured["foreign_keys"]:
+        run(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+
+
+def has_partitioned_layout(conn: psycopg.Connection) -> bool:
+    return (
+        conn.execute(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'bill_line' AND column_name = 'issued_at'
+            """
+        ).fetchone()
+        is not None
+    )
+
+
+def has_bill_number_key(conn: psycopg.Connection) -> bool:
+    return conn.execute("SELECT to_regclass('bill_number_key')").fetchone()[0] is not None
+
+
+def plan_chunks(args: argparse.Namespace, partitioned: bool) -> list[dict[str, Any]]:
+    tasks = []
+    first_bill_id = first_line_id = 1
+    for chunk, start in enumerate(range(0, args.bills, args.chunk_size)):
+        bills = min(args.chunk_size, args.bills - start)
+        lines = sum(line_counts(args.seed, chunk, bills, args.line_distribution, args.min_lines, args.max_lines))
+        tasks.append(
+            {
+                "chunk": chunk,
+                "seed": args.seed,
+                "bills": bills,
+                "first_bill_id": first_bill_id,
+                "first_line_id": first_line_id,
+                "distribution": args.line_distribution,
+                "min_lines": args.min_lines,
+                "max_lines": args.max_lines,
+                "base_date": args.base_date,
+                "days": args.days,
+                "partitioned": partitioned,
+            }
+        )
+        first_bill_id += bills
+        first_line_id += lines
+    return tasks
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replace the bill dataset with deterministic generated bills, loaded in parallel with COPY"
+    )
+    parser.add_argument("--bills", type=int, default=100, help="Number of bills to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed always yields the same rows")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Parallel COPY worker processes")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Bills per COPY transaction")
+    parser.add_argument(
+        "--line-distribution",
+        choices=["uniform", "lognormal"],
+        default="uniform",
+        help="uniform: like db/seed.sql; lognormal: mostly small bills with a long tail of large ones",
+    )
+    parser.add_argument("--min-lines", type=int, default=10, help="Minimum lines per bill")
+    parser.add_argument("--max-lines", type=int, default=15, help="Maximum lines per bill")
+    parser.add_argument("--base-date", default=date.today().isoformat(), help="Latest issued_at date (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=180, help="issued_at is spread over this many days before --base-date")
+    parser.add_argument("--maintenance-work-mem", default="512MB", help="maintenance_work_mem for index builds")
+    parser.add_argument("--output-json", help="Optional path to write the load timings as JSON")
+
+    parser.add_argument("--db-host", default=os.getenv("POSTGRES_HOST", "localhost"), help="Postgres host")
+    parser.add_argument("--db-port", type=int, default=int(os.getenv("POSTGRES_PORT", "5440")), help="Postgres port")
+    parser.add_argument("--db-name", default=os.getenv("POSTGRES_DB", "api_lang_arena"), help="Postgres database")
+    parser.add_argument("--db-user", default=os.getenv("POSTGRES_USER", "api_lang_user"), help="Postgres user")
+    parser.add_argument("--db-password", default=os.getenv("POSTGRES_PASSWORD", "api_lang_password"), help="Postgres password")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.bills <= 0:
+        raise SystemExit("--bills must be greater than 0")
+    if args.workers <= 0:
+        raise SystemExit("--workers must be greater than 0")
+    if args.chunk_size <= 0:
+        raise SystemExit("--chunk-size must be greater than 0")
+    if args.min_lines <= 0 or args.min_lines > args.max_lines:
+        raise SystemExit("--min-lines must be greater than 0 and not greater than --max-lines")
+    if args.days < 0:
+        raise SystemExit("--days must be 0 or greater")
+    try:
+        date.fromisoformat(args.base_date)
+    except ValueError:
+        raise SystemExit("--base-date must be a YYYY-MM-DD date")
+
+    conninfo = build_conninfo(args.db_host, args.db_port, args.db_name, args.db_user, args.db_password)
+    started = time.perf_counter()
+
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute(SCHEMA_SQL)
+        tasks = plan_chunks(args, has_partitioned_layout(conn))
+        conn.execute("TRUNCATE TABLE bill_line, bill RESTART IDENTITY")
+        captured = capture_constraints(conn)
+        drop_constraints(conn, captured)
+        # db/partition_bills.sql layout: fill bill_number_key in one pass after the load, not row by row.
+        bill_number_key = has_bill_number_key(conn)
+        if bill_number_key:
+            conn.execute("ALTER TABLE bill DISABLE TRIGGER bill_number_key_sync")
+
+    load_started = time.perf_counter()
+    bills = lines = 0
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=min(args.workers, len(tasks)), initializer=_init_worker, initargs=(conninfo,)) as pool:
+        for chunk_bills, chunk_lines in pool.imap_unordered(load_chunk, tasks):
+            bills += chunk_bills
+            lines += chunk_lines
+            print(f"Loaded {bills}/{args.bills} bills, {lines} lines", flush=True)
+    load_sec = time.perf_counter() - load_started
+
+    index_started = time.perf_counter()
+    restore_constraints(conninfo, captured, args.workers, args.maintenance_work_mem)
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        if bill_number_key:
+            conn.execute("INSERT INTO bill_number_key (bill_number) SELECT bill_number FROM bill")
+            conn.execute("ALTER TABLE bill ENABLE TRIGGER bill_number_key_sync")
+        for table in ("bill", "bill_line"):
+            conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            )
+        conn.execute("VACUUM (ANALYZE) bill, bill_line")
+    index_sec = time.perf_counter() - index_started
+
+    result = {
+        "bills": bills,
+        "bill_lines": lines,
+        "seed": args.seed,
+        "line_distribution": args.line_distribution,
+        "workers": args.workers,
+        "load_sec": round(load_sec, 3),
+        "index_sec": round(index_sec, 3),
+        "total_sec": round(time.perf_counter() - started, 3),
+        "lines_per_sec": round(lines / load_sec, 2) if load_sec > 0 else 0.0,
+    }
+    print(
+        f"Seeded {bills} bills / {lines} lines in {result['total_sec']}s "
+        f"(load {result['load_sec']}s at {result['lines_per_sec']} lines/s, indexes and vacuum {result['index_sec']}s)"
+    )
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import itertools
+import json
+import math
+import random
+import re
+import statistics
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from timeseries import read_timeseries, summarize_stable_window
+
+
+# Metric name -> True when a higher value is better.
+METRICS = {
+    "throughput": True,
+    "avg": False,
+    "p95": False,
+    "p99": False,
+}
+
+REPORT_NAME = re.compile(r"^(?P<key>.+)-r(?P<round>\d+)-(?P<ts>\d{8}-\d{6})\.json$")
+
+
+def bootstrap_ci(
+    values: list[float],
+    statistic: Callable[[list[float]], float] = statistics.median,
+    iterations: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> tuple[float, float, float]:
+    point = statistic(values)
+    if len(values) < 2:
+        return point, point, point
+    rng = random.Random(seed)
+    estimates = sorted(statistic(rng.choices(values, k=len(values))) for _ in range(iterations))
+    tail = (1 - confidence) / 2
+    low = estimates[int(math.floor(tail * (iterations - 1)))]
+    high = estimates[int(math.ceil((1 - tail) * (iterations - 1)))]
+    return point, low, high
+
+
+def _incomplete_beta(x: float, a: float, b: float) -> float:
+    # Regularized incomplete beta I_x(a, b), by Lentz's continued fraction.
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _incomplete_beta(1.0 - x, b, a)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return front * fraction
+
+
+def welch_t_test(a: list[float], b: list[float]) -> float:
+    # Two-sided. Unlike an exact permutation test, whose smallest two-sided p-value is 2 / C(n_a + n_b, n_a), the p-value is
+    # not bounded by the round count, so it can survive a multiple-comparison adjustment.
+    if len(a) < 2 or len(b) < 2:
+        return 1.0
+    var_a = statistics.variance(a) / len(a)
+    var_b = statistics.variance(b) / len(b)
+    diff = statistics.mean(a) - statistics.mean(b)
+    if var_a + var_b == 0:
+        return 1.0 if diff == 0 else 0.0
+    t = diff / math.sqrt(var_a + var_b)
+    df = (var_a + var_b) ** 2 / (var_a**2 / (len(a) - 1) + var_b**2 / (len(b) - 1))
+    return _incomplete_beta(df / (df + t * t), df / 2, 0.5)
+
+
+def holm_adjust(p_values: list[float]) -> list[float]:
+    order = sorted(range(len(p_values)), key=lambda i: p_values[i])
+    adjusted = [1.0] * len(p_values)
+    running = 0.0
+    for rank, index in enumerate(order):
+        running = max(running, min((len(p_values) - rank) * p_values[index], 1.0))
+        adjusted[index] = running
+    return adjusted
+
+
+def pct_change(new: float, old: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def summarize(
+    samples: dict[str, dict[str, list[float]]],
+    iterations: int,
+    confidence: float,
+) -> dict[str, dict[str, dict[str, float]]]:
+    summary: dict[str, dict[str, dict[str, float]]] = {}
+    for name, metrics in samples.items():
+        summary[name] = {}
+        for metric in METRICS:
+            values = metrics.get(metric, [])
+            if not values:
+                continue
+            point, low, high = bootstrap_ci(values, iterations=iterations, confidence=confidence)
+            summary[name][metric] = {"median": point, "ci_low": low, "ci_high": high}
+    return summary
+
+
+def pairwise_tests(
+    samples: dict[str, dict[str, list[float]]],
+    metric: str,
+    alpha: float,
+) -> list[dict[str, Any]]:
+    names = [name for name, metrics in samples.items() if metrics.get(metric)]
+    pairs = list(itertools.combinations(names, 2))
+    p_values = [welch_t_test(samples[a][metric], samples[b][metric]) for a, b in pairs]
+    adjusted = holm_adjust(p_values)
+    results = []
+    for (a, b), p_value, p_adjusted in zip(pairs, p_values, adjusted):
+        median_a = statistics.median(samples[a][metric])
+        median_b = statistics.median(samples[b][metric])
+        results.append(
+            {
+                "a": a,
+                "b": b,
+                "median_a": median_a,
+                "median_b": median_b,
+                "diff_pct": round(pct_change(median_a, median_b), 2),
+                "p_value": round(p_value, 4),
+                "p_adjusted": round(p_adjusted, 4),
+                "significant": p_adjusted < alpha,
+            }
+        )
+    return results
+
+
+def report_metrics(report_path: Path, stable_warmup_sec: float) -> dict[str, float]:
+    with report_path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    throughput = float(data["summary"]["throughput_req_per_sec"])
+    latency = data["latency_ms"]
+    timeseries_path = report_path.with_suffix(".timeseries.ndjson")
+    if timeseries_path.exists():
+        stable = summarize_stable_window(read_timeseries(str(timeseries_path)), stable_warmup_sec)
+        throughput = stable["throughput_req_per_sec"]
+        latency = stable["latency_ms"]
+    return {
+        "throughput": throughput,
+        "avg": float(latency["avg"]),
+        "p95": float(latency["p95"]),
+        "p99": float(latency["p99"]),
+    }
+
+
+def load_report_dir(report_dir: str, stable_warmup_sec: float) -> dict[str, dict[str, list[float]]]:
+    latest_ts: dict[str, str] = {}
+    paths: dict[tuple[str, str], list[Path]] = {}
+    for path in sorted(Path(report_dir).glob("*.json")):
+        match = REPORT_NAME.match(path.name)
+        if match is None:
+            continue
+        key, ts = match.group("key"), match.group("ts")
+        latest_ts[key] = max(latest_ts.get(key, ts), ts)
+        paths.setdefault((key, ts), []).append(path)
+
+    samples: dict[str, dict[str, list[float]]] = {}
+    for key, ts in latest_ts.items():
+        samples[key] = {metric: [] for metric in METRICS}
+        for path in paths[(key, ts)]:
+            for metric, value in report_metrics(path, stable_warmup_sec).items():
+                samples[key][metric].append(value)
+    return samples
+
+
+def detect_regressions(
+    current: dict[str, dict[str, list[float]]],
+    baseline: dict[str, dict[str, list[float]]],
+    threshold_pct: float,
+    alpha: float,
+) -> list[dict[str, Any]]:
+    results = []
+    for key in sorted(set(current) & set(baseline)):
+        for metric, higher_is_better in METRICS.items():
+            new_values = current[key].get(metric, [])
+            old_values = baseline[key].get(metric, [])
+            if not new_values or not old_values:
+                continue
+            change = pct_change(statistics.median(new_values), statistics.median(old_values))
+            worse_pct = -change if higher_is_better else change
+            # Welch rather than a permutation test, which cannot go below p = 0.1 with 2-3 rounds per side.
+            p_value = welch_t_test(new_values, old_values)
+            # Single-round runs cannot be tested, so they fall back to the threshold alone.
+            significant = p_value < alpha or min(len(new_values), len(old_values)) < 2
+            results.append(
+                {
+                    "target": key,
+                    "metric": metric,
+                    "baseline_median": statistics.median(old_values),
+                    "current_median": statistics.median(new_values),
+                    "change_pct": round(change, 2),
+                    "p_value": round(p_value, 4),
+                    "regressed": worse_pct > threshold_pct and significant,
+                }
+            )
+    return results
+
+
+def record_efficiency(samples: dict[str, list[float]], report: dict[str, Any]) -> None:
+    resources = report.get("resources")
+    if not resources:
+        return
+    measured = [item for item in resources["targets"].values() if "error" not in item]
+    if not measured:
+        return
+    samples["requests_per_cpu_sec"].append(resources["efficiency"]["requests_per_cpu_sec"])
+    samples["cpu_cores_avg"].append(sum(item["cpu_cores_avg"] for item in measured))
+    samples["peak_rss_mb"].append(resources["efficiency"]["peak_rss_mb"])
+
+
+def print_efficiency(efficiency: dict[str, dict[str, list[float]]]) -> None:
+    rows = [(label, values) for label, values in efficiency.items() if values["requests_per_cpu_sec"]]
+    if not rows:
+        return
+    print()
+    print("Server efficiency (median across rounds):")
+    print(f"{'API':<10} {'Req/CPU-s':>12} {'CPU cores':>10} {'Peak RSS MB':>12}")
+    for label, values in rows:
+        print(
+            f"{label:<10} {statistics.median(values['requests_per_cpu_sec']):>12.2f} "
+            f"{statistics.median(values['cpu_cores_avg']):>10.3f} {statistics.median(values['peak_rss_mb']):>12.2f}"
+        )
+
+
+def comparison_stage(
+    targets: list[tuple[str, str]],
+    samples: dict[str, dict[str, list[float]]],
+    output_path: Path,
+    baseline_dir: Optional[str] = None,
+    stable_warmup_sec: float = 0.0,
+    threshold_pct: float = 5.0,
+    alpha: float = 0.05,
+    iterations: int = 2000,
+    confidence: float = 0.95,
+) -> int:
+    labels = {key: label for key, label in targets}
+    by_label = {labels[key]: samples[key] for key, _ in targets if key in samples}
+    summary = summarize(by_label, iterations, confidence)
+
+    print()
+    print(f"Bootstrap {confidence:.0%} confidence intervals of the median across rounds:")
+    print(f"{'API':<10} " + " ".join(f"{metric:>24}" for metric in METRICS))
+    for label, metrics in summary.items():
+        cells = []
+        for metric in METRICS:
+            item = metrics.get(metric)
+            cells.append(
+                f"{item['median']:>9.2f} [{item['ci_low']:.2f}-{item['ci_high']:.2f}]".rjust(24) if item else " " * 24
+            )
+        print(f"{label:<10} " + " ".join(cells))
+
+    pairwise = {metric: pairwise_tests(by_label, metric, alpha) for metric in METRICS}
+    print()
+    print(f"Adjacent-rank differences (Welch t-test, Holm-adjusted, alpha={alpha}):")
+    for metric, higher_is_better in METRICS.items():
+        ranked = sorted(
+            (label for label in summary if metric in summary[label]),
+            key=lambda label: summary[label][metric]["median"],
+            reverse=higher_is_better,
+        )
+        tests = {frozenset((item["a"], item["b"])): item for item in pairwise[metric]}
+        parts = [ranked[0]] if ranked else []
+        for better, worse in zip(ranked, ranked[1:]):
+            item = tests[frozenset((better, worse))]
+            parts.append(f"{'>' if item['significant'] else '~'} {worse}")
+        print(f"  {metric:<10} " + " ".join(parts))
+    print("  ('>' significant difference, '~' within noise)")
+
+    regressions: list[dict[str, Any]] = []
+    if baseline_dir:
+        baseline = load_report_dir(baseline_dir, stable_warmup_sec)
+        regressions = detect_regressions(samples, baseline, threshold_pct, alpha)
+        print()
+        print(f"Baseline comparison against {baseline_dir} (threshold {threshold_pct:g}%):")
+        if not regressions:
+            print("  no matching targets in baseline")
+        for item in regressions:
+            flag = "REGRESSION" if item["regressed"] else "ok"
+            print(
+                f"  {labels.get(item['target'], item['target']):<10} {item['metric']:<10} "
+                f"{item['baseline_median']:>10.2f} -> {item['current_median']:>10.2f} "
+                f"({item['change_pct']:+.2f}%, p={item['p_value']}) {flag}"
+            )
+
+    with output_path.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "confidence": confidence,
+                "alpha": alpha,
+                "threshold_pct": threshold_pct,
+                "baseline_dir": baseline_dir,
+                "summary": summary,
+                "pairwise": pairwise,
+                "baseline_comparison": regressions,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Comparison written to {output_path}")
+
+    regressed = [item for item in regressions if item["regressed"]]
+    if regressed:
+        print(f"Performance gate failed: {len(regressed)} regression(s) beyond {threshold_pct:g}%.")
+        return 3
+    return 0
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import time
+from typing import Any
+
+import psycopg
+from psycopg import sql
+
+
+SNAPSHOT_TABLES = ("bill", "bill_line")
+SNAPSHOT_TABLE_PREFIX = "bench_snapshot_"
+DEFAULT_DELETE_BATCH_SIZE = 1000
+
+
+def build_conninfo(db_host: str, db_port: int, db_name: str, db_user: str, db_password: str) -> str:
+    return f"host={db_host} port={db_port} dbname={db_name} user={db_user} password={db_password}"
+
+
+def delete_bills_by_prefix(
+    prefix: str,
+    db_host: str,
+    db_port: int,
+    db_name: str,
+    db_user: str,
+    db_password: str,
+) -> dict:
+    pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    try:
+        with psycopg.connect(build_conninfo(db_host, db_port, db_name, db_user, db_password)) as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM bill WHERE bill_number LIKE %s", (pattern,))
+                deleted = cur.rowcount
+            conn.commit()
+        return {"attempted": True, "method": "prefix", "deleted_bill_count": deleted, "batches": 1, "error": None}
+    except Exception as exc:  # noqa: BLE001
+        return {"attempted": True, "method": "prefix", "deleted_bill_count": 0, "batches": 0, "error": str(exc)}
+
+
+def delete_created_bills(
+    bill_ids: list[int],
+    prefix: str,
+    ids_complete: bool,
+    db_host: str,
+    db_port: int,
+    db_name: str,
+    db_user: str,
+    db_password: str,
+    batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+) -> dict:
+    # A POST that timed out or returned an unreadable body may still have committed, and its id is unknown; one
+    # prefix scan then catches those bills too.
+    if not ids_complete:
+        return delete_bills_by_prefix(prefix, db_host, db_port, db_name, db_user, db_password)
+    return delete_bills(bill_ids, db_host, db_port, db_name, db_user, db_password, batch_size)
+
+
+def delete_bills(
+    bill_ids: list[int],
+    db_host: str,
+    db_port: int,
+    db_name: str,
+    db_user: str,
+    db_password: str,
+    batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+) -> dict:
+    # Lines go with their bill through ON DELETE CASCADE; each batch commits on its own to keep locks short.
+    deleted = batches = 0
+    try:
+        with psycopg.connect(build_conninfo(db_host, db_port, db_name, db_user, db_password)) as conn:
+            for start in range(0, len(bill_ids), batch_size):
+                with conn.cursor() as cur:
+                    cur.execute("DELETE FROM bill WHERE id = ANY(%s)", (bill_ids[start : start + batch_size],))
+                    deleted += cur.rowcount
+                conn.commit()
+                batches += 1
+        return {"attempted": True, "method": "ids", "deleted_bill_count": deleted, "batches": batches, "error": None}
+    except Exception as exc:  # noqa: BLE001
+        return {"attempted": True, "method": "ids", "deleted_bill_count": deleted, "batches": batches, "error": str(exc)}
+
+
+def _snapshot_name(table: str, prefix: str) -> sql.Identifier:
+    return sql.Identifier(prefix + table)
+
+
+def _snapshot_columns(cur: psycopg.Cursor, table: str, prefix: str) -> list[str]:
+    cur.execute(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = %s
+        ORDER BY ordinal_position
+        """,
+        (prefix + table,),
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def table_snapshot_exists(conninfo: str, prefix: str = SNAPSHOT_TABLE_PREFIX) -> bool:
+    with psycopg.connect(conninfo) as conn, conn.cursor() as cur:
+        return all(_snapshot_columns(cur, table, prefix) for table in SNAPSHOT_TABLES)
+
+
+def create_table_snapshot(conninfo: str, prefix: str = SNAPSHOT_TABLE_PREFIX) -> dict[str, int]:
+    # Unlogged copies skip WAL, so taking and reading the snapshot is cheap; they are lost on a crash, which only
+    # means taking the snapshot again.
+    counts = {}
+    with psycopg.connect(conninfo) as conn, conn.cursor() as cur:
+        for table in SNAPSHOT_TABLES:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(_snapshot_name(table, prefix)))
+            cur.execute(
+                sql.SQL("CREATE UNLOGGED TABLE {} AS TABLE {}").format(
+                    _snapshot_name(table, prefix), sql.Identifier(table)
+                )
+            )
+            counts[table] = cur.rowcount
+    return counts
+
+
+def restore_table_snapshot(conninfo: str, prefix: str = SNAPSHOT_TABLE_PREFIX) -> dict[str, int]:
+    # TRUNCATE swaps in fresh files, so dead tuples and index bloat from earlier rounds are gone as well.
+    counts = {}
+    with psycopg.connect(conninfo) as conn, conn.cursor() as cur:
+        columns = {table: _snapshot_columns(cur, table, prefix) for table in SNAPSHOT_TABLES}
+        missing = [table for table, names in columns.items() if not names]
+        if missing:
+            raise RuntimeError(f"No snapshot for {', '.join(missing)}; run 'dataset_reset.py snapshot' first.")
+        cur.execute("TRUNCATE TABLE bill_line, bill RESTART IDENTITY")
+        for table in SNAPSHOT_TABLES:
+            column_list = sql.SQL(", ").join(sql.Identifier(name) for name in columns[table])
+            cur.execute(
+                sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {}").format(
+                    sql.Identifier(table), column_list, column_list, _snapshot_name(table, prefix)
+                )
+            )
+            counts[table] = cur.rowcount
+            cur.execute(
+                sql.SQL("SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {}").format(
+                    sql.Identifier(table)
+                ),
+                (table,),
+            )
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute("ANALYZE bill, bill_line")
+    return counts
+
+
+def drop_table_snapshot(conninfo: str, prefix: str = SNAPSHOT_TABLE_PREFIX) -> None:
+    with psycopg.connect(conninfo) as conn, conn.cursor() as cur:
+        for table in SNAPSHOT_TABLES:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(_snapshot_name(table, prefix)))
+
+
+def maintenance_conninfo(db_host: str, db_port: int, db_user: str, db_password: str) -> str:
+    return build_conninfo(db_host, db_port, "postgres", db_user, db_password)
+
+
+def template_snapshot_exists(maintenance: str, snapshot_db: str) -> bool:
+    with psycopg.connect(maintenance) as conn:
+        return conn.execute("SELECT 1 FROM pg_database WHERE datname = %s", (snapshot_db,)).fetchone() is not None
+
+
+def create_template_snapshot(maintenance: str, db_name: str, snapshot_db: str) -> None:
+    # CREATE DATABASE ... TEMPLATE needs the source to be idle, so open API connections are terminated. Pools that
+    # check connections on checkout (the Python API's) reconnect quietly; others fail one request per pooled
+    # connection, which lands in the next round's results.
+    with psycopg.connect(maintenance, autocommit=True) as conn:
+        conn.execute(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s AND pid <> pg_backend_pid()",
+            (db_name,),
+        )
+        conn.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(snapshot_db)))
+        conn.execute(
+            sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(sql.Identifier(snapshot_db), sql.Identifier(db_name))
+        )
+
+
+def restore_template_snapshot(maintenance: str, db_name: str, snapshot_db: str) -> None:
+    if not template_snapshot_exists(maintenance, snapshot_db):
+        raise RuntimeError(f"Snapshot database '{snapshot_db}' does not exist; run 'dataset_reset.py snapshot' first.")
+    with psycopg.connect(maintenance, autocommit=True) as conn:
+        conn.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(db_name)))
+        conn.execute(
+            sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(sql.Identifier(db_name), sql.Identifier(snapshot_db))
+        )
+
+
+def drop_template_snapshot(maintenance: str, snapshot_db: str) -> None:
+    with psycopg.connect(maintenance, autocommit=True) as conn:
+        conn.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(snapshot_db)))
+
+
+def run_action(args: argparse.Namespace) -> dict[str, Any]:
+    conninfo = build_conninfo(args.db_host, args.db_port, args.db_name, args.db_user, args.db_password)
+    maintenance = maintenance_conninfo(args.db_host, args.db_port, args.db_user, args.db_password)
+    snapshot_db = args.snapshot_db or f"{args.db_name}_snapshot"
+    template = args.method == "template"
+    result: dict[str, Any] = {"action": args.action, "method": args.method}
+
+    if args.action == "status":
+        result["exists"] = (
+            template_snapshot_exists(maintenance, snapshot_db) if template else table_snapshot_exists(conninfo)
+        )
+    elif args.action == "snapshot":
+        exists = template_snapshot_exists(maintenance, snapshot_db) if template else table_snapshot_exists(conninfo)
+        if exists and args.if_missing:
+            result["skipped"] = True
+        elif template:
+            create_template_snapshot(maintenance, args.db_name, snapshot_db)
+        else:
+            result["rows"] = create_table_snapshot(conninfo)
+    elif args.action == "restore":
+        if template:
+            restore_template_snapshot(maintenance, args.db_name, snapshot_db)
+        else:
+            result["rows"] = restore_table_snapshot(conninfo)
+    elif template:
+        drop_template_snapshot(maintenance, snapshot_db)
+    else:
+        drop_table_snapshot(conninfo)
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Snapshot the seeded bill dataset and restore it between benchmark rounds"
+    )
+    parser.add_argument("action", choices=["snapshot", "restore", "drop", "status"], help="What to do")
+    parser.add_argument(
+        "--method",
+        choices=["table", "template"],
+        default="table",
+        help="table: unlogged copies of bill/bill_line inside the database (APIs stay connected); "
+        "template: a whole snapshot database, restored with DROP/CREATE DATABASE ... TEMPLATE",
+    )
+    parser.add_argument("--snapshot-db", help="Snapshot database name for --method template (default: <db>_snapshot)")
+    parser.add_argument("--if-missing", action="store_true", help="Only take a snapshot when none exists yet")
+    parser.add_argument("--quiet", action="store_true", help="Suppress summary line output")
+
+    parser.add_argument("--db-host", default=os.getenv("POSTGRES_HOST", "localhost"), help="Postgres host")
+    parser.add_argument("--db-port", type=int, default=int(os.getenv("POSTGRES_PORT", "5440")), help="Postgres port")
+    parser.add_argument("--db-name", default=os.getenv("POSTGRES_DB", "api_lang_arena"), help="Postgres database")
+    parser.add_argument("--db-user", default=os.getenv("POSTGRES_USER", "api_lang_user"), help="Postgres user")
+    parser.add_argument("--db-password", default=os.getenv("POSTGRES_PASSWORD", "api_lang_password"), help="Postgres password")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    try:
+        result = run_action(args)
+    except (psycopg.Error, RuntimeError) as exc:
+        raise SystemExit(f"Dataset {args.action} failed: {exc}")
+    if not args.quiet:
+        details = ", ".join(f"{key}={value}" for key, value in result.items() if key not in ("action", "method"))
+        print(
+            f"Dataset {args.action} ({args.method}) finished in {time.perf_counter() - started:.2f}s"
+            + (f": {details}" if details else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import multiprocessing
+import time
+from dataclasses import asdict, replace
+from typing import Any, Optional
+
+from benchmark import LoadJob, ResultRecorder, build_report, run_load
+
+
+def split_evenly(total: int, parts: int) -> list[int]:
+    base, remainder = divmod(total, parts)
+    return [base + (1 if index < remainder else 0) for index in range(parts)]
+
+
+def split_job(job: LoadJob, workers: int) -> list[LoadJob]:
+    requests = split_evenly(job.requests, workers)
+    concurrency = split_evenly(job.concurrency, workers)
+    warmups = split_evenly(job.warmup_requests, workers)
+    return [
+        replace(
+            job,
+            requests=max(requests[index], 1),
+            concurrency=max(concurrency[index], 1),
+            warmup_requests=warmups[index],
+            rate=job.rate / workers if job.rate is not None else None,
+        )
+        for index in range(workers)
+    ]
+
+
+def run_worker(worker_id: int, job: dict[str, Any], start_at: float) -> dict[str, Any]:
+    recorder, wall_time_sec = run_load(LoadJob(**job), start_at=start_at)
+    finished_at = time.time()
+    started_at = finished_at - wall_time_sec
+    return {
+        "worker": worker_id,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "late_start_sec": max(started_at - start_at, 0.0),
+        "wall_time_sec": wall_time_sec,
+        "recorder": recorder.to_dict(),
+    }
+
+
+def merge_worker_results(
+    worker_results: list[dict[str, Any]],
+    target_rate: Optional[float] = None,
+) -> dict[str, Any]:
+    recorder = ResultRecorder.from_dict(worker_results[0]["recorder"])
+    for worker_result in worker_results[1:]:
+        recorder.merge(ResultRecorder.from_dict(worker_result["recorder"]))
+    wall_time_sec = max(w["finished_at"] for w in worker_results) - min(w["started_at"] for w in worker_results)
+
+    report = build_report(recorder, wall_time_sec, target_rate=target_rate)
+    report["workers"] = [
+        {
+            "worker": w["worker"],
+            "total_requests": w["recorder"]["total_requests"],
+            "wall_time_sec": round(w["wall_time_sec"], 3),
+            "late_start_sec": round(w["late_start_sec"], 3),
+        }
+        for w in sorted(worker_results, key=lambda w: w["worker"])
+    ]
+    return report
+
+
+def run_coordinator(job: LoadJob, workers: int, start_delay_sec: float = 2.0) -> dict[str, Any]:
+    jobs = split_job(job, workers)
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=workers) as pool:
+        # Every worker interpreter has to be up and importable before the common start time is chosen.
+        pool.map(time.sleep, [0] * workers, chunksize=1)
+        start_at = time.time() + start_delay_sec
+        # Open-loop workers are staggered so their combined timetable stays evenly spaced.
+        offset_sec = 1 / job.rate if job.rate is not None else 0.0
+        pending = [
+            pool.apply_async(run_worker, (index, asdict(worker_job), start_at + index * offset_sec))
+            for index, worker_job in enumerate(jobs)
+        ]
+        worker_results = [result.get() for result in pending]
+    return merge_worker_results(worker_results, target_rate=job.rate)
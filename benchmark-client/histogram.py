@@ -0,0 +1,137 @@
+import math
+from typing import Any
+
+
+# Log-linear (HDR-style) buckets: each power-of-two range of ``unit_ms`` multiples is split into enough linear
+# sub-buckets to keep relative error under 10 ** -significant_digits. Memory depends on range and precision only.
+class LatencyHistogram:
+    def __init__(
+        self,
+        significant_digits: int = 3,
+        highest_ms: float = 3_600_000.0,
+        unit_ms: float = 0.001,
+    ) -> None:
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        if highest_ms <= 0 or unit_ms <= 0:
+            raise ValueError("highest_ms and unit_ms must be greater than 0")
+        self.significant_digits = significant_digits
+        self.highest_ms = highest_ms
+        self.unit_ms = unit_ms
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_digits))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._half_count = self._sub_bucket_count // 2
+        self._highest_units = max(int(math.ceil(highest_ms / unit_ms)), 1)
+        self._counts = [0] * (self._index_for(self._highest_units) + 1)
+        self.count = 0
+        self.saturated_count = 0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+        self.sum_ms = 0.0
+        self.sum_sq_ms = 0.0
+
+    def _index_for(self, units: int) -> int:
+        if units < self._sub_bucket_count:
+            return units
+        shift = units.bit_length() - self._sub_bucket_bits
+        return shift * self._half_count + (units >> shift)
+
+    def _bucket_bounds(self, index: int) -> tuple[int, int]:
+        if index < self._sub_bucket_count:
+            return index, 1
+        shift = index // self._half_count - 1
+        return (index - shift * self._half_count) << shift, 1 << shift
+
+    def record(self, value_ms: float) -> None:
+        units = int(value_ms / self.unit_ms) if value_ms > 0 else 0
+        if units > self._highest_units:
+            units = self._highest_units
+            self.saturated_count += 1
+        self._counts[self._index_for(units)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.sum_sq_ms += value_ms * value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def _check_compatible(self, other: "LatencyHistogram") -> None:
+        if (self.significant_digits, self.highest_ms, self.unit_ms) != (
+            other.significant_digits,
+            other.highest_ms,
+            other.unit_ms,
+        ):
+            raise ValueError("Cannot merge histograms with different precision or range")
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self._check_compatible(other)
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+        self.count += other.count
+        self.saturated_count += other.saturated_count
+        self.sum_ms += other.sum_ms
+        self.sum_sq_ms += other.sum_sq_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, p: float) -> float:
+        if self.count == 0:
+            return 0.0
+        if p <= 0:
+            return self.min_ms
+        if p >= 100:
+            return self.max_ms
+        target = max(math.ceil(self.count * p / 100.0), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                low, width = self._bucket_bounds(index)
+                value = (low + width / 2) * self.unit_ms
+                return min(max(value, self.min_ms), self.max_ms)
+        return self.max_ms
+
+    def percentiles(self, ps: list[float]) -> dict[float, float]:
+        return {p: self.percentile(p) for p in ps}
+
+    def mean(self) -> float:
+        return self.sum_ms / self.count if self.count else 0.0
+
+    def stdev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        mean = self.mean()
+        return math.sqrt(max(self.sum_sq_ms / self.count - mean * mean, 0.0))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "significant_digits": self.significant_digits,
+            "highest_ms": self.highest_ms,
+            "unit_ms": self.unit_ms,
+            "count": self.count,
+            "saturated_count": self.saturated_count,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "sum_ms": self.sum_ms,
+            "sum_sq_ms": self.sum_sq_ms,
+            "buckets": {str(index): count for index, count in enumerate(self._counts) if count},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(
+            significant_digits=data["significant_digits"],
+            highest_ms=data["highest_ms"],
+            unit_ms=data["unit_ms"],
+        )
+        for index, count in data["buckets"].items():
+            histogram._counts[int(index)] = count
+        histogram.count = data["count"]
+        histogram.saturated_count = data.get("saturated_count", 0)
+        histogram.min_ms = data["min_ms"] if histogram.count else math.inf
+        histogram.max_ms = data["max_ms"]
+        histogram.sum_ms = data["sum_ms"]
+        histogram.sum_sq_ms = data["sum_sq_ms"]
+        return histogram
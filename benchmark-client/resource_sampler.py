@@ -0,0 +1,250 @@
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+
+PROC = Path("/proc")
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass
+class ResourceSample:
+    cpu_sec: float
+    rss_bytes: int
+    threads: int
+    sockets: int
+
+
+@dataclass
+class _TargetState:
+    name: str
+    pid: Optional[int] = None
+    cgroup: Optional[Path] = None
+    samples: list[ResourceSample] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+def _process_tree(root_pid: int) -> list[int]:
+    parents: dict[int, list[int]] = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = _read(entry / "stat")
+        except OSError:
+            continue
+        # The command name may contain spaces or parentheses; fields resume after the last ')'.
+        ppid = int(stat[stat.rindex(")") + 2 :].split()[1])
+        parents.setdefault(ppid, []).append(int(entry.name))
+    tree, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(parents.get(pid, []))
+    return tree
+
+
+def _process_sample(pids: list[int]) -> ResourceSample:
+    cpu_ticks = rss_pages = threads = sockets = 0
+    for pid in pids:
+        try:
+            fields = _read(PROC / str(pid) / "stat")
+            fields = fields[fields.rindex(")") + 2 :].split()
+            cpu_ticks += int(fields[11]) + int(fields[12])
+            threads += int(fields[17])
+            rss_pages += int(fields[21])
+        except (OSError, ValueError, IndexError):
+            continue
+        try:
+            for fd in (PROC / str(pid) / "fd").iterdir():
+                try:
+                    if os.readlink(fd).startswith("socket:"):
+                        sockets += 1
+                except OSError:
+                    continue
+        except OSError:
+            pass
+    return ResourceSample(cpu_ticks / CLOCK_TICKS, rss_pages * PAGE_SIZE, threads, sockets)
+
+
+def _cgroup_sample(cgroup: Path) -> ResourceSample:
+    usage_usec = 0
+    for line in _read(cgroup / "cpu.stat").splitlines():
+        name, _, value = line.partition(" ")
+        if name == "usage_usec":
+            usage_usec = int(value)
+    memory = int(_read(cgroup / "memory.current").strip())
+    pids = [int(pid) for pid in _read(cgroup / "cgroup.procs").split()]
+    processes = _process_sample(pids)
+    return ResourceSample(usage_usec / 1_000_000, memory, processes.threads, processes.sockets)
+
+
+def _cgroup_for_pid(pid: int) -> Optional[Path]:
+    for line in _read(PROC / str(pid) / "cgroup").splitlines():
+        if line.startswith("0::"):
+            path = CGROUP_ROOT / line[3:].lstrip("/")
+            if (path / "cpu.stat").exists():
+                return path
+    return None
+
+
+def _container_pid(name: str) -> int:
+    output = subprocess.run(
+        ["docker", "inspect", "-f", "{{.State.Pid}}", name],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=10,
+    ).stdout.strip()
+    pid = int(output)
+    if pid <= 0:
+        raise RuntimeError(f"Container '{name}' is not running.")
+    return pid
+
+
+class ResourceSampler:
+    def __init__(
+        self,
+        pids: Optional[list[int]] = None,
+        cgroups: Optional[list[str]] = None,
+        containers: Optional[list[str]] = None,
+        interval_sec: float = 0.5,
+    ) -> None:
+        self._interval_sec = interval_sec
+        self._targets: list[_TargetState] = []
+        for pid in pids or []:
+            self._targets.append(_TargetState(name=f"pid:{pid}", pid=pid))
+        for cgroup in cgroups or []:
+            self._targets.append(_TargetState(name=f"cgroup:{cgroup}", cgroup=Path(cgroup)))
+        for container in containers or []:
+            target = _TargetState(name=f"container:{container}")
+            try:
+                target.pid = _container_pid(container)
+                target.cgroup = _cgroup_for_pid(target.pid)
+            except (OSError, ValueError, RuntimeError, subprocess.SubprocessError) as exc:
+                target.error = f"{type(exc).__name__}: {exc}"
+            self._targets.append(target)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    def __enter__(self) -> "ResourceSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._sample_all()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sample_all()
+        self._stopped_at = time.perf_counter()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._interval_sec):
+            self._sample_all()
+
+    def _sample_all(self) -> None:
+        for target in self._targets:
+            if target.error is not None:
+                continue
+            try:
+                if target.cgroup is not None:
+                    sample = _cgroup_sample(target.cgroup)
+                else:
+                    sample = _process_sample(_process_tree(target.pid))
+            except (OSError, ValueError) as exc:
+                target.error = f"{type(exc).__name__}: {exc}"
+                continue
+            target.samples.append(sample)
+
+    def report(self, total_requests: int) -> dict[str, Any]:
+        wall_time_sec = self._stopped_at - self._started_at
+        targets: dict[str, Any] = {}
+        cpu_total = 0.0
+        peak_rss_total = 0
+        for target in self._targets:
+            if target.error is not None or len(target.samples) < 2:
+                targets[target.name] = {"error": target.error or "not enough samples"}
+                continue
+            cpu_sec = max(target.samples[-1].cpu_sec - target.samples[0].cpu_sec, 0.0)
+            rss = [sample.rss_bytes for sample in target.samples]
+            cpu_total += cpu_sec
+            peak_rss_total += max(rss)
+            targets[target.name] = {
+                "source": "cgroup" if target.cgroup is not None else "proc",
+                "samples": len(target.samples),
+                "cpu_sec": round(cpu_sec, 3),
+                "cpu_cores_avg": round(cpu_sec / wall_time_sec, 3) if wall_time_sec > 0 else 0.0,
+                "rss_mb_peak": round(max(rss) / 1_048_576, 2),
+                "rss_mb_avg": round(sum(rss) / len(rss) / 1_048_576, 2),
+                "threads_peak": max(sample.threads for sample in target.samples),
+                "sockets_peak": max(sample.sockets for sample in target.samples),
+            }
+        return {
+            "interval_sec": self._interval_sec,
+            "wall_time_sec": round(wall_time_sec, 3),
+            "targets": targets,
+            "efficiency": {
+                "cpu_sec": round(cpu_total, 3),
+                "requests_per_cpu_sec": round(total_requests / cpu_total, 2) if cpu_total > 0 else 0.0,
+                "cpu_ms_per_request": round(cpu_total * 1000 / total_requests, 3) if total_requests else 0.0,
+                "peak_rss_mb": round(peak_rss_total / 1_048_576, 2),
+            },
+        }
+
+
+def add_sampler_args(parser) -> None:
+    parser.add_argument(
+        "--sample-pid",
+        type=int,
+        action="append",
+        default=[],
+        help="Sample CPU, RSS, threads and sockets of this process and its children from /proc (repeatable)",
+    )
+    parser.add_argument(
+        "--sample-cgroup",
+        action="append",
+        default=[],
+        help="Sample a cgroup v2 directory, e.g. /sys/fs/cgroup/system.slice/docker-<id>.scope (repeatable)",
+    )
+    parser.add_argument(
+        "--sample-container",
+        action="append",
+        default=[],
+        help="Sample a Docker container by name through its cgroup (repeatable)",
+    )
+    parser.add_argument("--sample-interval-sec", type=float, default=0.5, help="Resource sampling interval")
+
+
+def sampler_from_args(args) -> Optional[ResourceSampler]:
+    if not (args.sample_pid or args.sample_cgroup or args.sample_container):
+        return None
+    if args.sample_interval_sec <= 0:
+        raise SystemExit("--sample-interval-sec must be greater than 0")
+    return ResourceSampler(
+        pids=args.sample_pid,
+        cgroups=args.sample_cgroup,
+        containers=args.sample_container,
+        interval_sec=args.sample_interval_sec,
+    )
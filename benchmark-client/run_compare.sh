@@ -45,9 +45,32 @@ CONCURRENCY="${CONCURRENCY:-25}"
 WARMUP_REQUESTS="${WARMUP_REQUESTS:-20}"
 TIMEOUT_SEC="${TIMEOUT_SEC:-10}"
 ROUNDS="${ROUNDS:-5}"
+DURATION_SEC="${DURATION_SEC:-}"
+TIMESERIES_INTERVAL_SEC="${TIMESERIES_INTERVAL_SEC:-1}"
+STABLE_WARMUP_SEC="${STABLE_WARMUP_SEC:-5}"
+BASELINE_DIR="${BASELINE_DIR:-}"
+REGRESSION_THRESHOLD_PCT="${REGRESSION_THRESHOLD_PCT:-5}"
+SIGNIFICANCE_ALPHA="${SIGNIFICANCE_ALPHA:-0.05}"
+BOOTSTRAP_ITERATIONS="${BOOTSTRAP_ITERATIONS:-2000}"
+CONFIDENCE="${CONFIDENCE:-0.95}"
+SAMPLE_CONTAINERS="${SAMPLE_CONTAINERS:-0}"
+CONTAINER_PREFIX="${CONTAINER_PREFIX:-api-lang-arena}"
+RESET_DB="${RESET_DB:-0}"
+SWEEP="${SWEEP:-0}"
+SWEEP_MODE="${SWEEP_MODE:-concurrency}"
+SWEEP_STEPS="${SWEEP_STEPS:-}"
+SWEEP_STEP_DURATION_SEC="${SWEEP_STEP_DURATION_SEC:-10}"
+SLO_P99_MS="${SLO_P99_MS:-100}"
+SLO_MIN_SUCCESS_PCT="${SLO_MIN_SUCCESS_PCT:-99}"
+MATRIX_SIZES="${MATRIX_SIZES:-}"
+MATRIX_ROUNDS="${MATRIX_ROUNDS:-3}"
+MATRIX_DURATION_SEC="${MATRIX_DURATION_SEC:-10}"
+MATRIX_LINE_DISTRIBUTION="${MATRIX_LINE_DISTRIBUTION:-uniform}"
+RESET_METHOD="${RESET_METHOD:-table}"
 RUN_POST_BENCHMARK="${RUN_POST_BENCHMARK:-1}"
 POST_ROUNDS="${POST_ROUNDS:-5}"
 POST_REQUESTS="${POST_REQUESTS:-10}"
+POST_DURATION_SEC="${POST_DURATION_SEC:-}"
 POST_CONCURRENCY="${POST_CONCURRENCY:-5}"
 POST_TIMEOUT_SEC="${POST_TIMEOUT_SEC:-10}"
 POST_MIN_LINES="${POST_MIN_LINES:-10}"
@@ -65,8 +88,63 @@ POST_NODE_URL="${POST_NODE_URL:-http://localhost:5084/bills}"
 POST_JAVA_URL="${POST_JAVA_URL:-http://localhost:5085/bills}"
 POST_RUST_URL="${POST_RUST_URL:-http://localhost:5086/bills}"
 TS="$(date +%Y%m%d-%H%M%S)"
+GATE_STATUS=0
+POST_GATE_STATUS=0
 
-"${PYTHON_BIN}" - "${PYTHON_BIN}" "${SCRIPT_DIR}" "${REPORTS_DIR}" "${TS}" "${REQUESTS}" "${CONCURRENCY}" "${WARMUP_REQUESTS}" "${TIMEOUT_SEC}" "${ROUNDS}" "${DOTNET_MINIMAL_URL}" "${DOTNET_DDD_URL}" "${PYTHON_MINIMAL_URL}" "${PYTHON_DDD_URL}" "${GO_MINIMAL_URL}" "${GO_DDD_URL}" "${KOTLIN_MINIMAL_URL}" "${KOTLIN_DDD_URL}" "${NODE_MINIMAL_URL}" "${NODE_DDD_URL}" "${JAVA_MINIMAL_URL}" "${JAVA_DDD_URL}" "${RUST_MINIMAL_URL}" "${RUST_DDD_URL}" <<'PY'
+if [[ "${RESET_DB}" == "1" ]]; then
+  "${PYTHON_BIN}" "${SCRIPT_DIR}/dataset_reset.py" snapshot --if-missing --method "${RESET_METHOD}" \
+    --db-host "${POST_DB_HOST}" --db-port "${POST_DB_PORT}" --db-name "${POST_DB_NAME}" \
+    --db-user "${POST_DB_USER}" --db-password "${POST_DB_PASSWORD}"
+fi
+
+if [[ "${SWEEP}" == "1" ]]; then
+  # The sweep replaces the fixed-CONCURRENCY GET comparison: each target's knee is the headline number.
+  SWEEP_ARGS=(
+    --mode "${SWEEP_MODE}"
+    --step-duration-sec "${SWEEP_STEP_DURATION_SEC}"
+    --warmup-requests "${WARMUP_REQUESTS}"
+    --timeout-sec "${TIMEOUT_SEC}"
+    --slo-p99-ms "${SLO_P99_MS}"
+    --min-success-pct "${SLO_MIN_SUCCESS_PCT}"
+    --output-json "${REPORTS_DIR}/sweep-get-${TS}.json"
+  )
+  if [[ -n "${SWEEP_STEPS}" ]]; then
+    SWEEP_ARGS+=(--steps "${SWEEP_STEPS}")
+  fi
+  "${PYTHON_BIN}" "${SCRIPT_DIR}/sweep.py" "${SWEEP_ARGS[@]}" \
+    --target ".NET-Min=${DOTNET_MINIMAL_URL}" --target ".NET-DDD=${DOTNET_DDD_URL}" \
+    --target "Py-Min=${PYTHON_MINIMAL_URL}" --target "Py-DDD=${PYTHON_DDD_URL}" \
+    --target "Go-Min=${GO_MINIMAL_URL}" --target "Go-DDD=${GO_DDD_URL}" \
+    --target "Kt-Min=${KOTLIN_MINIMAL_URL}" --target "Kt-DDD=${KOTLIN_DDD_URL}" \
+    --target "Node-Min=${NODE_MINIMAL_URL}" --target "Node-DDD=${NODE_DDD_URL}" \
+    --target "Java-Min=${JAVA_MINIMAL_URL}" --target "Java-DDD=${JAVA_DDD_URL}" \
+    --target "Rust-Min=${RUST_MINIMAL_URL}" --target "Rust-DDD=${RUST_DDD_URL}" || GATE_STATUS=$?
+elif [[ -n "${MATRIX_SIZES}" ]]; then
+  # Reseeds once per size with bulk_seed.py and restores the current dataset (from its own snapshot) afterwards.
+  "${PYTHON_BIN}" "${SCRIPT_DIR}/scaling.py" \
+    --sizes "${MATRIX_SIZES}" \
+    --rounds "${MATRIX_ROUNDS}" \
+    --duration-sec "${MATRIX_DURATION_SEC}" \
+    --concurrency "${CONCURRENCY}" \
+    --warmup-requests "${WARMUP_REQUESTS}" \
+    --line-distribution "${MATRIX_LINE_DISTRIBUTION}" \
+    --snapshot-method "${RESET_METHOD}" \
+    --db-host "${POST_DB_HOST}" --db-port "${POST_DB_PORT}" --db-name "${POST_DB_NAME}" \
+    --db-user "${POST_DB_USER}" --db-password "${POST_DB_PASSWORD}" \
+    --output-json "${REPORTS_DIR}/matrix-get-${TS}.json" \
+    --target ".NET-Min=${DOTNET_MINIMAL_URL}" --target ".NET-DDD=${DOTNET_DDD_URL}" \
+    --target "Py-Min=${PYTHON_MINIMAL_URL}" --target "Py-DDD=${PYTHON_DDD_URL}" \
+    --target "Go-Min=${GO_MINIMAL_URL}" --target "Go-DDD=${GO_DDD_URL}" \
+    --target "Kt-Min=${KOTLIN_MINIMAL_URL}" --target "Kt-DDD=${KOTLIN_DDD_URL}" \
+    --target "Node-Min=${NODE_MINIMAL_URL}" --target "Node-DDD=${NODE_DDD_URL}" \
+    --target "Java-Min=${JAVA_MINIMAL_URL}" --target "Java-DDD=${JAVA_DDD_URL}" \
+    --target "Rust-Min=${RUST_MINIMAL_URL}" --target "Rust-DDD=${RUST_DDD_URL}" || GATE_STATUS=$?
+else
+"${PYTHON_BIN}" - "${PYTHON_BIN}" "${SCRIPT_DIR}" "${REPORTS_DIR}" "${TS}" "${REQUESTS}" "${CONCURRENCY}" "${WARMUP_REQUESTS}" "${TIMEOUT_SEC}" "${ROUNDS}" "${DOTNET_MINIMAL_URL}" "${DOTNET_DDD_URL}" "${PYTHON_MINIMAL_URL}" "${PYTHON_DDD_URL}" "${GO_MINIMAL_URL}" "${GO_DDD_URL}" "${KOTLIN_MINIMAL_URL}" "${KOTLIN_DDD_URL}" "${NODE_MINIMAL_URL}" "${NODE_DDD_URL}" "${JAVA_MINIMAL_URL}" "${JAVA_DDD_URL}" "${RUST_MINIMAL_URL}" "${RUST_DDD_URL}" \
+  "${DURATION_SEC}" "${TIMESERIES_INTERVAL_SEC}" "${STABLE_WARMUP_SEC}" \
+  "${BASELINE_DIR}" "${REGRESSION_THRESHOLD_PCT}" "${SIGNIFICANCE_ALPHA}" "${BOOTSTRAP_ITERATIONS}" "${CONFIDENCE}" \
+  "${SAMPLE_CONTAINERS}" "${CONTAINER_PREFIX}" \
+  "${RESET_DB}" "${RESET_METHOD}" "${POST_DB_HOST}" "${POST_DB_PORT}" "${POST_DB_NAME}" "${POST_DB_USER}" "${POST_DB_PASSWORD}" <<'PY' || GATE_STATUS=$?
 import json
 import random
 import statistics
@@ -98,13 +176,36 @@ from pathlib import Path
     java_ddd_url,
     rust_min_url,
     rust_ddd_url,
-) = sys.argv[1:24]
+    duration_sec,
+    timeseries_interval_sec,
+    stable_warmup_sec,
+    baseline_dir,
+    regression_threshold_pct,
+    significance_alpha,
+    bootstrap_iterations,
+    confidence,
+    sample_containers,
+    container_prefix,
+    reset_db,
+    reset_method,
+    db_host,
+    db_port,
+    db_name,
+    db_user,
+    db_password,
+) = sys.argv[1:41]
 
 requests = int(requests)
 concurrency = int(concurrency)
 warmup_requests = int(warmup_requests)
 timeout_sec = float(timeout_sec)
 rounds = int(rounds)
+duration_sec = float(duration_sec) if duration_sec.strip() else None
+stable_warmup_sec = float(stable_warmup_sec)
+
+sys.path.insert(0, script_dir)
+from compare_stats import comparison_stage, print_efficiency, record_efficiency
+from timeseries import read_timeseries, sparkline, summarize_stable_window
 
 targets = [
     ("dotnet-minimal", ".NET-Min", dotnet_min_url),
@@ -127,13 +228,35 @@ metrics = {
     label: {"throughput": [], "success_rate": [], "avg": [], "p95": [], "p99": []}
     for _, label, _ in targets
 }
+efficiency = {label: {"requests_per_cpu_sec": [], "cpu_cores_avg": [], "peak_rss_mb": []} for _, label, _ in targets}
 
 report_paths = []
+throughput_curves = {}
+
+reset_cmd = [
+    python_bin,
+    str(Path(script_dir) / "dataset_reset.py"),
+    "restore",
+    "--method", reset_method,
+    "--db-host", db_host,
+    "--db-port", db_port,
+    "--db-name", db_name,
+    "--db-user", db_user,
+    "--db-password", db_password,
+    "--quiet",
+]
+
+
+def reset_dataset():
+    if reset_db == "1":
+        subprocess.run(reset_cmd, check=True)
+
 
 for round_idx in range(1, rounds + 1):
     order = list(targets)
     random.shuffle(order)
     print(f"Round {round_idx}/{rounds} order: " + ", ".join(label for _, label, _ in order))
+    reset_dataset()
     for key, label, url in order:
         report_path = Path(reports_dir) / f"{key}-r{round_idx}-{ts}.json"
         cmd = [
@@ -146,12 +269,33 @@ for round_idx in range(1, rounds + 1):
             "--timeout-sec", str(timeout_sec),
             "--output-json", str(report_path),
         ]
+        if duration_sec is not None:
+            timeseries_path = report_path.with_suffix(".timeseries.ndjson")
+            cmd += [
+                "--duration-sec", str(duration_sec),
+                "--timeseries-file", str(timeseries_path),
+                "--interval-sec", timeseries_interval_sec,
+            ]
+        if sample_containers == "1":
+            cmd += ["--sample-container", f"{container_prefix}-{key.split('-')[0]}-api"]
         subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
         report_paths.append((label, str(report_path)))
         with report_path.open("r", encoding="utf-8") as f:
             data = json.load(f)
+        record_efficiency(efficiency[label], data)
         summary = data["summary"]
         latency = data["latency_ms"]
+        if duration_sec is not None:
+            # Only the stable window counts: intervals that start inside the warm-up period are dropped.
+            intervals = read_timeseries(str(timeseries_path))
+            throughput_curves[label] = [item["throughput_req_per_sec"] for item in intervals]
+            stable = summarize_stable_window(intervals, stable_warmup_sec)
+            total = stable["requests"]
+            summary = {
+                "throughput_req_per_sec": stable["throughput_req_per_sec"],
+                "success_rate_pct": (total - stable["errors"]) / total * 100 if total else 0.0,
+            }
+            latency = stable["latency_ms"]
         metrics[label]["throughput"].append(float(summary["throughput_req_per_sec"]))
         metrics[label]["success_rate"].append(float(summary["success_rate_pct"]))
         metrics[label]["avg"].append(float(latency["avg"]))
@@ -171,6 +315,11 @@ for _, label, _ in targets:
 
 print()
 print(f"Reports generated: {len(report_paths)} (directory: {reports_dir})")
+if duration_sec is not None:
+    print(f"Throughput per {timeseries_interval_sec}s interval (last round; metrics below skip the first {stable_warmup_sec:g}s):")
+    for _, label, _ in targets:
+        print(f"{label:<8} {sparkline(throughput_curves.get(label, []))}")
+    print()
 print("Comparison (median across rounds):")
 print(f"{'API':<8} {'Throughput':>12} {'Success%':>10} {'Avg ms':>10} {'P95 ms':>10} {'P99 ms':>10}")
 for row in rows:
@@ -183,7 +332,23 @@ winner_p99 = min(rows, key=lambda x: x["p99"])["name"]
 print(f"Throughput winner: {winner_thr}")
 print(f"P95 latency winner: {winner_p95}")
 print(f"P99 latency winner: {winner_p99}")
+print_efficiency(efficiency)
+
+raise SystemExit(
+    comparison_stage(
+        [(key, label) for key, label, _ in targets],
+        {key: metrics[label] for key, label, _ in targets},
+        Path(reports_dir) / f"comparison-get-{ts}.json",
+        baseline_dir=baseline_dir.strip() or None,
+        stable_warmup_sec=stable_warmup_sec,
+        threshold_pct=float(regression_threshold_pct),
+        alpha=float(significance_alpha),
+        iterations=int(bootstrap_iterations),
+        confidence=float(confidence),
+    )
+)
 PY
+fi
 
 if [[ "${RUN_POST_BENCHMARK}" == "1" ]]; then
   echo
@@ -191,7 +356,10 @@ if [[ "${RUN_POST_BENCHMARK}" == "1" ]]; then
     "${POST_ROUNDS}" "${POST_REQUESTS}" "${POST_CONCURRENCY}" "${POST_TIMEOUT_SEC}" \
     "${POST_MIN_LINES}" "${POST_MAX_LINES}" "${POST_DB_HOST}" "${POST_DB_PORT}" \
   "${POST_DB_NAME}" "${POST_DB_USER}" "${POST_DB_PASSWORD}" \
-    "${POST_DOTNET_URL}" "${POST_PYTHON_URL}" "${POST_GO_URL}" "${POST_KOTLIN_URL}" "${POST_NODE_URL}" "${POST_JAVA_URL}" "${POST_RUST_URL}" <<'PY'
+    "${POST_DOTNET_URL}" "${POST_PYTHON_URL}" "${POST_GO_URL}" "${POST_KOTLIN_URL}" "${POST_NODE_URL}" "${POST_JAVA_URL}" "${POST_RUST_URL}" \
+    "${POST_DURATION_SEC}" "${TIMESERIES_INTERVAL_SEC}" "${STABLE_WARMUP_SEC}" \
+    "${BASELINE_DIR}" "${REGRESSION_THRESHOLD_PCT}" "${SIGNIFICANCE_ALPHA}" "${BOOTSTRAP_ITERATIONS}" "${CONFIDENCE}" \
+    "${SAMPLE_CONTAINERS}" "${CONTAINER_PREFIX}" "${RESET_DB}" "${RESET_METHOD}" <<'PY' || POST_GATE_STATUS=$?
 import json
 import random
 import statistics
@@ -222,7 +390,19 @@ from pathlib import Path
     node_url,
     java_url,
     rust_url,
-) = sys.argv[1:23]
+    duration_sec,
+    timeseries_interval_sec,
+    stable_warmup_sec,
+    baseline_dir,
+    regression_threshold_pct,
+    significance_alpha,
+    bootstrap_iterations,
+    confidence,
+    sample_containers,
+    container_prefix,
+    reset_db,
+    reset_method,
+) = sys.argv[1:35]
 
 rounds = int(rounds)
 requests = int(requests)
@@ -230,6 +410,12 @@ concurrency = int(concurrency)
 timeout_sec = float(timeout_sec)
 min_lines = int(min_lines)
 max_lines = int(max_lines)
+duration_sec = float(duration_sec) if duration_sec.strip() else None
+stable_warmup_sec = float(stable_warmup_sec)
+
+sys.path.insert(0, script_dir)
+from compare_stats import comparison_stage, print_efficiency, record_efficiency
+from timeseries import read_timeseries, summarize_stable_window
 
 targets = [
     ("dotnet-post", ".NET-Post", dotnet_url),
@@ -250,6 +436,26 @@ metrics = {
     label: {"throughput": [], "success_rate": [], "created_rate": [], "avg": [], "p95": [], "p99": []}
     for _, label, _ in targets
 }
+efficiency = {label: {"requests_per_cpu_sec": [], "cpu_cores_avg": [], "peak_rss_mb": []} for _, label, _ in targets}
+
+reset_cmd = [
+    python_bin,
+    str(Path(script_dir) / "dataset_reset.py"),
+    "restore",
+    "--method", reset_method,
+    "--db-host", db_host,
+    "--db-port", db_port,
+    "--db-name", db_name,
+    "--db-user", db_user,
+    "--db-password", db_password,
+    "--quiet",
+]
+
+
+def reset_dataset():
+    if reset_db == "1":
+        subprocess.run(reset_cmd, check=True)
+
 
 for round_idx in range(1, rounds + 1):
     order = list(targets)
@@ -277,11 +483,34 @@ for round_idx in range(1, rounds + 1):
             "--quiet",
             "--output-json", str(report_path),
         ]
+        if duration_sec is not None:
+            timeseries_path = report_path.with_suffix(".timeseries.ndjson")
+            cmd += [
+                "--duration-sec", str(duration_sec),
+                "--timeseries-file", str(timeseries_path),
+                "--interval-sec", timeseries_interval_sec,
+            ]
+        if sample_containers == "1":
+            cmd += ["--sample-container", f"{container_prefix}-{key.split('-')[0]}-api"]
+        if reset_db == "1":
+            # Every run starts from the restored snapshot, so per-id cleanup afterwards is redundant.
+            cmd.append("--skip-cleanup")
+            reset_dataset()
         subprocess.run(cmd, check=True)
         with report_path.open("r", encoding="utf-8") as f:
             data = json.load(f)
+        record_efficiency(efficiency[label], data)
         summary = data["summary"]
         latency = data["latency_ms"]
+        if duration_sec is not None:
+            stable = summarize_stable_window(read_timeseries(str(timeseries_path)), stable_warmup_sec)
+            total = stable["requests"]
+            summary = dict(
+                summary,
+                throughput_req_per_sec=stable["throughput_req_per_sec"],
+                success_rate_pct=(total - stable["errors"]) / total * 100 if total else 0.0,
+            )
+            latency = stable["latency_ms"]
         metrics[label]["throughput"].append(float(summary["throughput_req_per_sec"]))
         metrics[label]["success_rate"].append(float(summary["success_rate_pct"]))
         metrics[label]["created_rate"].append(float(summary["created_rate_pct"]))
@@ -309,5 +538,25 @@ for row in rows:
         f"{row['name']:<10} {row['throughput']:>12} {row['success_rate']:>10} "
         f"{row['created_rate']:>10} {row['avg']:>10} {row['p95']:>10} {row['p99']:>10}"
     )
+print_efficiency(efficiency)
+
+raise SystemExit(
+    comparison_stage(
+        [(key, label) for key, label, _ in targets],
+        {key: metrics[label] for key, label, _ in targets},
+        Path(reports_dir) / f"comparison-post-{ts}.json",
+        baseline_dir=baseline_dir.strip() or None,
+        stable_warmup_sec=stable_warmup_sec,
+        threshold_pct=float(regression_threshold_pct),
+        alpha=float(significance_alpha),
+        iterations=int(bootstrap_iterations),
+        confidence=float(confidence),
+    )
+)
 PY
 fi
+
+if [[ "${GATE_STATUS}" != "0" ]]; then
+  exit "${GATE_STATUS}"
+fi
+exit "${POST_GATE_STATUS}"
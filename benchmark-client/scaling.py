@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmark import LoadJob, build_report, run_load, summary_view
+from dataset_reset import (
+    build_conninfo,
+    create_table_snapshot,
+    create_template_snapshot,
+    drop_table_snapshot,
+    drop_template_snapshot,
+    maintenance_conninfo,
+    restore_table_snapshot,
+    restore_template_snapshot,
+)
+from sweep import parse_target
+
+
+# Kept apart from dataset_reset.py's own snapshot, which may hold an older dataset (e.g. from a RESET_DB=1 run).
+SCALING_SNAPSHOT_PREFIX = "bench_scaling_snapshot_"
+
+# Metric name -> how to read it from a benchmark report.
+MATRIX_METRICS = {
+    "throughput": lambda report: report["summary"]["throughput_req_per_sec"],
+    "p50": lambda report: report["latency_ms"]["median"],
+    "p99": lambda report: report["latency_ms"]["p99"],
+    "response_bytes": lambda report: report["response_size_bytes_success_only"]["avg"],
+}
+
+
+def fit_linear(xs: list[float], ys: list[float]) -> Optional[dict[str, float]]:
+    if len(xs) < 2 or len(set(xs)) < 2:
+        return None
+    mean_x, mean_y = statistics.mean(xs), statistics.mean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    ss_res = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys))
+    return {"intercept": intercept, "slope": slope, "r2": 1 - ss_res / ss_tot if ss_tot > 0 else 1.0}
+
+
+def fit_power_law(sizes: list[float], values: list[float]) -> Optional[dict[str, float]]:
+    # value ~ coefficient * size^exponent, fitted as a straight line in log-log space.
+    points = [(math.log(size), math.log(value)) for size, value in zip(sizes, values) if size > 0 and value > 0]
+    fit = fit_linear([x for x, _ in points], [y for _, y in points])
+    if fit is None:
+        return None
+    return {"coefficient": math.exp(fit["intercept"]), "exponent": fit["slope"], "r2": fit["r2"]}
+
+
+def growth_class(exponent: float) -> str:
+    magnitude = abs(exponent)
+    if magnitude < 0.2:
+        return "flat"
+    if magnitude < 0.8:
+        return "sublinear"
+    if magnitude <= 1.2:
+        return "linear"
+    return "superlinear"
+
+
+def fit_growth(sizes: list[int], values: list[float]) -> dict[str, Any]:
+    power = fit_power_law(sizes, values)
+    linear = fit_linear([float(size) for size in sizes], values)
+    return {
+        "power_law": (
+            {
+                "coefficient": round(power["coefficient"], 6),
+                "exponent": round(power["exponent"], 3),
+                "r2": round(power["r2"], 4),
+                "growth": growth_class(power["exponent"]),
+            }
+            if power
+            else None
+        ),
+        # Fixed cost plus cost per bill, e.g. ms + ms/bill for latency.
+        "linear": (
+            {"intercept": round(linear["intercept"], 4), "per_bill": linear["slope"], "r2": round(linear["r2"], 4)}
+            if linear
+            else None
+        ),
+    }
+
+
+def seed_dataset(args: argparse.Namespace, bills: int) -> None:
+    cmd = [
+        sys.executable,
+        str(Path(__file__).with_name("bulk_seed.py")),
+        "--bills", str(bills),
+        "--seed", str(args.seed),
+        "--workers", str(args.seed_workers),
+        "--line-distribution", args.line_distribution,
+        "--db-host", args.db_host,
+        "--db-port", str(args.db_port),
+        "--db-name", args.db_name,
+        "--db-user", args.db_user,
+        "--db-password", args.db_password,
+    ]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+
+class DatasetSnapshot:
+    # The dataset as it was before the matrix, taken by this run and dropped once restored.
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._template = args.snapshot_method == "template"
+        self._db_name = args.db_name
+        self._snapshot_db = f"{args.db_name}_scaling_snapshot"
+        self._conninfo = build_conninfo(args.db_host, args.db_port, args.db_name, args.db_user, args.db_password)
+        self._maintenance = maintenance_conninfo(args.db_host, args.db_port, args.db_user, args.db_password)
+
+    def take(self) -> None:
+        if self._template:
+            create_template_snapshot(self._maintenance, self._db_name, self._snapshot_db)
+        else:
+            create_table_snapshot(self._conninfo, SCALING_SNAPSHOT_PREFIX)
+
+    def restore_and_drop(self) -> None:
+        if self._template:
+            restore_template_snapshot(self._maintenance, self._db_name, self._snapshot_db)
+            drop_template_snapshot(self._maintenance, self._snapshot_db)
+        else:
+            restore_table_snapshot(self._conninfo, SCALING_SNAPSHOT_PREFIX)
+            drop_table_snapshot(self._conninfo, SCALING_SNAPSHOT_PREFIX)
+
+
+def run_cell(args: argparse.Namespace, url: str) -> list[dict[str, Any]]:
+    job = LoadJob(
+        url=url,
+        method="GET",
+        timeout_sec=args.timeout_sec,
+        headers={},
+        payload=None,
+        requests=1,
+        concurrency=args.concurrency,
+        warmup_requests=args.warmup_requests,
+        engine=args.engine,
+        duration_sec=args.duration_sec,
+    )
+    reports = []
+    for _ in range(args.rounds):
+        recorder, wall_time_sec = run_load(job)
+        reports.append(summary_view(build_report(recorder, wall_time_sec)))
+    return reports
+
+
+def parse_sizes(value: str) -> list[int]:
+    try:
+        sizes = sorted({int(float(item)) for item in value.split(",") if item.strip()})
+    except ValueError:
+        raise SystemExit(f"--sizes must be a comma-separated list of bill counts, got '{value}'")
+    if len(sizes) < 2 or sizes[0] <= 0:
+        raise SystemExit("--sizes needs at least two bill counts greater than 0")
+    return sizes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark GET targets across dataset sizes and fit how their cost grows with the data"
+    )
+    parser.add_argument("--target", action="append", default=[], help="Target as NAME=URL (repeatable)")
+    parser.add_argument("--sizes", default="100,10000,100000,1000000", help="Comma-separated bill counts (1e4 works)")
+    parser.add_argument("--rounds", type=int, default=3, help="Measurements per target and size")
+    parser.add_argument("--duration-sec", type=float, default=10.0, help="Length of every measurement")
+    parser.add_argument("--concurrency", type=int, default=25, help="Number of concurrent workers")
+    parser.add_argument("--warmup-requests", type=int, default=5, help="Warm-up requests before every measurement")
+    parser.add_argument("--timeout-sec", type=float, default=60.0, help="Request timeout; large sizes return big bodies")
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "asyncio"],
+        default="thread",
+        help="Load engine: thread pool with requests, or asyncio with aiohttp keep-alive pools",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="bulk_seed.py random seed")
+    parser.add_argument("--seed-workers", type=int, default=os.cpu_count() or 4, help="bulk_seed.py worker processes")
+    parser.add_argument(
+        "--line-distribution",
+        choices=["uniform", "lognormal"],
+        default="uniform",
+        help="bulk_seed.py line-count distribution",
+    )
+    parser.add_argument(
+        "--keep-dataset",
+        action="store_true",
+        help="Leave the largest dataset in place instead of restoring the snapshot taken before the matrix",
+    )
+    parser.add_argument(
+        "--snapshot-method",
+        choices=["table", "template"],
+        default="table",
+        help="How to keep the pre-matrix dataset: unlogged table copies, or a template database (see dataset_reset.py)",
+    )
+    parser.add_argument("--output-json", help="Optional path to write full report JSON")
+
+    parser.add_argument("--db-host", default=os.getenv("POSTGRES_HOST", "localhost"), help="Postgres host")
+    parser.add_argument("--db-port", type=int, default=int(os.getenv("POSTGRES_PORT", "5440")), help="Postgres port")
+    parser.add_argument("--db-name", default=os.getenv("POSTGRES_DB", "api_lang_arena"), help="Postgres database")
+    parser.add_argument("--db-user", default=os.getenv("POSTGRES_USER", "api_lang_user"), help="Postgres user")
+    parser.add_argument("--db-password", default=os.getenv("POSTGRES_PASSWORD", "api_lang_password"), help="Postgres password")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    targets = [parse_target(value) for value in args.target]
+    if not targets:
+        raise SystemExit("At least one --target is required")
+    sizes = parse_sizes(args.sizes)
+    if args.rounds <= 0:
+        raise SystemExit("--rounds must be greater than 0")
+    if args.duration_sec <= 0:
+        raise SystemExit("--duration-sec must be greater than 0")
+    if args.concurrency <= 0:
+        raise SystemExit("--concurrency must be greater than 0")
+
+    snapshot = None
+    if not args.keep_dataset:
+        print("Taking a snapshot of the current dataset to restore after the matrix ...")
+        snapshot = DatasetSnapshot(args)
+        snapshot.take()
+
+    cells: dict[str, dict[int, dict[str, Any]]] = {name: {} for name, _ in targets}
+    try:
+        for size in sizes:
+            print(f"Seeding {size} bills ...", flush=True)
+            seed_dataset(args, size)
+            for name, url in targets:
+                reports = run_cell(args, url)
+                cell = {metric: statistics.median(read(report) for report in reports) for metric, read in MATRIX_METRICS.items()}
+                cell["success_rate_pct"] = statistics.median(report["summary"]["success_rate_pct"] for report in reports)
+                cell["reports"] = reports
+                cells[name][size] = cell
+                print(
+                    f"[{name}] bills={size:<9} thr={cell['throughput']:>10.2f} req/s p50={cell['p50']:>9.2f}ms "
+                    f"p99={cell['p99']:>9.2f}ms bytes={cell['response_bytes']:>12.0f}",
+                    flush=True,
+                )
+    finally:
+        if snapshot is not None:
+            print("Restoring the pre-matrix dataset ...")
+            snapshot.restore_and_drop()
+
+    results = {}
+    for name, url in targets:
+        measured = sorted(cells[name])
+        results[name] = {
+            "url": url,
+            "sizes": {str(size): cells[name][size] for size in measured},
+            "fits": {
+                metric: fit_growth(measured, [cells[name][size][metric] for size in measured]) for metric in MATRIX_METRICS
+            },
+        }
+
+    print()
+    print("Growth with dataset size (power-law exponent b in value ~ a * bills^b, R² in brackets):")
+    print(f"{'API':<10} " + " ".join(f"{metric:>24}" for metric in MATRIX_METRICS) + f" {'p50 ms per 1k bills':>20}")
+    for name, result in results.items():
+        cells_out = []
+        for metric in MATRIX_METRICS:
+            power = result["fits"][metric]["power_law"]
+            cells_out.append(
+                f"{power['exponent']:+.2f} [{power['r2']:.2f}] {power['growth']}".rjust(24) if power else " " * 24
+            )
+        linear = result["fits"]["p50"]["linear"]
+        per_thousand = f"{linear['per_bill'] * 1000:>20.3f}" if linear else " " * 20
+        print(f"{name:<10} " + " ".join(cells_out) + f" {per_thousand}")
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "sizes": sizes,
+                    "rounds": args.rounds,
+                    "duration_sec": args.duration_sec,
+                    "concurrency": args.concurrency,
+                    "line_distribution": args.line_distribution,
+                    "targets": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nReport written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import threading
+
+from benchmark import build_report, run_asyncio_load, run_single_request, run_thread_load, summary_view
+
+
+RESPONSE_BODY = b'{"status":"ok"}'
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: " + str(len(RESPONSE_BODY)).encode("ascii") + b"\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n" + RESPONSE_BODY
+)
+
+
+class DummyHttpProtocol(asyncio.Protocol):
+    def __init__(self) -> None:
+        self._transport: asyncio.Transport | None = None
+        self._buffer = b""
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        self._buffer += data
+        while True:
+            head_end = self._buffer.find(b"\r\n\r\n")
+            if head_end < 0:
+                return
+            head = self._buffer[:head_end].decode("latin-1")
+            content_length = 0
+            for line in head.split("\r\n")[1:]:
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    content_length = int(value.strip())
+            request_end = head_end + 4 + content_length
+            if len(self._buffer) < request_end:
+                return
+            self._buffer = self._buffer[request_end:]
+            self._transport.write(RESPONSE)
+
+
+class DummyServer:
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dummy-http-server", daemon=True)
+        self.port = 0
+
+    def __enter__(self) -> "DummyServer":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            self._loop.create_server(DummyHttpProtocol, host="127.0.0.1", port=0, backlog=1024)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            self._loop.run_until_complete(server.wait_closed())
+            self._loop.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure the latency and throughput the benchmark client adds on its own, "
+        "against a local keep-alive server that answers immediately",
+    )
+    parser.add_argument("--requests", type=int, default=5000, help="Total number of requests per engine")
+    parser.add_argument("--concurrency", type=int, default=50, help="Number of concurrent workers")
+    parser.add_argument("--warmup-requests", type=int, default=100, help="Warm-up requests per engine")
+    parser.add_argument("--timeout-sec", type=float, default=10.0, help="Request timeout in seconds")
+    parser.add_argument(
+        "--engine",
+        action="append",
+        choices=["thread", "asyncio"],
+        help="Engine to test (repeatable, defaults to both)",
+    )
+    parser.add_argument("--output-json", help="Optional path to write full report JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.requests <= 0:
+        raise SystemExit("--requests must be greater than 0")
+    if args.concurrency <= 0:
+        raise SystemExit("--concurrency must be greater than 0")
+
+    engines = args.engine or ["thread", "asyncio"]
+    reports = {}
+    with DummyServer() as server:
+        url = f"http://127.0.0.1:{server.port}/health"
+        for engine in engines:
+            if engine == "asyncio":
+                recorder, wall_time_sec = run_asyncio_load(
+                    url, "GET", args.timeout_sec, {}, None, args.requests, args.concurrency, args.warmup_requests
+                )
+            else:
+                for _ in range(args.warmup_requests):
+                    run_single_request(url, "GET", args.timeout_sec, {}, None)
+                recorder, wall_time_sec = run_thread_load(
+                    url, "GET", args.timeout_sec, {}, None, args.requests, args.concurrency
+                )
+            reports[engine] = summary_view(build_report(recorder, wall_time_sec))
+
+    report = {
+        "meta": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup_requests": args.warmup_requests,
+        },
+        "engines": reports,
+    }
+    print(json.dumps(report, indent=2))
+
+    print("\nClient overhead against a zero-work server (all latency is client + loopback):")
+    print(f"{'Engine':<10} {'Req/s':>10} {'Median ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'Failures':>9}")
+    for engine, engine_report in reports.items():
+        summary = engine_report["summary"]
+        latency = engine_report["latency_ms"]
+        print(
+            f"{engine:<10} {summary['throughput_req_per_sec']:>10.2f} {latency['median']:>10.2f} "
+            f"{latency['p95']:>10.2f} {latency['p99']:>10.2f} {summary['failure_count']:>9}"
+        )
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+import argparse
+import json
+from dataclasses import replace
+from typing import Any, Optional
+
+from benchmark import LoadJob, build_report, parse_headers, run_load, summary_view
+
+
+DEFAULT_CONCURRENCY_STEPS = "1,2,4,8,16,32,64,128,256"
+
+
+def parse_steps(value: str, mode: str) -> list[float]:
+    try:
+        steps = sorted({float(item) for item in value.split(",") if item.strip()})
+    except ValueError:
+        raise SystemExit(f"--steps must be a comma-separated list of numbers, got '{value}'")
+    if not steps or steps[0] <= 0:
+        raise SystemExit("--steps must contain values greater than 0")
+    if mode == "concurrency" and any(step != int(step) for step in steps):
+        raise SystemExit("Concurrency steps must be whole numbers")
+    return steps
+
+
+def parse_target(value: str) -> tuple[str, str]:
+    name, sep, url = value.partition("=")
+    if not sep or not name.strip() or not url.strip():
+        raise SystemExit(f"--target must look like NAME=URL, got '{value}'")
+    return name.strip(), url.strip()
+
+
+def run_step(base: LoadJob, mode: str, level: float, max_in_flight: int) -> dict[str, Any]:
+    if mode == "rate":
+        job = replace(base, rate=level, concurrency=max_in_flight)
+    else:
+        job = replace(base, concurrency=int(level))
+    recorder, wall_time_sec = run_load(job)
+    report = build_report(recorder, wall_time_sec, target_rate=job.rate)
+    # Open-loop steps are judged on latency from the intended send time, so a backlog cannot hide behind the limiter.
+    latency = report["corrected_latency_ms"] if mode == "rate" else report["latency_ms"]
+    return {
+        "level": int(level) if mode == "concurrency" else level,
+        "throughput_req_per_sec": report["summary"]["throughput_req_per_sec"],
+        "goodput_req_per_sec": round(recorder.success_count / wall_time_sec, 2) if wall_time_sec > 0 else 0.0,
+        "success_rate_pct": report["summary"]["success_rate_pct"],
+        "latency_ms": latency,
+        "report": summary_view(report),
+    }
+
+
+def meets_slo(step: dict[str, Any], slo_p99_ms: float, min_success_pct: float) -> bool:
+    return step["latency_ms"]["p99"] <= slo_p99_ms and step["success_rate_pct"] >= min_success_pct
+
+
+def find_knee(steps: list[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    passing = [step for step in steps if step["meets_slo"]]
+    return max(passing, key=lambda step: step["goodput_req_per_sec"]) if passing else None
+
+
+def sweep_target(
+    base: LoadJob,
+    mode: str,
+    levels: list[float],
+    slo_p99_ms: float,
+    min_success_pct: float,
+    max_in_flight: int,
+    stop_after_breaches: int,
+    refine_steps: int,
+    log_prefix: str,
+) -> dict[str, Any]:
+    steps: list[dict[str, Any]] = []
+
+    def measure(level: float) -> dict[str, Any]:
+        step = run_step(base, mode, level, max_in_flight)
+        step["meets_slo"] = meets_slo(step, slo_p99_ms, min_success_pct)
+        steps.append(step)
+        print(
+            f"{log_prefix} {mode}={step['level']:<8g} goodput={step['goodput_req_per_sec']:>10.2f} req/s "
+            f"p50={step['latency_ms']['median']:>8.2f}ms p99={step['latency_ms']['p99']:>8.2f}ms "
+            f"success={step['success_rate_pct']:>6.2f}% {'ok' if step['meets_slo'] else 'SLO breach'}",
+            flush=True,
+        )
+        return step
+
+    breaches = 0
+    for level in levels:
+        step = measure(level)
+        breaches = 0 if step["meets_slo"] else breaches + 1
+        if breaches >= stop_after_breaches:
+            break
+
+    # Bisect between the best passing level and the next level above it, which either breached or scaled no further.
+    for _ in range(refine_steps):
+        knee = find_knee(steps)
+        if knee is None:
+            break
+        above = [step["level"] for step in steps if step["level"] > knee["level"]]
+        if not above:
+            break
+        middle = (knee["level"] + min(above)) / 2
+        if mode == "concurrency":
+            middle = int(middle)
+        if middle in {step["level"] for step in steps}:
+            break
+        measure(middle)
+
+    steps.sort(key=lambda step: step["level"])
+    knee = find_knee(steps)
+    peak = max(steps, key=lambda step: step["goodput_req_per_sec"])
+    return {
+        "steps": steps,
+        "knee": (
+            {
+                "level": knee["level"],
+                "goodput_req_per_sec": knee["goodput_req_per_sec"],
+                "p99_ms": knee["latency_ms"]["p99"],
+                # False when the highest level measured still met the SLO, i.e. the real knee lies further up.
+                "saturated": knee["level"] < steps[-1]["level"],
+            }
+            if knee is not None
+            else None
+        ),
+        "peak": {
+            "level": peak["level"],
+            "goodput_req_per_sec": peak["goodput_req_per_sec"],
+            "p99_ms": peak["latency_ms"]["p99"],
+        },
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Ramp load step by step and find the highest throughput each API sustains within a p99 SLO"
+    )
+    parser.add_argument("--target", action="append", default=[], help="Target as NAME=URL (repeatable)")
+    parser.add_argument("--url", help="Single endpoint URL to sweep (shortcut for --target <url>=<url>)")
+    parser.add_argument("--method", default="GET", help="HTTP method (GET, POST, ...)")
+    parser.add_argument("--header", action="append", default=[], help="Header as 'Name: Value'")
+    parser.add_argument("--payload-file", help="JSON payload file path for request body")
+    parser.add_argument(
+        "--mode",
+        choices=["concurrency", "rate"],
+        default="concurrency",
+        help="Ramp closed-loop concurrency, or open-loop arrival rate in requests per second",
+    )
+    parser.add_argument(
+        "--steps",
+        help=f"Comma-separated load levels (concurrency default: {DEFAULT_CONCURRENCY_STEPS}; required for --mode rate)",
+    )
+    parser.add_argument("--step-duration-sec", type=float, default=10.0, help="Measured duration of every step")
+    parser.add_argument("--warmup-requests", type=int, default=20, help="Warm-up requests before every step")
+    parser.add_argument("--timeout-sec", type=float, default=10.0, help="Request timeout in seconds")
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "asyncio"],
+        default="asyncio",
+        help="Load engine; asyncio keeps high concurrency levels cheap on the client",
+    )
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Cap on in-flight requests in rate mode")
+    parser.add_argument("--slo-p99-ms", type=float, default=100.0, help="p99 latency objective in milliseconds")
+    parser.add_argument("--min-success-pct", type=float, default=99.0, help="Lowest success rate a step may have")
+    parser.add_argument(
+        "--stop-after-breaches",
+        type=int,
+        default=2,
+        help="Stop ramping a target after this many consecutive steps outside the SLO",
+    )
+    parser.add_argument(
+        "--refine-steps",
+        type=int,
+        default=2,
+        help="Extra steps bisecting between the knee and the next level up",
+    )
+    parser.add_argument("--output-json", help="Optional path to write full report JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    targets = [parse_target(value) for value in args.target]
+    if args.url:
+        targets.append((args.url, args.url))
+    if not targets:
+        raise SystemExit("At least one --target or --url is required")
+    if args.mode == "rate" and not args.steps:
+        raise SystemExit("--steps is required for --mode rate")
+    if args.step_duration_sec <= 0:
+        raise SystemExit("--step-duration-sec must be greater than 0")
+    if args.warmup_requests < 0:
+        raise SystemExit("--warmup-requests must be 0 or greater")
+    if args.max_in_flight <= 0:
+        raise SystemExit("--max-in-flight must be greater than 0")
+    if args.slo_p99_ms <= 0:
+        raise SystemExit("--slo-p99-ms must be greater than 0")
+    if args.stop_after_breaches <= 0:
+        raise SystemExit("--stop-after-breaches must be greater than 0")
+    if args.refine_steps < 0:
+        raise SystemExit("--refine-steps must be 0 or greater")
+    levels = parse_steps(args.steps or DEFAULT_CONCURRENCY_STEPS, args.mode)
+
+    payload = None
+    if args.payload_file:
+        with open(args.payload_file, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+
+    results = {}
+    for name, url in targets:
+        base = LoadJob(
+            url=url,
+            method=args.method.upper(),
+            timeout_sec=args.timeout_sec,
+            headers=parse_headers(args.header),
+            payload=payload,
+            requests=1,
+            concurrency=1,
+            warmup_requests=args.warmup_requests,
+            engine=args.engine,
+            duration_sec=args.step_duration_sec,
+        )
+        results[name] = sweep_target(
+            base,
+            args.mode,
+            levels,
+            args.slo_p99_ms,
+            args.min_success_pct,
+            args.max_in_flight,
+            args.stop_after_breaches,
+            args.refine_steps,
+            f"[{name}]",
+        )
+        results[name]["url"] = url
+
+    unit = "conc" if args.mode == "concurrency" else "rate"
+    print()
+    print(f"Saturation knee (highest goodput with p99 <= {args.slo_p99_ms:g}ms and success >= {args.min_success_pct:g}%):")
+    print(f"{'API':<10} {'Knee ' + unit:>10} {'Goodput':>12} {'P99 ms':>10} {'Peak ' + unit:>10} {'Peak goodput':>13}")
+    ranked = sorted(
+        results.items(),
+        key=lambda item: item[1]["knee"]["goodput_req_per_sec"] if item[1]["knee"] else -1.0,
+        reverse=True,
+    )
+    for name, result in ranked:
+        knee, peak = result["knee"], result["peak"]
+        knee_cells = (
+            f"{knee['level']:>9g}{'' if knee['saturated'] else '+'} {knee['goodput_req_per_sec']:>12.2f} "
+            f"{knee['p99_ms']:>10.2f}"
+            if knee
+            else f"{'-':>10} {'SLO missed':>12} {'-':>10}"
+        )
+        print(f"{name:<10} {knee_cells} {peak['level']:>10g} {peak['goodput_req_per_sec']:>13.2f}")
+    if any(result["knee"] and not result["knee"]["saturated"] for result in results.values()):
+        print("('+' the highest step still met the SLO; add higher --steps to find the knee)")
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "mode": args.mode,
+                    "slo_p99_ms": args.slo_p99_ms,
+                    "min_success_pct": args.min_success_pct,
+                    "step_duration_sec": args.step_duration_sec,
+                    "engine": args.engine,
+                    "targets": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nReport written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
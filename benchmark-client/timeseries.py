@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from typing import Any, Optional
+
+from histogram import LatencyHistogram
+
+
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+
+class TimeSeriesWriter:
+    def __init__(self, path: str, interval_sec: float = 1.0, significant_digits: int = 2) -> None:
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be greater than 0")
+        self._path = path
+        self._interval_sec = interval_sec
+        self._significant_digits = significant_digits
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._interval = 0
+        self._started_at = 0.0
+        self._interval_started_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._latency = LatencyHistogram(self._significant_digits)
+        self._errors = 0
+        self._status_codes: dict[str, int] = {}
+
+    def start(self) -> None:
+        self._file = open(self._path, "w", encoding="utf-8")
+        self._started_at = self._interval_started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="timeseries-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, result: Any) -> None:
+        status = str(result.status_code) if result.status_code is not None else "exception"
+        with self._lock:
+            self._latency.record(result.latency_ms)
+            self._status_codes[status] = self._status_codes.get(status, 0) + 1
+            if not result.ok:
+                self._errors += 1
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._flush(partial=True)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "TimeSeriesWriter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._interval_started_at + self._interval_sec - time.perf_counter()):
+            self._flush(partial=False)
+
+    def _flush(self, partial: bool) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            latency, errors, status_codes = self._latency, self._errors, self._status_codes
+            self._reset()
+        interval_sec = now - self._interval_started_at
+        self._interval_started_at = now
+        self._interval += 1
+        if partial and latency.count == 0:
+            return
+
+        line = {
+            "interval": self._interval,
+            "elapsed_sec": round(now - self._started_at, 3),
+            "interval_sec": round(interval_sec, 3),
+            "partial": partial,
+            "requests": latency.count,
+            "errors": errors,
+            "throughput_req_per_sec": round(latency.count / interval_sec, 2) if interval_sec > 0 else 0.0,
+            "latency_ms": {
+                "median": round(latency.percentile(50), 2),
+                "p90": round(latency.percentile(90), 2),
+                "p99": round(latency.percentile(99), 2),
+                "max": round(latency.max_ms, 2),
+            },
+            "status_code_distribution": status_codes,
+            "latency_histogram": latency.to_dict(),
+        }
+        self._file.write(json.dumps(line) + "\n")
+        self._file.flush()
+
+
+def read_timeseries(path: str) -> list[dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_stable_window(intervals: list[dict[str, Any]], warmup_sec: float) -> dict[str, Any]:
+    stable = [
+        item
+        for item in intervals
+        if item["elapsed_sec"] - item["interval_sec"] >= warmup_sec and not item["partial"]
+    ]
+    if not stable:
+        return {
+            "intervals": 0,
+            "window_start_sec": 0.0,
+            "window_end_sec": 0.0,
+            "requests": 0,
+            "errors": 0,
+            "throughput_req_per_sec": 0.0,
+            "throughput_cv_pct": 0.0,
+            "latency_ms": {"avg": 0.0, "median": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0},
+        }
+
+    latency = LatencyHistogram.from_dict(stable[0]["latency_histogram"])
+    for item in stable[1:]:
+        latency.merge(LatencyHistogram.from_dict(item["latency_histogram"]))
+    requests = sum(item["requests"] for item in stable)
+    window_sec = sum(item["interval_sec"] for item in stable)
+    throughputs = [item["throughput_req_per_sec"] for item in stable]
+    mean_throughput = sum(throughputs) / len(throughputs)
+    variance = sum((value - mean_throughput) ** 2 for value in throughputs) / len(throughputs)
+    return {
+        "intervals": len(stable),
+        "window_start_sec": round(stable[0]["elapsed_sec"] - stable[0]["interval_sec"], 3),
+        "window_end_sec": stable[-1]["elapsed_sec"],
+        "requests": requests,
+        "errors": sum(item["errors"] for item in stable),
+        "throughput_req_per_sec": round(requests / window_sec, 2) if window_sec > 0 else 0.0,
+        "throughput_cv_pct": round((variance**0.5) / mean_throughput * 100, 2) if mean_throughput > 0 else 0.0,
+        "latency_ms": {
+            "avg": round(latency.mean(), 2),
+            "median": round(latency.percentile(50), 2),
+            "p95": round(latency.percentile(95), 2),
+            "p99": round(latency.percentile(99), 2),
+            "max": round(latency.max_ms, 2),
+        },
+    }
+
+
+def sparkline(values: list[float]) -> str:
+    if not values:
+        return ""
+    top = max(values)
+    if top <= 0:
+        return SPARK_CHARS[0] * len(values)
+    scale = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(value / top * scale)] for value in values)
@@ -0,0 +1,25 @@
+-- Optional change-feed wake-ups: every statement that inserts into bill sends NOTIFY bill_created once it commits, so
+-- the Python API's GET /bills/changes waiters re-query right away instead of polling (PY_CHANGE_FEED_LISTEN=1).
+-- The payload is empty: listeners only learn that something changed and read the new bills with their own cursor.
+--
+-- NOTIFY takes a database-wide lock at commit, so inserting transactions commit one at a time while the trigger is
+-- installed. Leave it out of write benchmarks that do not use the change feed.
+--
+-- Run with db/bill_change_notify.sh. Re-run it after db/partition_bills.sh, which recreates bill.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION notify_bill_created() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM pg_notify('bill_created', '');
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS bill_created_notify ON bill;
+CREATE TRIGGER bill_created_notify
+  AFTER INSERT ON bill
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION notify_bill_created();
+
+COMMIT;
@@ -0,0 +1,251 @@
+-- Optional partitioned layout: bill is range-partitioned by month of issued_at, and bill_line is co-partitioned on
+-- the same key. bill_line gets an issued_at column copied from its bill, and its foreign key covers
+-- (bill_id, issued_at), so every line sits in the partition of the same month as its bill.
+--
+-- Converts the existing bill / bill_line tables and their data in one transaction, keeping ids and sequences.
+-- Re-running it on a partitioned database only adds the missing monthly partitions, up to months_ahead months from
+-- today, so it also works as a periodic maintenance job.
+--
+-- Run with db/partition_bills.sh. psql variables: months_ahead (default 12).
+--
+-- PostgreSQL unique constraints on a partitioned table must include the partition key, so the constraint on bill only
+-- keeps bill_number unique per issued_at. Global uniqueness comes from bill_number_key, a plain table with one row per
+-- bill_number kept in step with bill by triggers: a duplicate number fails with a unique violation, whichever API
+-- writes it. Truncate bill as a whole (as dataset_reset.py and bulk_seed.py do), not single partitions.
+--
+-- Writers that do not know about bill_line.issued_at (every API but Python's) may leave it out: its default is the
+-- issued_at of the last bill inserted in the same transaction, and the foreign key rejects a line whose bill differs.
+-- A BEFORE INSERT trigger on bill_line cannot fill it in instead, because the row is routed to a partition before
+-- such triggers run and PostgreSQL refuses to move it afterwards.
+
+\if :{?months_ahead}
+\else
+  \set months_ahead 12
+\endif
+
+BEGIN;
+
+SELECT set_config('bill_partitions.months_ahead', :'months_ahead', true);
+
+CREATE TABLE IF NOT EXISTS bill_number_key (
+  bill_number TEXT PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION sync_bill_number_key() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    DELETE FROM bill_number_key WHERE bill_number = OLD.bill_number;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO bill_number_key (bill_number) VALUES (NEW.bill_number);
+  END IF;
+  RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION truncate_bill_number_key() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+  TRUNCATE bill_number_key;
+  RETURN NULL;
+END $$;
+
+-- Remembers the issued_at of the transaction's latest bill for bill_line_issued_at_default().
+CREATE OR REPLACE FUNCTION remember_bill_issued_at() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM set_config('bill_partitions.last_issued_at', NEW.issued_at::TEXT, true);
+  RETURN NULL;
+END $$;
+
+-- The setting reads back as '' once the transaction that set it has ended.
+CREATE OR REPLACE FUNCTION bill_line_issued_at_default() RETURNS DATE
+LANGUAGE sql STABLE AS $$
+  SELECT NULLIF(current_setting('bill_partitions.last_issued_at', true), '')::DATE
+$$;
+
+-- Creates the monthly bill_YYYY_MM / bill_line_YYYY_MM partition pairs covering p_from .. p_to. Rows already sitting
+-- in the default partitions for such a month are moved into the new partitions.
+CREATE OR REPLACE FUNCTION create_bill_partitions(p_from DATE, p_to DATE) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+  v_month DATE := date_trunc('month', p_from)::DATE;
+  v_next DATE;
+  v_bill_part TEXT;
+  v_line_part TEXT;
+  v_created INTEGER := 0;
+BEGIN
+  WHILE v_month <= p_to LOOP
+    v_next := (v_month + INTERVAL '1 month')::DATE;
+    v_bill_part := 'bill_' || to_char(v_month, 'YYYY_MM');
+    v_line_part := 'bill_line_' || to_char(v_month, 'YYYY_MM');
+
+    IF to_regclass(v_bill_part) IS NULL THEN
+      IF EXISTS (SELECT 1 FROM bill_default WHERE issued_at >= v_month AND issued_at < v_next) THEN
+        -- A new partition cannot overlap rows in the default partition, so move them out first: lines before
+        -- bills, so that deleting the bills has no lines left to cascade to.
+        EXECUTE format('CREATE TABLE %I (LIKE bill INCLUDING DEFAULTS)', v_bill_part);
+        EXECUTE format('CREATE TABLE %I (LIKE bill_line INCLUDING DEFAULTS)', v_line_part);
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM bill_line_default WHERE issued_at >= %L AND issued_at < %L RETURNING *) '
+          'INSERT INTO %I SELECT * FROM moved',
+          v_month, v_next, v_line_part
+        );
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM bill_default WHERE issued_at >= %L AND issued_at < %L RETURNING *) '
+          'INSERT INTO %I SELECT * FROM moved',
+          v_month, v_next, v_bill_part
+        );
+        -- The delete dropped the moved bills' keys, and the new table has no triggers until it is attached.
+        EXECUTE format('INSERT INTO bill_number_key (bill_number) SELECT bill_number FROM %I', v_bill_part);
+        EXECUTE format('ALTER TABLE bill ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', v_bill_part, v_month, v_next);
+        EXECUTE format(
+          'ALTER TABLE bill_line ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', v_line_part, v_month, v_next
+        );
+      ELSE
+        EXECUTE format('CREATE TABLE %I PARTITION OF bill FOR VALUES FROM (%L) TO (%L)', v_bill_part, v_month, v_next);
+        EXECUTE format(
+          'CREATE TABLE %I PARTITION OF bill_line FOR VALUES FROM (%L) TO (%L)', v_line_part, v_month, v_next
+        );
+      END IF;
+      v_created := v_created + 1;
+    END IF;
+    v_month := v_next;
+  END LOOP;
+  RETURN v_created;
+END $$;
+
+DO $$
+DECLARE
+  v_bill_seq TEXT;
+  v_line_seq TEXT;
+  v_from DATE;
+  v_to DATE;
+  v_constraint RECORD;
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'bill'::regclass) = 'p' THEN
+    RAISE NOTICE 'bill is already partitioned; only adding missing partitions.';
+    RETURN;
+  END IF;
+
+  LOCK TABLE bill, bill_line IN ACCESS EXCLUSIVE MODE;
+  v_bill_seq := pg_get_serial_sequence('bill', 'id');
+  v_line_seq := pg_get_serial_sequence('bill_line', 'id');
+
+  ALTER TABLE bill_line RENAME TO bill_line_unpartitioned;
+  ALTER TABLE bill RENAME TO bill_unpartitioned;
+  -- Free the constraint (and index) names for the new tables.
+  FOR v_constraint IN
+    SELECT c.relname AS table_name, con.conname
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    WHERE con.conrelid IN ('bill_unpartitioned'::regclass, 'bill_line_unpartitioned'::regclass)
+      AND con.contype IN ('p', 'u', 'f')
+  LOOP
+    EXECUTE format(
+      'ALTER TABLE %I RENAME CONSTRAINT %I TO %I',
+      v_constraint.table_name, v_constraint.conname, left(v_constraint.conname, 50) || '_unpartitioned'
+    );
+  END LOOP;
+
+  EXECUTE format(
+    $sql$
+    CREATE TABLE bill (
+      id BIGINT NOT NULL DEFAULT nextval(%L::regclass),
+      bill_number TEXT NOT NULL,
+      issued_at DATE NOT NULL,
+      customer_name TEXT NOT NULL,
+      currency CHAR(3) NOT NULL DEFAULT 'USD',
+      subtotal NUMERIC(12,2) NOT NULL DEFAULT 0,
+      tax NUMERIC(12,2) NOT NULL DEFAULT 0,
+      created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+      PRIMARY KEY (id, issued_at),
+      UNIQUE (bill_number, issued_at)
+    ) PARTITION BY RANGE (issued_at)
+    $sql$,
+    v_bill_seq
+  );
+  EXECUTE format(
+    $sql$
+    CREATE TABLE bill_line (
+      id BIGINT NOT NULL DEFAULT nextval(%L::regclass),
+      bill_id BIGINT NOT NULL,
+      issued_at DATE NOT NULL,
+      line_no INTEGER NOT NULL,
+      concept TEXT NOT NULL,
+      quantity NUMERIC(10,2) NOT NULL,
+      unit_amount NUMERIC(12,2) NOT NULL,
+      line_amount NUMERIC(12,2) NOT NULL,
+      created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+      PRIMARY KEY (id, issued_at),
+      UNIQUE (bill_id, line_no, issued_at),
+      FOREIGN KEY (bill_id, issued_at) REFERENCES bill (id, issued_at) ON DELETE CASCADE
+    ) PARTITION BY RANGE (issued_at)
+    $sql$,
+    v_line_seq
+  );
+  -- Catch-all partitions, so that inserts outside the prepared months never fail.
+  CREATE TABLE bill_default PARTITION OF bill DEFAULT;
+  CREATE TABLE bill_line_default PARTITION OF bill_line DEFAULT;
+
+  SELECT COALESCE(MIN(issued_at), current_date), COALESCE(MAX(issued_at), current_date)
+  INTO v_from, v_to
+  FROM bill_unpartitioned;
+  PERFORM create_bill_partitions(v_from, v_to);
+
+  INSERT INTO bill (id, bill_number, issued_at, customer_name, currency, subtotal, tax, created_at)
+  SELECT id, bill_number, issued_at, customer_name, currency, subtotal, tax, created_at
+  FROM bill_unpartitioned;
+  INSERT INTO bill_line (id, bill_id, issued_at, line_no, concept, quantity, unit_amount, line_amount, created_at)
+  SELECT l.id, l.bill_id, b.issued_at, l.line_no, l.concept, l.quantity, l.unit_amount, l.line_amount, l.created_at
+  FROM bill_line_unpartitioned l
+  JOIN bill_unpartitioned b ON b.id = l.bill_id;
+
+  -- Keep the sequences (and their current values) when the old tables go.
+  EXECUTE format('ALTER SEQUENCE %s OWNED BY bill.id', v_bill_seq);
+  EXECUTE format('ALTER SEQUENCE %s OWNED BY bill_line.id', v_line_seq);
+  DROP TABLE bill_line_unpartitioned;
+  DROP TABLE bill_unpartitioned;
+END $$;
+
+ALTER TABLE bill_line ALTER COLUMN issued_at SET DEFAULT bill_line_issued_at_default();
+
+DROP TRIGGER IF EXISTS bill_remember_issued_at ON bill;
+CREATE TRIGGER bill_remember_issued_at
+  AFTER INSERT ON bill
+  FOR EACH ROW
+  EXECUTE FUNCTION remember_bill_issued_at();
+
+DROP TRIGGER IF EXISTS bill_number_key_sync ON bill;
+CREATE TRIGGER bill_number_key_sync
+  AFTER INSERT OR DELETE OR UPDATE OF bill_number ON bill
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_bill_number_key();
+
+DROP TRIGGER IF EXISTS bill_number_key_truncate ON bill;
+CREATE TRIGGER bill_number_key_truncate
+  AFTER TRUNCATE ON bill
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION truncate_bill_number_key();
+
+-- Fills the key table on the first run; a no-op afterwards, when the triggers already keep it in step.
+INSERT INTO bill_number_key (bill_number)
+SELECT bill_number FROM bill
+ON CONFLICT DO NOTHING;
+
+SELECT create_bill_partitions(
+  current_date,
+  (current_date + make_interval(months => current_setting('bill_partitions.months_ahead')::INT))::DATE
+) AS partitions_created;
+
+COMMIT;
+
+ANALYZE bill, bill_line;
+
+SELECT inhrelid::regclass AS partition,
+       pg_get_expr(c.relpartbound, c.oid) AS bounds,
+       c.reltuples::BIGINT AS estimated_rows
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'bill'::regclass
+ORDER BY 1;
@@ -30,6 +30,12 @@ DECLARE
   i INTEGER;
   j INTEGER;
   v_bill_id BIGINT;
+  v_issued_at DATE;
+  -- partition_bills.sql adds bill_line.issued_at, the co-partitioning key.
+  v_partitioned BOOLEAN := EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'bill_line' AND column_name = 'issued_at'
+  );
   v_line_count INTEGER;
   v_quantity NUMERIC(10,2);
   v_unit_amount NUMERIC(12,2);
@@ -56,7 +62,7 @@ BEGIN
       current_date - ((random() * 180)::INT),
       v_customers[1 + floor(random() * array_length(v_customers, 1))::INT]
     )
-    RETURNING id INTO v_bill_id;
+    RETURNING id, issued_at INTO v_bill_id, v_issued_at;
 
     v_line_count := 10 + floor(random() * 6)::INT;
 
@@ -65,15 +71,28 @@ BEGIN
       v_unit_amount := round((10 + random() * 490)::NUMERIC, 2);
       v_line_amount := round(v_quantity * v_unit_amount, 2);
 
-      INSERT INTO bill_line (bill_id, line_no, concept, quantity, unit_amount, line_amount)
-      VALUES (
-        v_bill_id,
-        j,
-        v_concepts[1 + floor(random() * array_length(v_concepts, 1))::INT],
-        v_quantity,
-        v_unit_amount,
-        v_line_amount
-      );
+      IF v_partitioned THEN
+        INSERT INTO bill_line (bill_id, issued_at, line_no, concept, quantity, unit_amount, line_amount)
+        VALUES (
+          v_bill_id,
+          v_issued_at,
+          j,
+          v_concepts[1 + floor(random() * array_length(v_concepts, 1))::INT],
+          v_quantity,
+          v_unit_amount,
+          v_line_amount
+        );
+      ELSE
+        INSERT INTO bill_line (bill_id, line_no, concept, quantity, unit_amount, line_amount)
+        VALUES (
+          v_bill_id,
+          j,
+          v_concepts[1 + floor(random() * array_length(v_concepts, 1))::INT],
+          v_quantity,
+          v_unit_amount,
+          v_line_amount
+        );
+      END IF;
     END LOOP;
 
     SELECT COALESCE(sum(line_amount), 0) INTO v_subtotal
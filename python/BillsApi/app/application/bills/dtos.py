@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 
 
 @dataclass(frozen=True)
@@ -9,3 +9,47 @@ class BillDto:
     issued_at: date
     total: float
     currency: str
+
+
+# Bills created after a cursor, cut short (pending) before any bill that a still-running transaction could precede.
+@dataclass(frozen=True)
+class CreatedBillsPage:
+    bills: list[BillDto]
+    pending: bool
+
+
+@dataclass(frozen=True)
+class BillLineDto:
+    line_no: int
+    concept: str
+    quantity: float
+    unit_amount: float
+    line_amount: float
+
+
+@dataclass(frozen=True)
+class BillDetailDto:
+    id: int
+    bill_number: str
+    issued_at: date
+    customer_name: str
+    currency: str
+    subtotal: float
+    tax: float
+    total: float
+    lines: list[BillLineDto]
+    # Changes whenever the stored bill is replaced, e.g. deleted and its id reused by a reloaded dataset.
+    version: int
+
+
+@dataclass(frozen=True)
+class BillProjectionDto:
+    bill_id: int
+    bill_number: str
+    issued_at: date
+    subtotal: float
+    tax: float
+    total: float
+    currency: str
+    source: str
+    occurred_at_utc: datetime
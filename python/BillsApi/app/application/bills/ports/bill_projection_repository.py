@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+from app.application.bills.dtos import BillProjectionDto
+
+
+class BillProjectionRepository(ABC):
+    @abstractmethod
+    def upsert_many(self, projections: list[BillProjectionDto]) -> int:
+        raise NotImplementedError
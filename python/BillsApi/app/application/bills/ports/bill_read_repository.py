@@ -1,9 +1,31 @@
 from abc import ABC, abstractmethod
+from datetime import date
+from typing import Optional
 
-from app.application.bills.dtos import BillDto
+from app.application.bills.dtos import BillDetailDto, BillDto, CreatedBillsPage
 
 
 class BillReadRepository(ABC):
     @abstractmethod
-    def list(self) -> list[BillDto]:
+    def find_by_ids(self, bill_ids: list[int]) -> list[BillDto]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_bill_numbers(self, bill_numbers: list[str]) -> list[BillDto]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_created_after(self, bill_id: int, limit: int) -> CreatedBillsPage:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(self, issued_from: Optional[date] = None, issued_to: Optional[date] = None) -> list[BillDto]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_detail(self, bill_id: int) -> Optional[BillDetailDto]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_version(self, bill_id: int) -> Optional[int]:
         raise NotImplementedError
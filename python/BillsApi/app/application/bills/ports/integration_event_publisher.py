@@ -6,3 +6,7 @@ class IntegrationEventPublisher(ABC):
     @abstractmethod
     def publish(self, event_name: str, payload: dict[str, Any]) -> None:
         raise NotImplementedError
+
+    def publish_batch(self, event_name: str, payloads: list[dict[str, Any]]) -> None:
+        for payload in payloads:
+            self.publish(event_name, payload)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from decimal import Decimal
+from typing import Callable, Sequence
 
 from sqlalchemy.exc import IntegrityError
 
@@ -43,9 +44,11 @@ class CreateBillUseCase:
         self,
         bill_write_repository: BillWriteRepository,
         integration_event_publisher: IntegrationEventPublisher,
+        on_created: Sequence[Callable[["CreateBillResult"], None]] = (),
     ) -> None:
         self._bill_write_repository = bill_write_repository
         self._integration_event_publisher = integration_event_publisher
+        self._on_created = on_created
 
     def execute(self, command: CreateBillCommand) -> CreateBillResult:
         if self._bill_write_repository.exists_by_bill_number(command.bill_number.strip()):
@@ -69,6 +72,20 @@ class CreateBillUseCase:
         except IntegrityError as exc:
             raise ConflictError(f"Bill number '{command.bill_number}' already exists.") from exc
 
+        result = CreateBillResult(
+            id=created_bill_id,
+            bill_number=new_bill.bill_number,
+            issued_at=new_bill.issued_at,
+            subtotal=float(new_bill.subtotal),
+            tax=float(new_bill.tax),
+            total=float(new_bill.total),
+            currency=new_bill.currency,
+        )
+        # Runs right after the commit, so hooks (e.g. change-feed wake-ups) only ever see committed bills, and before
+        # publishing, so they still run when the publish fails and the request ends in 503.
+        for hook in self._on_created:
+            hook(result)
+
         event_payload = {
             "billId": created_bill_id,
             "billNumber": new_bill.bill_number,
@@ -82,12 +99,4 @@ class CreateBillUseCase:
         }
         self._integration_event_publisher.publish("bill.created", event_payload)
 
-        return CreateBillResult(
-            id=created_bill_id,
-            bill_number=new_bill.bill_number,
-            issued_at=new_bill.issued_at,
-            subtotal=float(new_bill.subtotal),
-            tax=float(new_bill.tax),
-            total=float(new_bill.total),
-            currency=new_bill.currency,
-        )
+        return result
@@ -0,0 +1,14 @@
+from app.application.bills.dtos import BillDetailDto
+from app.application.bills.ports.bill_read_repository import BillReadRepository
+from app.application.common.exceptions import NotFoundError
+
+
+class GetBillDetailUseCase:
+    def __init__(self, bill_repository: BillReadRepository) -> None:
+        self._bill_repository = bill_repository
+
+    def execute(self, bill_id: int) -> BillDetailDto:
+        bill = self._bill_repository.get_detail(bill_id)
+        if bill is None:
+            raise NotFoundError(f"Bill {bill_id} was not found.")
+        return bill
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+from app.application.bills.dtos import BillDto
+from app.application.bills.ports.bill_read_repository import BillReadRepository
+
+
+@dataclass(frozen=True)
+class BillChanges:
+    bills: list[BillDto]
+    cursor: int
+    has_more: bool
+    # Newer bills exist but are held back until older transactions finish; no notification marks that moment.
+    pending: bool
+
+
+class ListBillChangesUseCase:
+    def __init__(self, bill_repository: BillReadRepository) -> None:
+        self._bill_repository = bill_repository
+
+    def execute(self, since: int, limit: int) -> BillChanges:
+        # One extra row tells whether the client should come back right away.
+        page = self._bill_repository.list_created_after(since, limit + 1)
+        has_more = len(page.bills) > limit
+        bills = page.bills[:limit]
+        return BillChanges(
+            bills=bills,
+            cursor=bills[-1].id if bills else since,
+            has_more=has_more,
+            pending=page.pending and not has_more,
+        )
@@ -1,3 +1,6 @@
+from datetime import date
+from typing import Optional
+
 from app.application.bills.dtos import BillDto
 from app.application.bills.ports.bill_read_repository import BillReadRepository
 
@@ -6,5 +9,5 @@ class ListBillsUseCase:
     def __init__(self, bill_repository: BillReadRepository) -> None:
         self._bill_repository = bill_repository
 
-    def execute(self) -> list[BillDto]:
-        return self._bill_repository.list()
+    def execute(self, issued_from: Optional[date] = None, issued_to: Optional[date] = None) -> list[BillDto]:
+        return self._bill_repository.list(issued_from, issued_to)
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from app.application.bills.dtos import BillDto
+from app.application.bills.ports.bill_read_repository import BillReadRepository
+
+
+@dataclass(frozen=True)
+class BillLookupItem:
+    key: Union[int, str]
+    bill: Optional[BillDto]
+
+
+class LookupBillsUseCase:
+    def __init__(self, bill_repository: BillReadRepository) -> None:
+        self._bill_repository = bill_repository
+
+    def by_ids(self, bill_ids: list[int]) -> list[BillLookupItem]:
+        unique_ids = list(dict.fromkeys(bill_ids))
+        found = {bill.id: bill for bill in self._bill_repository.find_by_ids(unique_ids)}
+        return [BillLookupItem(key=bill_id, bill=found.get(bill_id)) for bill_id in bill_ids]
+
+    def by_bill_numbers(self, bill_numbers: list[str]) -> list[BillLookupItem]:
+        unique_numbers = list(dict.fromkeys(bill_numbers))
+        found = {bill.bill_number: bill for bill in self._bill_repository.find_by_bill_numbers(unique_numbers)}
+        return [BillLookupItem(key=number, bill=found.get(number)) for number in bill_numbers]
@@ -0,0 +1,29 @@
+from datetime import date, datetime
+from typing import Any
+
+from app.application.bills.dtos import BillProjectionDto
+from app.application.bills.ports.bill_projection_repository import BillProjectionRepository
+
+
+class ProjectBillsCreatedUseCase:
+    def __init__(self, projection_repository: BillProjectionRepository) -> None:
+        self._projection_repository = projection_repository
+
+    def execute(self, payloads: list[dict[str, Any]]) -> int:
+        latest_by_bill_id: dict[int, BillProjectionDto] = {}
+        for payload in payloads:
+            projection = BillProjectionDto(
+                bill_id=int(payload["billId"]),
+                bill_number=payload["billNumber"],
+                issued_at=date.fromisoformat(payload["issuedAt"]),
+                subtotal=float(payload["subtotal"]),
+                tax=float(payload["tax"]),
+                total=float(payload["total"]),
+                currency=payload["currency"],
+                source=payload.get("source", "unknown"),
+                occurred_at_utc=datetime.fromisoformat(payload["occurredAtUtc"]),
+            )
+            latest_by_bill_id[projection.bill_id] = projection
+        if not latest_by_bill_id:
+            return 0
+        return self._projection_repository.upsert_many(list(latest_by_bill_id.values()))
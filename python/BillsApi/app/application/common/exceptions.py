@@ -1,2 +1,6 @@
 class ConflictError(Exception):
     pass
+
+
+class NotFoundError(Exception):
+    pass
@@ -0,0 +1,62 @@
+import logging
+import os
+import signal
+
+import pika
+from psycopg_pool import ConnectionPool
+
+from app.application.bills.use_cases.project_bills_created import ProjectBillsCreatedUseCase
+from app.infrastructure.messaging.rabbitmq_consumer import BatchingRabbitMqConsumer
+from app.infrastructure.persistence.projection_repository import PsycopgBillProjectionRepository
+
+
+def _conninfo() -> str:
+    host = os.getenv("POSTGRES_HOST", "localhost")
+    port = os.getenv("POSTGRES_PORT", "5440")
+    db = os.getenv("POSTGRES_DB", "api_lang_arena")
+    user = os.getenv("POSTGRES_USER", "api_lang_user")
+    password = os.getenv("POSTGRES_PASSWORD", "api_lang_password")
+    return f"host={host} port={port} dbname={db} user={user} password={password}"
+
+
+def main() -> None:
+    logging.basicConfig(level=os.getenv("PY_CONSUMER_LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+
+    pool = ConnectionPool(conninfo=_conninfo(), min_size=1, max_size=2, open=False)
+    pool.open(wait=True)
+    repository = PsycopgBillProjectionRepository(pool)
+    repository.ensure_schema()
+    use_case = ProjectBillsCreatedUseCase(repository)
+
+    params = pika.ConnectionParameters(
+        host=os.getenv("RABBITMQ_HOST", "localhost"),
+        port=int(os.getenv("RABBITMQ_PORT", "5672")),
+        virtual_host=os.getenv("RABBITMQ_VHOST", "/"),
+        credentials=pika.PlainCredentials(
+            os.getenv("RABBITMQ_USER", "guest"),
+            os.getenv("RABBITMQ_PASSWORD", "guest"),
+        ),
+        heartbeat=30,
+    )
+    consumer = BatchingRabbitMqConsumer(
+        params=params,
+        queue_name=os.getenv("RABBITMQ_BILL_CREATED_QUEUE", "bill-created"),
+        event_name="bill.created",
+        handler=use_case.execute,
+        prefetch_count=int(os.getenv("PY_CONSUMER_PREFETCH", "500")),
+        batch_size=int(os.getenv("PY_CONSUMER_BATCH_SIZE", "200")),
+        batch_timeout_sec=float(os.getenv("PY_CONSUMER_BATCH_TIMEOUT_MS", "250")) / 1000.0,
+        report_interval_sec=float(os.getenv("PY_CONSUMER_REPORT_INTERVAL_SEC", "10")),
+        dead_letter_queue=os.getenv("PY_CONSUMER_DEAD_LETTER_QUEUE") or None,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: consumer.stop())
+    signal.signal(signal.SIGINT, lambda *_: consumer.stop())
+
+    try:
+        consumer.run()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
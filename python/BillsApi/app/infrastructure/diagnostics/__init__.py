@@ -0,0 +1,18 @@
+from app.infrastructure.diagnostics.sampling_profiler import (
+    ProfilerBusyError,
+    ProfilerRouteMiddleware,
+    SamplingProfiler,
+)
+from app.infrastructure.diagnostics.slow_query_log import SlowQueryObserver, SlowQueryRecord
+from app.infrastructure.diagnostics.stage_metrics import StageMetrics, StageTimingMiddleware, stage
+
+__all__ = [
+    "ProfilerBusyError",
+    "ProfilerRouteMiddleware",
+    "SamplingProfiler",
+    "SlowQueryObserver",
+    "SlowQueryRecord",
+    "StageMetrics",
+    "StageTimingMiddleware",
+    "stage",
+]
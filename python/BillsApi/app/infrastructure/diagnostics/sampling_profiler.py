@@ -0,0 +1,140 @@
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Callable, Optional
+
+
+_UNATTRIBUTED = "(unattributed)"
+# Labels are cached per code object; code created at runtime (e.g. pydantic or SQLAlchemy codegen) must not grow the
+# cache forever.
+_MAX_FRAME_LABELS = 10000
+
+
+def _short_filename(filename: str) -> str:
+    normalized = filename.replace("\\", "/")
+    index = normalized.rfind("/site-packages/")
+    if index >= 0:
+        return normalized[index + len("/site-packages/") :]
+    index = normalized.rfind("/app/")
+    if index >= 0:
+        return normalized[index + 1 :]
+    return normalized.rsplit("/", 1)[-1]
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+class SamplingProfiler:
+    def __init__(self, max_stack_depth: int = 128) -> None:
+        self._max_stack_depth = max_stack_depth
+        self._session_lock = threading.Lock()
+        self._endpoint_routes: dict[CodeType, str] = {}
+        self._request_scopes: dict[FrameType, dict[str, Any]] = {}
+        self._frame_labels: dict[CodeType, str] = {}
+
+    def register_endpoint(self, endpoint: Callable[..., Any], route: str) -> None:
+        code = getattr(endpoint, "__code__", None)
+        if code is not None:
+            self._endpoint_routes[code] = route
+
+    def enter_request(self, frame: FrameType, scope: dict[str, Any]) -> None:
+        self._request_scopes[frame] = scope
+
+    def exit_request(self, frame: FrameType) -> None:
+        self._request_scopes.pop(frame, None)
+
+    def profile(self, duration_sec: float, rate_hz: float, include_unattributed: bool = False) -> str:
+        if not self._session_lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profiling session is already running.")
+        try:
+            samples = self._sample(duration_sec, 1.0 / rate_hz, include_unattributed)
+        finally:
+            self._session_lock.release()
+        return self._collapse(samples)
+
+    def _sample(
+        self,
+        duration_sec: float,
+        interval_sec: float,
+        include_unattributed: bool,
+    ) -> Counter[tuple[str, tuple[CodeType, ...]]]:
+        own_ident = threading.get_ident()
+        samples: Counter[tuple[str, tuple[CodeType, ...]]] = Counter()
+        deadline = time.perf_counter() + duration_sec
+        next_tick = time.perf_counter()
+        while next_tick < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                route, stack = self._walk(frame)
+                if route is None:
+                    if not include_unattributed:
+                        continue
+                    route = _UNATTRIBUTED
+                samples[(route, stack)] += 1
+            next_tick += interval_sec
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+        return samples
+
+    def _walk(self, frame: Optional[FrameType]) -> tuple[Optional[str], tuple[CodeType, ...]]:
+        route: Optional[str] = None
+        codes: list[CodeType] = []
+        while frame is not None and len(codes) < self._max_stack_depth:
+            code = frame.f_code
+            codes.append(code)
+            if route is None:
+                route = self._endpoint_routes.get(code)
+                if route is None:
+                    scope = self._request_scopes.get(frame)
+                    if scope is not None:
+                        route = self._route_for_scope(scope)
+            frame = frame.f_back
+        codes.reverse()
+        return route, tuple(codes)
+
+    def _collapse(self, samples: Counter[tuple[str, tuple[CodeType, ...]]]) -> str:
+        lines = []
+        for (route, stack), count in samples.most_common():
+            frames = ";".join(self._label(code) for code in stack)
+            lines.append(f"{route};{frames} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def _label(self, code: CodeType) -> str:
+        label = self._frame_labels.get(code)
+        if label is None:
+            qualname = getattr(code, "co_qualname", code.co_name)
+            label = f"{qualname} ({_short_filename(code.co_filename)}:{code.co_firstlineno})"
+            if len(self._frame_labels) >= _MAX_FRAME_LABELS:
+                self._frame_labels.clear()
+            self._frame_labels[code] = label
+        return label
+
+    @staticmethod
+    def _route_for_scope(scope: dict[str, Any]) -> str:
+        route = scope.get("route")
+        path = getattr(route, "path", None) or scope.get("path", "")
+        return f"{scope.get('method', '')} {path}".strip()
+
+
+class ProfilerRouteMiddleware:
+    def __init__(self, app: Any, profiler: SamplingProfiler) -> None:
+        self._app = app
+        self._profiler = profiler
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+        frame = sys._getframe()
+        self._profiler.enter_request(frame, scope)
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            self._profiler.exit_request(frame)
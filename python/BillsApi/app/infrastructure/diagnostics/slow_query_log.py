@@ -0,0 +1,173 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import psycopg
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowQueryRecord:
+    captured_at: datetime
+    source: str
+    statement: str
+    parameters: str
+    duration_ms: float
+    rows: int
+    plan: Optional[str] = None
+    plan_status: str = "not_applicable"
+
+
+class SlowQueryObserver:
+    def __init__(
+        self,
+        conninfo: str,
+        threshold_ms: float,
+        buffer_size: int = 50,
+        explain_enabled: bool = True,
+        explain_interval_sec: float = 60.0,
+        explain_timeout_ms: int = 30000,
+    ) -> None:
+        self._conninfo = conninfo
+        self._threshold_sec = threshold_ms / 1000.0
+        self._explain_enabled = explain_enabled
+        self._explain_interval_sec = explain_interval_sec
+        self._explain_timeout_ms = explain_timeout_ms
+        self._records: deque[SlowQueryRecord] = deque(maxlen=buffer_size)
+        self._records_lock = threading.Lock()
+        self._last_explained_at: dict[str, float] = {}
+        self._explain_queue: queue.Queue[Optional[tuple[SlowQueryRecord, str, Any]]] = queue.Queue(maxsize=8)
+        self._worker: Optional[threading.Thread] = None
+        self.cursor_factory = self._build_cursor_factory()
+
+    @property
+    def enabled(self) -> bool:
+        return self._threshold_sec > 0
+
+    def attach_engine(self, engine: Engine) -> None:
+        if not self.enabled:
+            return
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+            conn.info["slow_query_started_at"] = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+            started_at = conn.info.pop("slow_query_started_at", None)
+            if started_at is None:
+                return
+            self.observe(
+                "sqlalchemy",
+                statement,
+                parameters,
+                time.perf_counter() - started_at,
+                cursor.rowcount,
+                explainable=not executemany,
+            )
+
+    def observe(
+        self,
+        source: str,
+        statement: str,
+        parameters: Any,
+        elapsed_sec: float,
+        rows: int,
+        explainable: bool = True,
+    ) -> None:
+        if not self.enabled or elapsed_sec < self._threshold_sec:
+            return
+
+        record = SlowQueryRecord(
+            captured_at=datetime.now(timezone.utc),
+            source=source,
+            statement=" ".join(statement.split()),
+            parameters=repr(parameters),
+            duration_ms=round(elapsed_sec * 1000, 2),
+            rows=rows,
+        )
+        logger.warning(
+            "Slow query (%s) %.2f ms, %s rows: %s params=%s",
+            source,
+            record.duration_ms,
+            rows,
+            record.statement,
+            record.parameters,
+        )
+        if explainable and self._explain_enabled and record.statement.upper().startswith("SELECT"):
+            self._schedule_explain(record, statement, parameters)
+        with self._records_lock:
+            self._records.append(record)
+
+    def snapshot(self) -> list[SlowQueryRecord]:
+        with self._records_lock:
+            return list(reversed(self._records))
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._explain_queue.put(None)
+            self._worker.join(timeout=5)
+            self._worker = None
+
+    def _schedule_explain(self, record: SlowQueryRecord, statement: str, parameters: Any) -> None:
+        now = time.monotonic()
+        last_explained_at = self._last_explained_at.get(record.statement)
+        if last_explained_at is not None and now - last_explained_at < self._explain_interval_sec:
+            record.plan_status = "rate_limited"
+            return
+        try:
+            self._explain_queue.put_nowait((record, statement, parameters))
+        except queue.Full:
+            record.plan_status = "dropped"
+            return
+        self._last_explained_at[record.statement] = now
+        record.plan_status = "pending"
+        with self._records_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _explain_loop(self) -> None:
+        conn: Optional[psycopg.Connection] = None
+        try:
+            while True:
+                job = self._explain_queue.get()
+                if job is None:
+                    return
+                record, statement, parameters = job
+                try:
+                    if conn is None or conn.closed:
+                        conn = psycopg.connect(self._conninfo, autocommit=True)
+                        conn.execute(f"SET statement_timeout = {int(self._explain_timeout_ms)}")
+                    with conn.cursor() as cur:
+                        cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or None)
+                        record.plan = "\n".join(row[0] for row in cur.fetchall())
+                    record.plan_status = "captured"
+                except Exception as exc:  # noqa: BLE001
+                    record.plan = f"{type(exc).__name__}: {exc}"
+                    record.plan_status = "failed"
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _build_cursor_factory(self) -> type[psycopg.Cursor]:
+        observer = self
+
+        class ObservedCursor(psycopg.Cursor):
+            def execute(self, query, params=None, **kwargs):
+                started_at = time.perf_counter()
+                result = super().execute(query, params, **kwargs)
+                statement = query if isinstance(query, str) else query.as_string(self)
+                observer.observe("psycopg", statement, params, time.perf_counter() - started_at, self.rowcount)
+                return result
+
+        return ObservedCursor
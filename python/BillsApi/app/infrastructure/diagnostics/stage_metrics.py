@@ -0,0 +1,146 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+_DEFAULT_BUCKETS_SEC = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class RequestTimings:
+    __slots__ = ("started_at", "last_mark", "stages")
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.last_mark = self.started_at
+        self.stages: list[tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+        self.last_mark = time.perf_counter()
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, time.perf_counter() - started)
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "total")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.count = 0
+        self.total = 0.0
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class StageMetrics:
+    def __init__(self, buckets_sec: tuple[float, ...] = _DEFAULT_BUCKETS_SEC) -> None:
+        self._buckets = buckets_sec
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self._collectors.append(collector)
+
+    def observe_request(self, route: str, stages: list[tuple[str, float]]) -> None:
+        with self._lock:
+            for name, seconds in stages:
+                histogram = self._histograms.get((route, name))
+                if histogram is None:
+                    histogram = _Histogram(len(self._buckets))
+                    self._histograms[(route, name)] = histogram
+                histogram.bucket_counts[bisect_left(self._buckets, seconds)] += 1
+                histogram.count += 1
+                histogram.total += seconds
+
+    def render(self) -> str:
+        lines = [
+            "# HELP bills_api_stage_duration_seconds Time spent per request stage.",
+            "# TYPE bills_api_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            snapshot = [
+                (route, name, list(histogram.bucket_counts), histogram.count, histogram.total)
+                for (route, name), histogram in sorted(self._histograms.items())
+            ]
+        for route, name, bucket_counts, count, total in snapshot:
+            labels = f'route="{_escape_label(route)}",stage="{_escape_label(name)}"'
+            cumulative = 0
+            for upper, bucket_count in zip(self._buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'bills_api_stage_duration_seconds_bucket{{{labels},le="{upper}"}} {cumulative}')
+            lines.append(f'bills_api_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"bills_api_stage_duration_seconds_sum{{{labels}}} {total}")
+            lines.append(f"bills_api_stage_duration_seconds_count{{{labels}}} {count}")
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+class StageTimingMiddleware:
+    def __init__(self, app: Any, metrics: StageMetrics) -> None:
+        self._app = app
+        self._metrics = metrics
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_with_timings(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                stages = timings.stages + [
+                    ("serialize", now - timings.last_mark),
+                    ("total", now - timings.started_at),
+                ]
+                server_timing = ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+                route = scope.get("route")
+                if route is not None:
+                    self._metrics.observe_request(f"{scope['method']} {route.path}", stages)
+            await send(message)
+
+        try:
+            await self._app(scope, receive, send_with_timings)
+        finally:
+            _current_timings.reset(token)
@@ -1,3 +1,15 @@
-from app.infrastructure.messaging.rabbitmq_publisher import RabbitMqIntegrationEventPublisher
+from app.infrastructure.messaging.circuit_breaker import CircuitBreaker, CircuitState
+from app.infrastructure.messaging.envelope import decode_envelopes, encode_batch_envelope, encode_envelope
+from app.infrastructure.messaging.rabbitmq_publisher import CircuitOpenError, RabbitMqIntegrationEventPublisher
+from app.infrastructure.messaging.spool_publisher import SpoolFileEventPublisher
 
-__all__ = ["RabbitMqIntegrationEventPublisher"]
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "RabbitMqIntegrationEventPublisher",
+    "SpoolFileEventPublisher",
+    "decode_envelopes",
+    "encode_batch_envelope",
+    "encode_envelope",
+]
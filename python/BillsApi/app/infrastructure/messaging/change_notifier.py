@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from typing import Any
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Wakes change-feed requests waiting on the event loop. notify() can be called from any thread: the create-bill hook
+# runs in the threadpool, the LISTEN/NOTIFY listener in its own thread.
+class BillChangeNotifier:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+        self.notifications = 0
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def notify(self, *_: Any) -> None:
+        with self._lock:
+            self._version += 1
+            self.notifications += 1
+            waiters = list(self._waiters)
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The waiter's loop is already closed.
+                pass
+
+    async def wait(self, seen_version: int, timeout_sec: float) -> bool:
+        # Returns True once anything was notified after seen_version was read, False on timeout. Callers read the
+        # version before querying, so a bill committed between the query and this call is not missed.
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self._version != seen_version:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], timeout_sec)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def metrics_lines(self) -> list[str]:
+        with self._lock:
+            notifications, waiters = self.notifications, len(self._waiters)
+        return [
+            "# HELP bills_api_change_feed_notifications_total Bill creations signalled to change-feed waiters.",
+            "# TYPE bills_api_change_feed_notifications_total counter",
+            f"bills_api_change_feed_notifications_total {notifications}",
+            "# HELP bills_api_change_feed_waiters Change-feed requests currently waiting for new bills.",
+            "# TYPE bills_api_change_feed_waiters gauge",
+            f"bills_api_change_feed_waiters {waiters}",
+        ]
@@ -0,0 +1,66 @@
+import threading
+from collections import Counter
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, initial_state: CircuitState = CircuitState.OPEN) -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._state = initial_state
+        self._transitions: Counter[tuple[CircuitState, CircuitState]] = Counter()
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def transition(self, new_state: CircuitState) -> bool:
+        with self._lock:
+            if self._state is new_state:
+                return False
+            self._transitions[(self._state, new_state)] += 1
+            self._state = new_state
+            return True
+
+    def record_rejected(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def metrics_lines(self) -> list[str]:
+        with self._lock:
+            state = self._state
+            transitions = sorted(self._transitions.items())
+            rejected = self._rejected
+        lines = [
+            "# HELP bills_api_circuit_state Current circuit breaker state (1 for the active state).",
+            "# TYPE bills_api_circuit_state gauge",
+        ]
+        for candidate in CircuitState:
+            value = 1 if candidate is state else 0
+            lines.append(f'bills_api_circuit_state{{circuit="{self._name}",state="{candidate.value}"}} {value}')
+        lines.extend(
+            [
+                "# HELP bills_api_circuit_transitions_total Circuit breaker state transitions.",
+                "# TYPE bills_api_circuit_transitions_total counter",
+            ]
+        )
+        for (source, target), count in transitions:
+            lines.append(
+                f'bills_api_circuit_transitions_total{{circuit="{self._name}",from="{source.value}",'
+                f'to="{target.value}"}} {count}'
+            )
+        lines.extend(
+            [
+                "# HELP bills_api_circuit_rejected_total Calls rejected while the circuit was open.",
+                "# TYPE bills_api_circuit_rejected_total counter",
+                f'bills_api_circuit_rejected_total{{circuit="{self._name}"}} {rejected}',
+            ]
+        )
+        return lines
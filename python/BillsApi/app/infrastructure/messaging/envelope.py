@@ -0,0 +1,74 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is only needed for the batch format
+    msgpack = None
+
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/vnd.msgpack"
+JSON_ENVELOPE_VERSION = 1
+BATCH_ENVELOPE_VERSION = 2
+ENVELOPE_FORMATS = ("json", "msgpack-batch")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _occurred_at_utc() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def encode_envelope(event_name: str, payload: dict[str, Any]) -> bytes:
+    envelope = {
+        "eventName": event_name,
+        "occurredAtUtc": _occurred_at_utc(),
+        "payload": payload,
+    }
+    return json.dumps(envelope, default=_json_default).encode("utf-8")
+
+
+def encode_batch_envelope(event_name: str, payloads: list[dict[str, Any]]) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("The msgpack-batch envelope format requires the 'msgpack' package.")
+    envelope = {
+        "version": BATCH_ENVELOPE_VERSION,
+        "eventName": event_name,
+        "occurredAtUtc": _occurred_at_utc(),
+        "events": payloads,
+    }
+    return msgpack.packb(envelope, default=_json_default, use_bin_type=True)
+
+
+# The other APIs publish the same envelope with their serializers' default key style: snake_case (Rust, serde) or
+# PascalCase (.NET, System.Text.Json). Keys are read back as the camelCase this module writes.
+def _camel_case(key: str) -> str:
+    if "_" in key:
+        first, *rest = key.split("_")
+        return first.lower() + "".join(part[:1].upper() + part[1:].lower() for part in rest)
+    return key[:1].lower() + key[1:]
+
+
+def _camel_case_keys(value: Any) -> dict[str, Any]:
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected an object, got {type(value).__name__}.")
+    return {_camel_case(key): item for key, item in value.items()}
+
+
+def decode_envelopes(body: bytes, content_type: str | None) -> tuple[str, list[dict[str, Any]]]:
+    if content_type == MSGPACK_CONTENT_TYPE:
+        if msgpack is None:
+            raise RuntimeError("Decoding msgpack-batch envelopes requires the 'msgpack' package.")
+        envelope = _camel_case_keys(msgpack.unpackb(body, raw=False))
+        return envelope["eventName"], [_camel_case_keys(payload) for payload in envelope["events"]]
+    envelope = _camel_case_keys(json.loads(body))
+    return envelope["eventName"], [_camel_case_keys(envelope["payload"])]
@@ -0,0 +1,19 @@
+import threading
+from typing import Any
+
+from app.application.bills.ports.integration_event_publisher import IntegrationEventPublisher
+
+
+# Drops events and only counts them, for runs without a broker.
+class NullIntegrationEventPublisher(IntegrationEventPublisher):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, event_name: str, payload: dict[str, Any]) -> None:
+        with self._lock:
+            self.published += 1
+
+    def publish_batch(self, event_name: str, payloads: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self.published += len(payloads)
@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import pika
+
+from app.infrastructure.messaging.envelope import decode_envelopes
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingMessage:
+    delivery_tag: int
+    event_name: Optional[str]
+    payloads: list[dict[str, Any]]
+    body: bytes
+    properties: pika.BasicProperties
+
+
+@dataclass
+class ConsumerStats:
+    messages: int = 0
+    events: int = 0
+    batches: int = 0
+    dead_lettered_messages: int = 0
+    last_event_lag_sec: float = 0.0
+    queue_depth: int = 0
+
+
+class BatchingRabbitMqConsumer:
+    def __init__(
+        self,
+        params: pika.ConnectionParameters,
+        queue_name: str,
+        event_name: str,
+        handler: Callable[[list[dict[str, Any]]], Any],
+        prefetch_count: int = 500,
+        batch_size: int = 200,
+        batch_timeout_sec: float = 0.25,
+        report_interval_sec: float = 10.0,
+        dead_letter_queue: Optional[str] = None,
+    ) -> None:
+        self._params = params
+        self._queue_name = queue_name
+        self._dead_letter_queue = dead_letter_queue or f"{queue_name}.dead-letter"
+        self._event_name = event_name
+        self._handler = handler
+        self._prefetch_count = max(prefetch_count, batch_size)
+        self._batch_size = batch_size
+        self._batch_timeout_sec = batch_timeout_sec
+        self._report_interval_sec = report_interval_sec
+        self._pending: list[_PendingMessage] = []
+        self._batch_started_at = 0.0
+        self._stopping = threading.Event()
+        self.stats = ConsumerStats()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self) -> None:
+        connection = pika.BlockingConnection(self._params)
+        try:
+            channel = connection.channel()
+            channel.queue_declare(queue=self._queue_name, durable=True, exclusive=False, auto_delete=False)
+            channel.queue_declare(queue=self._dead_letter_queue, durable=True, exclusive=False, auto_delete=False)
+            # Dead-lettering publishes before acking the original, so the broker must confirm each copy.
+            channel.confirm_delivery()
+            channel.basic_qos(prefetch_count=self._prefetch_count)
+            channel.basic_consume(queue=self._queue_name, on_message_callback=self._on_message)
+
+            reported_at = time.monotonic()
+            reported_events = 0
+            while not self._stopping.is_set():
+                connection.process_data_events(time_limit=self._poll_interval())
+                if self._pending and (
+                    len(self._pending) >= self._batch_size
+                    or time.monotonic() - self._batch_started_at >= self._batch_timeout_sec
+                ):
+                    self._flush(channel)
+
+                now = time.monotonic()
+                if now - reported_at >= self._report_interval_sec:
+                    self._report(channel, now - reported_at, self.stats.events - reported_events)
+                    reported_at = now
+                    reported_events = self.stats.events
+
+            if self._pending:
+                self._flush(channel)
+        finally:
+            if connection.is_open:
+                connection.close()
+
+    def _poll_interval(self) -> float:
+        if not self._pending:
+            return self._batch_timeout_sec
+        remaining = self._batch_timeout_sec - (time.monotonic() - self._batch_started_at)
+        return max(remaining, 0.0)
+
+    def _on_message(self, channel, method, properties, body: bytes) -> None:
+        if not self._pending:
+            self._batch_started_at = time.monotonic()
+        try:
+            event_name, payloads = decode_envelopes(body, properties.content_type)
+        except Exception:  # noqa: BLE001
+            logger.exception("Undecodable message %s", method.delivery_tag)
+            event_name, payloads = None, []
+        self._pending.append(_PendingMessage(method.delivery_tag, event_name, payloads, body, properties))
+
+    def _flush(self, channel) -> None:
+        batch, self._pending = self._pending, []
+        accepted = [m for m in batch if m.event_name == self._event_name]
+        payloads = [payload for message in accepted for payload in message.payloads]
+        try:
+            if payloads:
+                self._handler(payloads)
+        except Exception:  # noqa: BLE001
+            logger.exception("Batch of %s events failed; retrying message by message", len(payloads))
+            self._flush_one_by_one(channel, batch)
+            return
+
+        for message in batch:
+            if message.event_name != self._event_name:
+                self._dead_letter(channel, message, self._unrecognized_reason(message))
+        channel.basic_ack(delivery_tag=batch[-1].delivery_tag, multiple=True)
+        if accepted:
+            self._record(accepted, payloads)
+
+    def _flush_one_by_one(self, channel, batch: list[_PendingMessage]) -> None:
+        for message in batch:
+            if message.event_name != self._event_name:
+                self._dead_letter(channel, message, self._unrecognized_reason(message))
+            else:
+                try:
+                    self._handler(message.payloads)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Message %s failed", message.delivery_tag)
+                    self._dead_letter(channel, message, f"handler failed: {exc!r}")
+                else:
+                    self._record([message], message.payloads)
+            channel.basic_ack(delivery_tag=message.delivery_tag, multiple=False)
+
+    def _unrecognized_reason(self, message: _PendingMessage) -> str:
+        if message.event_name is None:
+            return "undecodable"
+        return f"unexpected event {message.event_name!r}"
+
+    def _dead_letter(self, channel, message: _PendingMessage, reason: str) -> None:
+        # Keeps the original body and properties, so the message can be inspected or shovelled back once fixed.
+        properties = message.properties
+        headers = dict(properties.headers or {})
+        headers["x-dead-letter-reason"] = reason
+        headers["x-original-queue"] = self._queue_name
+        channel.basic_publish(
+            exchange="",
+            routing_key=self._dead_letter_queue,
+            body=message.body,
+            properties=pika.BasicProperties(
+                content_type=properties.content_type,
+                content_encoding=properties.content_encoding,
+                message_id=properties.message_id,
+                timestamp=properties.timestamp,
+                headers=headers,
+                delivery_mode=2,
+            ),
+        )
+        logger.warning("Moved message %s to %s: %s", message.delivery_tag, self._dead_letter_queue, reason)
+        self.stats.dead_lettered_messages += 1
+
+    def _record(self, batch: list[_PendingMessage], payloads: list[dict[str, Any]]) -> None:
+        self.stats.messages += len(batch)
+        self.stats.events += len(payloads)
+        self.stats.batches += 1
+        if payloads:
+            occurred_at = payloads[-1].get("occurredAtUtc")
+            if isinstance(occurred_at, str):
+                try:
+                    lag = datetime.now(timezone.utc) - datetime.fromisoformat(occurred_at)
+                    self.stats.last_event_lag_sec = lag.total_seconds()
+                except (TypeError, ValueError):
+                    pass
+
+    def _report(self, channel, elapsed_sec: float, events: int) -> None:
+        declared = channel.queue_declare(queue=self._queue_name, passive=True)
+        self.stats.queue_depth = declared.method.message_count
+        logger.info(
+            "Consumer %s: %.1f events/s, queue depth %s, last event lag %.3fs, "
+            "totals messages=%s events=%s batches=%s dead-lettered=%s",
+            self._queue_name,
+            events / elapsed_sec if elapsed_sec > 0 else 0.0,
+            self.stats.queue_depth,
+            self.stats.last_event_lag_sec,
+            self.stats.messages,
+            self.stats.events,
+            self.stats.batches,
+            self.stats.dead_lettered_messages,
+        )
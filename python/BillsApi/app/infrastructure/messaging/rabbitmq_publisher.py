@@ -1,20 +1,29 @@
-import json
+import logging
+import random
 import threading
-from datetime import date, datetime
-from decimal import Decimal
-from typing import Any
+from typing import Any, Optional
 
 import pika
 
 from app.application.bills.ports.integration_event_publisher import IntegrationEventPublisher
+from app.infrastructure.diagnostics.stage_metrics import stage
+from app.infrastructure.messaging.circuit_breaker import CircuitBreaker, CircuitState
+from app.infrastructure.messaging.envelope import (
+    BATCH_ENVELOPE_VERSION,
+    ENVELOPE_FORMATS,
+    JSON_CONTENT_TYPE,
+    JSON_ENVELOPE_VERSION,
+    MSGPACK_CONTENT_TYPE,
+    encode_batch_envelope,
+    encode_envelope,
+)
 
 
-def _json_default(value: Any) -> Any:
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    if isinstance(value, Decimal):
-        return float(value)
-    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(pika.exceptions.AMQPConnectionError):
+    pass
 
 
 class RabbitMqIntegrationEventPublisher(IntegrationEventPublisher):
@@ -26,7 +35,16 @@ class RabbitMqIntegrationEventPublisher(IntegrationEventPublisher):
         password: str,
         vhost: str,
         queue_name: str,
+        connect_timeout_sec: float = 5.0,
+        backoff_initial_sec: float = 0.5,
+        backoff_max_sec: float = 30.0,
+        keepalive_interval_sec: float = 10.0,
+        fallback: Optional[IntegrationEventPublisher] = None,
+        envelope_format: str = "json",
+        max_batch_events: int = 500,
     ) -> None:
+        if envelope_format not in ENVELOPE_FORMATS:
+            raise ValueError(f"Unsupported envelope format '{envelope_format}'.")
         credentials = pika.PlainCredentials(user, password)
         self._params = pika.ConnectionParameters(
             host=host,
@@ -35,57 +53,189 @@ class RabbitMqIntegrationEventPublisher(IntegrationEventPublisher):
             credentials=credentials,
             heartbeat=30,
             blocked_connection_timeout=30,
+            socket_timeout=connect_timeout_sec,
+            stack_timeout=connect_timeout_sec,
         )
         self._queue_name = queue_name
+        self._backoff_initial_sec = backoff_initial_sec
+        self._backoff_max_sec = backoff_max_sec
+        self._keepalive_interval_sec = keepalive_interval_sec
+        self._fallback = fallback
+        self._envelope_format = envelope_format
+        self._max_batch_events = max_batch_events
+        self._fallback_count = 0
+        self._fallback_lock = threading.Lock()
         self._lock = threading.Lock()
         self._connection: pika.BlockingConnection | None = None
         self._channel: pika.channel.Channel | None = None
+        self._breaker = CircuitBreaker("rabbitmq-publisher")
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._supervisor: threading.Thread | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        return self._breaker.state
+
+    def start(self) -> None:
+        self._try_connect()
+        self._stopping.clear()
+        self._supervisor = threading.Thread(
+            target=self._supervise,
+            name="rabbitmq-publisher-supervisor",
+            daemon=True,
+        )
+        self._supervisor.start()
 
     def publish(self, event_name: str, payload: dict[str, Any]) -> None:
-        envelope = {
-            "eventName": event_name,
-            "occurredAtUtc": datetime.utcnow().isoformat() + "Z",
-            "payload": payload,
-        }
-        body = json.dumps(envelope, default=_json_default).encode("utf-8")
+        self.publish_batch(event_name, [payload])
 
-        with self._lock:
-            channel = self._ensure_channel()
-            channel.basic_publish(
-                exchange="",
-                routing_key=self._queue_name,
-                body=body,
-                properties=pika.BasicProperties(
-                    content_type="application/json",
-                    delivery_mode=2,
-                ),
-            )
+    def publish_batch(self, event_name: str, payloads: list[dict[str, Any]]) -> None:
+        if not payloads:
+            return
+        messages = self._encode_messages(event_name, payloads)
+
+        if self._breaker.state is CircuitState.OPEN:
+            self._reject(event_name, payloads)
+            return
+
+        with stage("publisher_lock_wait"):
+            self._lock.acquire()
+        published = False
+        try:
+            channel = self._channel
+            if channel is not None and self._breaker.state is not CircuitState.OPEN:
+                try:
+                    with stage("publish"):
+                        for body, properties in messages:
+                            channel.basic_publish(
+                                exchange="",
+                                routing_key=self._queue_name,
+                                body=body,
+                                properties=properties,
+                            )
+                    published = True
+                except pika.exceptions.AMQPError:
+                    self._trip()
+                    raise
+        finally:
+            self._lock.release()
+
+        if not published:
+            self._reject(event_name, payloads)
+            return
+        self._breaker.transition(CircuitState.CLOSED)
 
     def close(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout=5)
+            self._supervisor = None
         with self._lock:
-            if self._connection and self._connection.is_open:
-                self._connection.close()
-            self._connection = None
-            self._channel = None
-
-    def _ensure_channel(self) -> pika.channel.Channel:
-        if self._connection is None or self._connection.is_closed:
-            self._connection = pika.BlockingConnection(self._params)
-            self._channel = self._connection.channel()
-            self._channel.queue_declare(
-                queue=self._queue_name,
-                durable=True,
-                exclusive=False,
-                auto_delete=False,
+            self._drop_connection()
+
+    def metrics_lines(self) -> list[str]:
+        return self._breaker.metrics_lines() + [
+            "# HELP bills_api_publisher_fallback_total Events routed to the fallback publisher.",
+            "# TYPE bills_api_publisher_fallback_total counter",
+            f"bills_api_publisher_fallback_total {self._fallback_count}",
+        ]
+
+    def _encode_messages(
+        self,
+        event_name: str,
+        payloads: list[dict[str, Any]],
+    ) -> list[tuple[bytes, pika.BasicProperties]]:
+        if self._envelope_format == "json":
+            properties = pika.BasicProperties(
+                content_type=JSON_CONTENT_TYPE,
+                delivery_mode=2,
+                headers={"x-envelope-version": JSON_ENVELOPE_VERSION},
+            )
+            return [(encode_envelope(event_name, payload), properties) for payload in payloads]
+
+        messages = []
+        for start in range(0, len(payloads), self._max_batch_events):
+            chunk = payloads[start : start + self._max_batch_events]
+            properties = pika.BasicProperties(
+                content_type=MSGPACK_CONTENT_TYPE,
+                delivery_mode=2,
+                headers={
+                    "x-envelope-version": BATCH_ENVELOPE_VERSION,
+                    "x-event-name": event_name,
+                    "x-event-count": len(chunk),
+                },
             )
+            messages.append((encode_batch_envelope(event_name, chunk), properties))
+        return messages
 
-        if self._channel is None or self._channel.is_closed:
-            self._channel = self._connection.channel()
-            self._channel.queue_declare(
+    def _reject(self, event_name: str, payloads: list[dict[str, Any]]) -> None:
+        self._breaker.record_rejected()
+        if self._fallback is None:
+            raise CircuitOpenError("RabbitMQ publisher circuit is open.")
+        self._fallback.publish_batch(event_name, payloads)
+        with self._fallback_lock:
+            self._fallback_count += len(payloads)
+
+    def _trip(self) -> None:
+        self._drop_connection()
+        if self._breaker.transition(CircuitState.OPEN):
+            logger.warning("RabbitMQ publisher circuit opened.")
+        self._wake.set()
+
+    def _drop_connection(self) -> None:
+        connection = self._connection
+        self._connection = None
+        self._channel = None
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except Exception:  # noqa: BLE001
+                pass
+
+    def _try_connect(self) -> bool:
+        try:
+            connection = pika.BlockingConnection(self._params)
+            channel = connection.channel()
+            channel.queue_declare(
                 queue=self._queue_name,
                 durable=True,
                 exclusive=False,
                 auto_delete=False,
             )
+        except pika.exceptions.AMQPError as exc:
+            logger.warning("RabbitMQ reconnect failed: %s", exc.__class__.__name__)
+            self._breaker.transition(CircuitState.OPEN)
+            return False
+
+        with self._lock:
+            self._drop_connection()
+            self._connection = connection
+            self._channel = channel
+        self._breaker.transition(CircuitState.HALF_OPEN)
+        return True
+
+    def _supervise(self) -> None:
+        delay = self._backoff_initial_sec
+        while not self._stopping.is_set():
+            if self._breaker.state is CircuitState.OPEN:
+                if self._try_connect():
+                    delay = self._backoff_initial_sec
+                    continue
+                self._stopping.wait(random.uniform(delay / 2, delay))
+                delay = min(delay * 2, self._backoff_max_sec)
+                continue
 
-        return self._channel
+            self._wake.wait(self._keepalive_interval_sec)
+            self._wake.clear()
+            if self._stopping.is_set() or self._breaker.state is CircuitState.OPEN:
+                continue
+            if self._lock.acquire(blocking=False):
+                try:
+                    if self._connection is not None:
+                        self._connection.process_data_events(time_limit=0)
+                except pika.exceptions.AMQPError:
+                    self._trip()
+                finally:
+                    self._lock.release()
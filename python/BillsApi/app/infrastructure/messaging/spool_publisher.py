@@ -0,0 +1,20 @@
+import threading
+from typing import Any
+
+from app.application.bills.ports.integration_event_publisher import IntegrationEventPublisher
+from app.infrastructure.messaging.envelope import encode_envelope
+
+
+class SpoolFileEventPublisher(IntegrationEventPublisher):
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def publish(self, event_name: str, payload: dict[str, Any]) -> None:
+        self.publish_batch(event_name, [payload])
+
+    def publish_batch(self, event_name: str, payloads: list[dict[str, Any]]) -> None:
+        lines = b"".join(encode_envelope(event_name, payload) + b"\n" for payload in payloads)
+        with self._lock:
+            with open(self._path, "ab") as spool:
+                spool.write(lines)
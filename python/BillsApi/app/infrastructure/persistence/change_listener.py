@@ -0,0 +1,82 @@
+import logging
+import threading
+from typing import Callable, Optional
+
+import psycopg
+from psycopg import sql
+
+
+logger = logging.getLogger(__name__)
+
+
+# LISTENs on a Postgres channel (see db/bill_change_notify.sql) so that bills inserted by other processes or APIs wake
+# change-feed waiters too, not only bills created through this process.
+class PostgresChangeListener:
+    def __init__(
+        self,
+        conninfo: str,
+        channel: str,
+        on_notify: Callable[[], None],
+        backoff_initial_sec: float = 0.5,
+        backoff_max_sec: float = 30.0,
+    ) -> None:
+        self._conninfo = conninfo
+        self._channel = channel
+        self._on_notify = on_notify
+        self._backoff_initial_sec = backoff_initial_sec
+        self._backoff_max_sec = backoff_max_sec
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._connected = False
+        self._received = 0
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="bill-change-listener", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        backoff_sec = self._backoff_initial_sec
+        while not self._stopping.is_set():
+            try:
+                with psycopg.connect(self._conninfo, autocommit=True) as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self._channel)))
+                    self._set_connected(True)
+                    backoff_sec = self._backoff_initial_sec
+                    # Notifications sent while disconnected are lost; one wake-up makes waiters re-read.
+                    self._on_notify()
+                    while not self._stopping.is_set():
+                        # A bounded wait keeps close() responsive.
+                        for _ in conn.notifies(timeout=1.0):
+                            with self._lock:
+                                self._received += 1
+                            self._on_notify()
+            except psycopg.Error as exc:
+                logger.warning("Change listener on '%s' failed: %s", self._channel, exc)
+            finally:
+                self._set_connected(False)
+            self._stopping.wait(backoff_sec)
+            backoff_sec = min(backoff_sec * 2, self._backoff_max_sec)
+
+    def _set_connected(self, connected: bool) -> None:
+        with self._lock:
+            self._connected = connected
+
+    def metrics_lines(self) -> list[str]:
+        with self._lock:
+            connected, received = self._connected, self._received
+        return [
+            "# HELP bills_api_change_listener_connected Whether the LISTEN connection is up.",
+            "# TYPE bills_api_change_listener_connected gauge",
+            f"bills_api_change_listener_connected {int(connected)}",
+            "# HELP bills_api_change_listener_notifications_total NOTIFY messages received.",
+            "# TYPE bills_api_change_listener_notifications_total counter",
+            f"bills_api_change_listener_notifications_total {received}",
+        ]
@@ -3,6 +3,8 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.infrastructure.persistence.models import PARTITIONED_BILLS
+
 
 _engine = None
 _session_factory: sessionmaker[Session] | None = None
@@ -24,8 +26,15 @@ def get_engine():
         max_overflow = int(os.getenv("PY_DB_MAX_OVERFLOW", "5"))
         pool_timeout = int(os.getenv("PY_DB_POOL_TIMEOUT_SEC", "30"))
         pool_recycle = int(os.getenv("PY_DB_POOL_RECYCLE_SEC", "1800"))
+        # Lets the planner join and aggregate bill / bill_line partition by partition.
+        connect_args = (
+            {"options": "-c enable_partitionwise_join=on -c enable_partitionwise_aggregate=on"}
+            if PARTITIONED_BILLS
+            else {}
+        )
         _engine = create_engine(
             get_connection_url(),
+            connect_args=connect_args,
             pool_pre_ping=True,
             pool_size=pool_size,
             max_overflow=max_overflow,
@@ -0,0 +1,130 @@
+import itertools
+import threading
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from app.application.bills.dtos import BillDetailDto, BillDto, BillLineDto, CreatedBillsPage
+from app.application.bills.ports.bill_read_repository import BillReadRepository
+from app.application.bills.ports.bill_write_repository import BillWriteRepository
+from app.application.common.exceptions import ConflictError
+from app.domain.bills.entities import BillLineDraft, NewBill
+
+
+@dataclass(frozen=True)
+class _StoredBill:
+    id: int
+    bill_number: str
+    issued_at: date
+    customer_name: str
+    currency: str
+    subtotal: Decimal
+    tax: Decimal
+    lines: tuple[BillLineDraft, ...]
+    version: int
+
+
+# Shared by all stores, so a bill in a fresh store never reuses the version of an older bill with the same id.
+_versions = itertools.count(1)
+
+
+# Process-local bill store for micro-benchmarks and load harnesses that run without PostgreSQL.
+class InMemoryBillRepository(BillReadRepository, BillWriteRepository):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bills: list[_StoredBill] = []
+        self._ids_by_number: dict[str, int] = {}
+
+    def find_by_ids(self, bill_ids: list[int]) -> list[BillDto]:
+        wanted = set(bill_ids)
+        return [bill for bill in self.list() if bill.id in wanted]
+
+    def find_by_bill_numbers(self, bill_numbers: list[str]) -> list[BillDto]:
+        wanted = set(bill_numbers)
+        return [bill for bill in self.list() if bill.bill_number in wanted]
+
+    def list_created_after(self, bill_id: int, limit: int) -> CreatedBillsPage:
+        # Ids are assigned and stored under one lock, so a bill is never visible before a lower id.
+        return CreatedBillsPage(bills=[bill for bill in self.list() if bill.id > bill_id][:limit], pending=False)
+
+    def list(self, issued_from: Optional[date] = None, issued_to: Optional[date] = None) -> list[BillDto]:
+        with self._lock:
+            bills = [
+                bill
+                for bill in self._bills
+                if (issued_from is None or bill.issued_at >= issued_from)
+                and (issued_to is None or bill.issued_at <= issued_to)
+            ]
+        # Same total as _LIST_BILLS_STMT: sum of line amounts plus tax.
+        return [
+            BillDto(
+                id=bill.id,
+                bill_number=bill.bill_number,
+                issued_at=bill.issued_at,
+                total=float(sum((line.line_amount for line in bill.lines), Decimal("0")) + bill.tax),
+                currency=bill.currency,
+            )
+            for bill in bills
+        ]
+
+    def get_detail(self, bill_id: int) -> Optional[BillDetailDto]:
+        with self._lock:
+            bill = self._bills[bill_id - 1] if 0 < bill_id <= len(self._bills) else None
+        if bill is None:
+            return None
+        subtotal = sum((line.line_amount for line in bill.lines), Decimal("0"))
+        return BillDetailDto(
+            id=bill.id,
+            bill_number=bill.bill_number,
+            issued_at=bill.issued_at,
+            customer_name=bill.customer_name,
+            currency=bill.currency,
+            subtotal=float(subtotal),
+            tax=float(bill.tax),
+            total=float(subtotal + bill.tax),
+            lines=[
+                BillLineDto(
+                    line_no=line_no,
+                    concept=line.concept,
+                    quantity=float(line.quantity),
+                    unit_amount=float(line.unit_amount),
+                    line_amount=float(line.line_amount),
+                )
+                for line_no, line in enumerate(bill.lines, start=1)
+            ],
+            version=bill.version,
+        )
+
+    def get_version(self, bill_id: int) -> Optional[int]:
+        with self._lock:
+            return self._bills[bill_id - 1].version if 0 < bill_id <= len(self._bills) else None
+
+    def exists_by_bill_number(self, bill_number: str) -> bool:
+        with self._lock:
+            return bill_number in self._ids_by_number
+
+    def create(self, new_bill: NewBill) -> int:
+        with self._lock:
+            if new_bill.bill_number in self._ids_by_number:
+                raise ConflictError(f"Bill number '{new_bill.bill_number}' already exists.")
+            bill_id = len(self._bills) + 1
+            self._bills.append(
+                _StoredBill(
+                    id=bill_id,
+                    bill_number=new_bill.bill_number,
+                    issued_at=new_bill.issued_at,
+                    customer_name=new_bill.customer_name,
+                    currency=new_bill.currency,
+                    subtotal=new_bill.subtotal,
+                    tax=new_bill.tax,
+                    lines=tuple(new_bill.lines),
+                    version=next(_versions),
+                )
+            )
+            self._ids_by_number[new_bill.bill_number] = bill_id
+            return bill_id
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._bills)
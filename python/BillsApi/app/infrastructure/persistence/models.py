@@ -1,3 +1,4 @@
+import os
 from datetime import date
 from decimal import Decimal
 
@@ -5,6 +6,11 @@ from sqlalchemy import Date, ForeignKey, Numeric, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+# Layout created by db/partition_bills.sql: both tables are range-partitioned by issued_at, and bill_line carries a
+# copy of its bill's issued_at as the partition key.
+PARTITIONED_BILLS = os.getenv("PY_PARTITIONED_BILLS", "0") == "1"
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -31,3 +37,5 @@ class BillLineModel(Base):
     quantity: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     unit_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     line_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    if PARTITIONED_BILLS:
+        issued_at: Mapped[date] = mapped_column(Date, nullable=False)
@@ -0,0 +1,67 @@
+from psycopg_pool import ConnectionPool
+
+from app.application.bills.dtos import BillProjectionDto
+from app.application.bills.ports.bill_projection_repository import BillProjectionRepository
+
+
+_CREATE_PROJECTION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS bill_created_projection (
+      bill_id BIGINT PRIMARY KEY,
+      bill_number TEXT NOT NULL,
+      issued_at DATE NOT NULL,
+      subtotal NUMERIC(12,2) NOT NULL,
+      tax NUMERIC(12,2) NOT NULL,
+      total NUMERIC(12,2) NOT NULL,
+      currency CHAR(3) NOT NULL,
+      source TEXT NOT NULL,
+      occurred_at_utc TIMESTAMPTZ NOT NULL,
+      projected_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+
+_UPSERT_PROJECTIONS_SQL = """
+    INSERT INTO bill_created_projection
+      (bill_id, bill_number, issued_at, subtotal, tax, total, currency, source, occurred_at_utc)
+    SELECT *
+    FROM unnest(
+      %s::bigint[], %s::text[], %s::date[], %s::numeric[], %s::numeric[],
+      %s::numeric[], %s::text[], %s::text[], %s::timestamptz[]
+    )
+    ON CONFLICT (bill_id) DO UPDATE
+    SET bill_number = EXCLUDED.bill_number,
+        issued_at = EXCLUDED.issued_at,
+        subtotal = EXCLUDED.subtotal,
+        tax = EXCLUDED.tax,
+        total = EXCLUDED.total,
+        currency = EXCLUDED.currency,
+        source = EXCLUDED.source,
+        occurred_at_utc = EXCLUDED.occurred_at_utc,
+        projected_at = now()
+    WHERE bill_created_projection.occurred_at_utc <= EXCLUDED.occurred_at_utc;
+"""
+
+
+class PsycopgBillProjectionRepository(BillProjectionRepository):
+    def __init__(self, pool: ConnectionPool) -> None:
+        self._pool = pool
+
+    def ensure_schema(self) -> None:
+        with self._pool.connection() as conn:
+            conn.execute(_CREATE_PROJECTION_TABLE_SQL)
+
+    def upsert_many(self, projections: list[BillProjectionDto]) -> int:
+        params = (
+            [p.bill_id for p in projections],
+            [p.bill_number for p in projections],
+            [p.issued_at for p in projections],
+            [p.subtotal for p in projections],
+            [p.tax for p in projections],
+            [p.total for p in projections],
+            [p.currency for p in projections],
+            [p.source for p in projections],
+            [p.occurred_at_utc for p in projections],
+        )
+        with self._pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_UPSERT_PROJECTIONS_SQL, params)
+                return cur.rowcount
@@ -1,84 +1,235 @@
-from sqlalchemy import func, select
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import BigInteger, Select, Text, and_, any_, bindparam, func, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 
-from app.application.bills.dtos import BillDto
+from app.application.bills.dtos import BillDetailDto, BillDto, BillLineDto, CreatedBillsPage
 from app.application.bills.ports.bill_read_repository import BillReadRepository
 from app.application.bills.ports.bill_write_repository import BillWriteRepository
 from app.domain.bills.entities import NewBill
-from app.infrastructure.persistence.models import BillLineModel, BillModel
+from app.infrastructure.diagnostics.stage_metrics import stage
+from app.infrastructure.persistence.models import PARTITIONED_BILLS, BillLineModel, BillModel
 
 
 _TOTAL_EXPR = (
     func.coalesce(func.sum(BillLineModel.line_amount), 0) + BillModel.tax
 ).label("total")
-_LIST_BILLS_STMT = (
+
+
+def _issued_between(column, issued_from: Optional[date], issued_to: Optional[date]) -> list:
+    conditions = []
+    if issued_from is not None:
+        conditions.append(column >= issued_from)
+    if issued_to is not None:
+        conditions.append(column <= issued_to)
+    return conditions
+
+
+def _bill_line_join() -> list:
+    line_join = [BillLineModel.bill_id == BillModel.id]
+    if PARTITIONED_BILLS:
+        # Joining on the partition key pairs each bill partition with its bill_line partition.
+        line_join.append(BillLineModel.issued_at == BillModel.issued_at)
+    return line_join
+
+
+def _list_bills_stmt(issued_from: Optional[date] = None, issued_to: Optional[date] = None, *where) -> Select:
+    line_join = _bill_line_join()
+    if PARTITIONED_BILLS:
+        # Range predicates do not carry over a join, so the date filter is repeated on bill_line to prune its
+        # partitions as well.
+        line_join += _issued_between(BillLineModel.issued_at, issued_from, issued_to)
+    return (
+        select(
+            BillModel.id,
+            BillModel.bill_number,
+            BillModel.issued_at,
+            _TOTAL_EXPR,
+            BillModel.currency,
+        )
+        .outerjoin(BillLineModel, and_(*line_join))
+        .where(*_issued_between(BillModel.issued_at, issued_from, issued_to), *where)
+        .group_by(
+            BillModel.id,
+            BillModel.bill_number,
+            BillModel.issued_at,
+            BillModel.tax,
+            BillModel.currency,
+        )
+        .order_by(BillModel.id)
+    )
+
+
+_LIST_BILLS_STMT = _list_bills_stmt()
+# Multi-get with the list's total computation: one array parameter, so any number of keys is a single statement.
+_BILLS_BY_IDS_STMT = _list_bills_stmt(None, None, BillModel.id == any_(bindparam("bill_ids", type_=ARRAY(BigInteger))))
+_BILLS_BY_NUMBERS_STMT = _list_bills_stmt(
+    None, None, BillModel.bill_number == any_(bindparam("bill_numbers", type_=ARRAY(Text)))
+)
+# Change feed: "after the cursor" is a primary key range scan. Ids are taken from the sequence before commit, so a
+# bill can become visible while a transaction holding a lower id is still running; serving it would move clients past
+# that id for good. A bill is settled once its inserting transaction is older than every running one (xmin of the
+# statement's snapshot), and each page stops at the first bill that is not.
+_SETTLED_EXPR = func.bool_and(
+    func.age(literal_column("bill.xmin")) > func.age(literal_column("pg_snapshot_xmin(pg_current_snapshot())::xid"))
+).label("settled")
+_BILLS_CREATED_AFTER_STMT = (
+    _list_bills_stmt(None, None, BillModel.id > bindparam("after_id", type_=BigInteger))
+    .add_columns(_SETTLED_EXPR)
+    .limit(bindparam("limit"))
+)
+# Header and lines in one round trip: the header columns repeat on every line row, and a bill without lines comes
+# back as a single row with NULL line columns.
+# The row's inserting transaction id: a bill deleted and reloaded under the same id (dataset reset, bulk seed) gets a
+# new one.
+_BILL_VERSION_EXPR = literal_column("bill.xmin::text::bigint")
+
+_BILL_VERSION_STMT = select(_BILL_VERSION_EXPR).select_from(BillModel).where(
+    BillModel.id == bindparam("bill_id", type_=BigInteger)
+)
+
+_BILL_DETAIL_STMT = (
     select(
         BillModel.id,
         BillModel.bill_number,
         BillModel.issued_at,
-        _TOTAL_EXPR,
+        BillModel.customer_name,
         BillModel.currency,
-    )
-    .outerjoin(BillLineModel, BillLineModel.bill_id == BillModel.id)
-    .group_by(
-        BillModel.id,
-        BillModel.bill_number,
-        BillModel.issued_at,
         BillModel.tax,
-        BillModel.currency,
+        BillLineModel.line_no,
+        BillLineModel.concept,
+        BillLineModel.quantity,
+        BillLineModel.unit_amount,
+        BillLineModel.line_amount,
+        _BILL_VERSION_EXPR,
     )
-    .order_by(BillModel.id)
+    .outerjoin(BillLineModel, and_(*_bill_line_join()))
+    .where(BillModel.id == bindparam("bill_id", type_=BigInteger))
+    .order_by(BillLineModel.line_no)
 )
 
 
+def _to_bill_dtos(rows: list[tuple]) -> list[BillDto]:
+    return [
+        BillDto(
+            id=row[0],
+            bill_number=row[1],
+            issued_at=row[2],
+            total=float(row[3]),
+            currency=row[4],
+        )
+        for row in rows
+    ]
+
+
 class SqlAlchemyBillRepository(BillReadRepository, BillWriteRepository):
     def __init__(self, session: Session) -> None:
         self._session = session
 
-    def list(self) -> list[BillDto]:
-        rows = self._session.execute(_LIST_BILLS_STMT).tuples().all()
-        return [
-            BillDto(
-                id=row[0],
-                bill_number=row[1],
-                issued_at=row[2],
-                total=float(row[3]),
-                currency=row[4],
+    def find_by_ids(self, bill_ids: list[int]) -> list[BillDto]:
+        if not bill_ids:
+            return []
+        with stage("lookup_query"):
+            rows = self._session.execute(_BILLS_BY_IDS_STMT, {"bill_ids": bill_ids}).tuples().all()
+        return _to_bill_dtos(rows)
+
+    def find_by_bill_numbers(self, bill_numbers: list[str]) -> list[BillDto]:
+        if not bill_numbers:
+            return []
+        with stage("lookup_query"):
+            rows = self._session.execute(_BILLS_BY_NUMBERS_STMT, {"bill_numbers": bill_numbers}).tuples().all()
+        return _to_bill_dtos(rows)
+
+    def list_created_after(self, bill_id: int, limit: int) -> CreatedBillsPage:
+        with stage("changes_query"):
+            rows = self._session.execute(_BILLS_CREATED_AFTER_STMT, {"after_id": bill_id, "limit": limit}).tuples().all()
+        settled = next((idx for idx, row in enumerate(rows) if not row[5]), len(rows))
+        return CreatedBillsPage(bills=_to_bill_dtos(rows[:settled]), pending=settled < len(rows))
+
+    def list(self, issued_from: Optional[date] = None, issued_to: Optional[date] = None) -> list[BillDto]:
+        if issued_from is None and issued_to is None:
+            stmt = _LIST_BILLS_STMT
+        else:
+            stmt = _list_bills_stmt(issued_from, issued_to)
+        with stage("list_query"):
+            rows = self._session.execute(stmt).tuples().all()
+        return _to_bill_dtos(rows)
+
+    def get_detail(self, bill_id: int) -> Optional[BillDetailDto]:
+        with stage("detail_query"):
+            rows = self._session.execute(_BILL_DETAIL_STMT, {"bill_id": bill_id}).tuples().all()
+        if not rows:
+            return None
+        header = rows[0]
+        lines = [
+            BillLineDto(
+                line_no=row[6],
+                concept=row[7],
+                quantity=float(row[8]),
+                unit_amount=float(row[9]),
+                line_amount=float(row[10]),
             )
             for row in rows
+            if row[6] is not None
         ]
+        # Same subtotal as _TOTAL_EXPR: the sum of the line amounts.
+        subtotal = sum((row[10] for row in rows if row[6] is not None), Decimal("0"))
+        return BillDetailDto(
+            id=header[0],
+            bill_number=header[1],
+            issued_at=header[2],
+            customer_name=header[3],
+            currency=header[4],
+            subtotal=float(subtotal),
+            tax=float(header[5]),
+            total=float(subtotal + header[5]),
+            lines=lines,
+            version=header[11],
+        )
+
+    def get_version(self, bill_id: int) -> Optional[int]:
+        with stage("version_query"):
+            return self._session.execute(_BILL_VERSION_STMT, {"bill_id": bill_id}).scalar_one_or_none()
 
     def exists_by_bill_number(self, bill_number: str) -> bool:
         stmt = select(BillModel.id).where(BillModel.bill_number == bill_number).limit(1)
-        return self._session.execute(stmt).first() is not None
+        with stage("exists_by_bill_number"):
+            return self._session.execute(stmt).first() is not None
 
     def create(self, new_bill: NewBill) -> int:
         try:
-            bill_row = BillModel(
-                bill_number=new_bill.bill_number,
-                issued_at=new_bill.issued_at,
-                customer_name=new_bill.customer_name,
-                subtotal=new_bill.subtotal,
-                tax=new_bill.tax,
-                currency=new_bill.currency,
-            )
-
-            self._session.add(bill_row)
-            self._session.flush()
-
-            line_rows = [
-                BillLineModel(
-                    bill_id=bill_row.id,
-                    line_no=idx,
-                    concept=line.concept,
-                    quantity=line.quantity,
-                    unit_amount=line.unit_amount,
-                    line_amount=line.line_amount,
+            with stage("insert_flush"):
+                bill_row = BillModel(
+                    bill_number=new_bill.bill_number,
+                    issued_at=new_bill.issued_at,
+                    customer_name=new_bill.customer_name,
+                    subtotal=new_bill.subtotal,
+                    tax=new_bill.tax,
+                    currency=new_bill.currency,
                 )
-                for idx, line in enumerate(new_bill.lines, start=1)
-            ]
-            self._session.add_all(line_rows)
-            self._session.commit()
+
+                self._session.add(bill_row)
+                self._session.flush()
+
+                partition_key = {"issued_at": new_bill.issued_at} if PARTITIONED_BILLS else {}
+                line_rows = [
+                    BillLineModel(
+                        bill_id=bill_row.id,
+                        line_no=idx,
+                        concept=line.concept,
+                        quantity=line.quantity,
+                        unit_amount=line.unit_amount,
+                        line_amount=line.line_amount,
+                        **partition_key,
+                    )
+                    for idx, line in enumerate(new_bill.lines, start=1)
+                ]
+                self._session.add_all(line_rows)
+            with stage("commit"):
+                self._session.commit()
             return int(bill_row.id)
         except Exception:
             self._session.rollback()
@@ -1,31 +1,61 @@
 from datetime import date
 from decimal import Decimal
+import hmac
 import os
-from contextlib import asynccontextmanager
-from typing import Optional
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Iterator, Optional, Union
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Header, Path, Query, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
 import pika
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel, TypeAdapter, field_serializer
 from psycopg_pool import ConnectionPool
 
+from app.application.bills.ports.integration_event_publisher import IntegrationEventPublisher
 from app.application.bills.use_cases.create_bill import (
     CreateBillCommand,
     CreateBillLineCommand,
     CreateBillUseCase,
 )
+from app.application.bills.use_cases.get_bill_detail import GetBillDetailUseCase
+from app.application.bills.use_cases.list_bill_changes import BillChanges, ListBillChangesUseCase
 from app.application.bills.use_cases.list_bills import ListBillsUseCase
-from app.application.common.exceptions import ConflictError
+from app.application.bills.use_cases.lookup_bills import LookupBillsUseCase
+from app.application.common.exceptions import ConflictError, NotFoundError
 from app.domain.common.exceptions import DomainValidationError
+from app.infrastructure.diagnostics.sampling_profiler import (
+    ProfilerBusyError,
+    ProfilerRouteMiddleware,
+    SamplingProfiler,
+)
+from app.infrastructure.diagnostics.slow_query_log import SlowQueryObserver
+from app.infrastructure.diagnostics.stage_metrics import StageMetrics, StageTimingMiddleware, stage
+from app.infrastructure.messaging.change_notifier import BillChangeNotifier
 from app.infrastructure.messaging.rabbitmq_publisher import RabbitMqIntegrationEventPublisher
-from app.infrastructure.persistence.db import create_session
+from app.infrastructure.messaging.spool_publisher import SpoolFileEventPublisher
+from app.infrastructure.persistence.change_listener import PostgresChangeListener
+from app.infrastructure.persistence.db import create_session, get_engine
+from app.infrastructure.persistence.in_memory import InMemoryBillRepository
 from app.infrastructure.persistence.repositories import SqlAlchemyBillRepository
+from app.presentation.body_cache import LruBodyCache
+from app.presentation.compression import CompressedBodyCache
 from app.presentation.schemas import (
+    BillChangesResponse,
+    BillDetailResponse,
+    BillLineResponse,
+    BillLookupItemResponse,
+    BillLookupRequest,
+    BillLookupResponse,
     BillResponse as DddBillResponse,
+    CacheFlushResponse,
     CreateBillRequest,
     CreateBillResponse,
+    MAX_BILL_ID,
+    SlowQueryResponse,
 )
 
 
@@ -41,8 +71,33 @@ class MinimalBillResponse(BaseModel):
         return float(value)
 
 
+_MINIMAL_BILLS_ADAPTER = TypeAdapter(list[MinimalBillResponse])
+_DDD_BILLS_ADAPTER = TypeAdapter(list[DddBillResponse])
+_BILL_DETAIL_ADAPTER = TypeAdapter(BillDetailResponse)
+_BILL_LOOKUP_ADAPTER = TypeAdapter(BillLookupResponse)
+_BILL_CHANGES_ADAPTER = TypeAdapter(BillChangesResponse)
+
 minimal_pool: Optional[ConnectionPool] = None
-event_publisher: Optional[RabbitMqIntegrationEventPublisher] = None
+event_publisher: Optional[IntegrationEventPublisher] = None
+# Set together with event_publisher by service-free harnesses (benchmarks/asgi_load.py): the bill routes then use
+# this store and the lifespan opens no pool, broker connection or slow-query observer.
+in_memory_repository: Optional[InMemoryBillRepository] = None
+profiler = SamplingProfiler()
+stage_metrics = StageMetrics()
+slow_query_observer: Optional[SlowQueryObserver] = None
+list_body_cache = CompressedBodyCache(
+    min_size_bytes=int(os.getenv("PY_COMPRESSION_MIN_SIZE_BYTES", "1024")),
+    gzip_level=int(os.getenv("PY_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("PY_BROTLI_QUALITY", "5")),
+)
+stage_metrics.add_collector(list_body_cache.metrics_lines)
+# Rendered detail bodies, keyed by bill id and row version: bills are immutable once created, but a dataset reset or
+# benchmark cleanup can delete them or reload their ids with other bills, which changes the version.
+bill_detail_cache = LruBodyCache("bill_detail", max_entries=int(os.getenv("PY_BILL_DETAIL_CACHE_SIZE", "10000")))
+stage_metrics.add_collector(bill_detail_cache.metrics_lines)
+bill_change_notifier = BillChangeNotifier()
+stage_metrics.add_collector(bill_change_notifier.metrics_lines)
+change_listener: Optional[PostgresChangeListener] = None
 
 
 def _conninfo() -> str:
@@ -60,18 +115,65 @@ def _get_minimal_pool() -> ConnectionPool:
     return minimal_pool
 
 
-def _get_event_publisher() -> RabbitMqIntegrationEventPublisher:
+def _get_event_publisher() -> IntegrationEventPublisher:
     if event_publisher is None:
         raise RuntimeError("Event publisher is not initialized.")
     return event_publisher
 
 
+def _build_publisher_fallback() -> Optional[SpoolFileEventPublisher]:
+    spool_path = os.getenv("RABBITMQ_FALLBACK_SPOOL_PATH", "")
+    if not spool_path:
+        return None
+    return SpoolFileEventPublisher(spool_path)
+
+
+def _publisher_metrics() -> list[str]:
+    return event_publisher.metrics_lines() if isinstance(event_publisher, RabbitMqIntegrationEventPublisher) else []
+
+
+def _change_listener_metrics() -> list[str]:
+    return change_listener.metrics_lines() if change_listener is not None else []
+
+
+stage_metrics.add_collector(_publisher_metrics)
+stage_metrics.add_collector(_change_listener_metrics)
+
+
+def _register_profiled_routes() -> None:
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            profiler.register_endpoint(route.endpoint, f"{','.join(sorted(route.methods))} {route.path}")
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    global minimal_pool, event_publisher
+    global minimal_pool, event_publisher, slow_query_observer, change_listener
+    if in_memory_repository is not None:
+        _register_profiled_routes()
+        yield
+        return
+    slow_query_observer = SlowQueryObserver(
+        conninfo=_conninfo(),
+        threshold_ms=float(os.getenv("PY_SLOW_QUERY_THRESHOLD_MS", "250")),
+        buffer_size=int(os.getenv("PY_SLOW_QUERY_BUFFER_SIZE", "50")),
+        explain_enabled=os.getenv("PY_SLOW_QUERY_EXPLAIN", "1") == "1",
+        explain_interval_sec=float(os.getenv("PY_SLOW_QUERY_EXPLAIN_INTERVAL_SEC", "60")),
+    )
+    slow_query_observer.attach_engine(get_engine())
+    pool_kwargs = {"cursor_factory": slow_query_observer.cursor_factory} if slow_query_observer.enabled else None
     min_size = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1"))
     max_size = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10"))
-    minimal_pool = ConnectionPool(conninfo=_conninfo(), min_size=min_size, max_size=max_size, open=False)
+    minimal_pool = ConnectionPool(
+        conninfo=_conninfo(),
+        min_size=min_size,
+        max_size=max_size,
+        kwargs=pool_kwargs,
+        # Like pool_pre_ping on the SQLAlchemy engine: connections killed by a template restore
+        # (benchmark-client/dataset_reset.py) are replaced on checkout instead of failing a request.
+        check=ConnectionPool.check_connection,
+        open=False,
+    )
     minimal_pool.open(wait=True)
     event_publisher = RabbitMqIntegrationEventPublisher(
         host=os.getenv("RABBITMQ_HOST", "localhost"),
@@ -80,16 +182,36 @@ async def lifespan(_: FastAPI):
         password=os.getenv("RABBITMQ_PASSWORD", "guest"),
         vhost=os.getenv("RABBITMQ_VHOST", "/"),
         queue_name=os.getenv("RABBITMQ_BILL_CREATED_QUEUE", "bill-created"),
+        connect_timeout_sec=float(os.getenv("RABBITMQ_CONNECT_TIMEOUT_SEC", "5")),
+        backoff_initial_sec=float(os.getenv("RABBITMQ_RECONNECT_BACKOFF_INITIAL_SEC", "0.5")),
+        backoff_max_sec=float(os.getenv("RABBITMQ_RECONNECT_BACKOFF_MAX_SEC", "30")),
+        fallback=_build_publisher_fallback(),
+        envelope_format=os.getenv("RABBITMQ_ENVELOPE_FORMAT", "json"),
+        max_batch_events=int(os.getenv("RABBITMQ_MAX_BATCH_EVENTS", "500")),
     )
+    event_publisher.start()
+    if os.getenv("PY_CHANGE_FEED_LISTEN", "0") == "1":
+        change_listener = PostgresChangeListener(
+            conninfo=_conninfo(),
+            channel=os.getenv("PY_CHANGE_FEED_CHANNEL", "bill_created"),
+            on_notify=bill_change_notifier.notify,
+        )
+        change_listener.start()
+    _register_profiled_routes()
     try:
         yield
     finally:
+        if change_listener is not None:
+            change_listener.close()
         if event_publisher is not None:
             event_publisher.close()
         minimal_pool.close()
+        slow_query_observer.close()
 
 
 app = FastAPI(title="python-bills-api", lifespan=lifespan)
+app.add_middleware(ProfilerRouteMiddleware, profiler=profiler)
+app.add_middleware(StageTimingMiddleware, metrics=stage_metrics)
 
 
 @app.get("/")
@@ -129,6 +251,16 @@ def conflict_exception_handler(_: Request, exc: ConflictError) -> JSONResponse:
     return _problem(409, str(exc))
 
 
+@app.exception_handler(NotFoundError)
+def not_found_exception_handler(_: Request, exc: NotFoundError) -> JSONResponse:
+    return _problem(404, str(exc))
+
+
+@app.exception_handler(ProfilerBusyError)
+def profiler_busy_exception_handler(_: Request, exc: ProfilerBusyError) -> JSONResponse:
+    return _problem(409, str(exc))
+
+
 @app.exception_handler(pika.exceptions.AMQPError)
 def rabbitmq_exception_handler(_: Request, exc: pika.exceptions.AMQPError) -> JSONResponse:
     return _problem(503, f"Message broker error: {exc.__class__.__name__}")
@@ -139,8 +271,79 @@ def generic_exception_handler(_: Request, __: Exception) -> JSONResponse:
     return _problem(500, "An unexpected error occurred.")
 
 
+@contextmanager
+def _bill_repository() -> Iterator[Union[SqlAlchemyBillRepository, InMemoryBillRepository]]:
+    if in_memory_repository is not None:
+        yield in_memory_repository
+        return
+    with create_session() as session:
+        with stage("pool_acquire"):
+            session.connection()
+        yield SqlAlchemyBillRepository(session)
+
+
+def _admin_guard(request: Request) -> Optional[JSONResponse]:
+    expected_token = os.getenv("PY_ADMIN_TOKEN", "")
+    if not expected_token:
+        return _problem(404, "Not Found")
+    provided_token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(provided_token.encode("utf-8"), expected_token.encode("utf-8")):
+        return _problem(401, "Invalid admin token.")
+    return None
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(stage_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/admin/profile", response_class=PlainTextResponse)
+def admin_profile(
+    request: Request,
+    seconds: float = Query(default=10.0, gt=0, le=120),
+    hz: float = Query(default=97.0, gt=0, le=1000),
+    include_idle: bool = False,
+):
+    denied = _admin_guard(request)
+    if denied is not None:
+        return denied
+    return PlainTextResponse(profiler.profile(seconds, hz, include_unattributed=include_idle))
+
+
+@app.post("/admin/caches/flush", response_model=CacheFlushResponse)
+def admin_flush_caches(request: Request):
+    denied = _admin_guard(request)
+    if denied is not None:
+        return denied
+    return CacheFlushResponse(billDetailEntries=bill_detail_cache.clear())
+
+
+@app.get("/admin/slow-queries", response_model=list[SlowQueryResponse])
+def admin_slow_queries(request: Request):
+    denied = _admin_guard(request)
+    if denied is not None:
+        return denied
+    records = slow_query_observer.snapshot() if slow_query_observer is not None else []
+    return [
+        SlowQueryResponse(
+            capturedAtUtc=r.captured_at,
+            source=r.source,
+            statement=r.statement,
+            parameters=r.parameters,
+            durationMs=r.duration_ms,
+            rows=r.rows,
+            planStatus=r.plan_status,
+            plan=r.plan,
+        )
+        for r in records
+    ]
+
+
 @app.get("/bills-minimal", response_model=list[MinimalBillResponse])
-def get_bills_minimal() -> list[MinimalBillResponse]:
+def get_bills_minimal(
+    accept_encoding: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
     sql = """
         SELECT b.id,
                b.bill_number,
@@ -153,47 +356,239 @@ def get_bills_minimal() -> list[MinimalBillResponse]:
         ORDER BY b.id;
     """
     pool = _get_minimal_pool()
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql)
-            rows = cur.fetchall()
-
-    return [
-        MinimalBillResponse(
-            id=row[0],
-            billNumber=row[1],
-            issuedAt=row[2],
-            total=row[3],
-            currency=row[4],
+    with stage("pool_acquire"):
+        conn = pool.getconn()
+    try:
+        with conn:
+            with stage("list_query"), conn.cursor() as cur:
+                cur.execute(sql)
+                rows = cur.fetchall()
+    finally:
+        pool.putconn(conn)
+
+    with stage("render"):
+        body = _MINIMAL_BILLS_ADAPTER.dump_json(
+            [
+                MinimalBillResponse(
+                    id=row[0],
+                    billNumber=row[1],
+                    issuedAt=row[2],
+                    total=row[3],
+                    currency=row[4],
+                )
+                for row in rows
+            ]
         )
-        for row in rows
-    ]
+    with stage("compress"):
+        return list_body_cache.respond("bills-minimal", body, accept_encoding, if_none_match)
 
 
 @app.get("/bills", response_model=list[DddBillResponse])
-def get_bills() -> list[DddBillResponse]:
-    with create_session() as session:
-        repository = SqlAlchemyBillRepository(session)
+def get_bills(
+    issued_from: Optional[date] = Query(default=None, alias="issuedFrom"),
+    issued_to: Optional[date] = Query(default=None, alias="issuedTo"),
+    accept_encoding: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    if issued_from is not None and issued_to is not None and issued_from > issued_to:
+        return _problem(400, "Validation failed", {"issuedFrom": ["issuedFrom must not be after issuedTo."]})
+    with _bill_repository() as repository:
         use_case = ListBillsUseCase(repository)
-        bills = use_case.execute()
+        bills = use_case.execute(issued_from, issued_to)
+
+    with stage("render"):
+        body = _DDD_BILLS_ADAPTER.dump_json(
+            [
+                DddBillResponse(
+                    id=b.id,
+                    billNumber=b.bill_number,
+                    issuedAt=b.issued_at,
+                    total=b.total,
+                    currency=b.currency,
+                )
+                for b in bills
+            ]
+        )
+    with stage("compress"):
+        # Filtered lists share one cache entry, so arbitrary date ranges cannot grow the cache.
+        cache_key = "bills" if issued_from is None and issued_to is None else "bills-filtered"
+        return list_body_cache.respond(cache_key, body, accept_encoding, if_none_match)
+
+
+def _read_bill_changes(since: int, limit: int) -> BillChanges:
+    with _bill_repository() as repository:
+        use_case = ListBillChangesUseCase(repository)
+        return use_case.execute(since, limit)
+
+
+def _render_bill_changes(changes: BillChanges) -> bytes:
+    return _BILL_CHANGES_ADAPTER.dump_json(
+        BillChangesResponse(
+            cursor=changes.cursor,
+            hasMore=changes.has_more,
+            bills=[
+                DddBillResponse(
+                    id=b.id,
+                    billNumber=b.bill_number,
+                    issuedAt=b.issued_at,
+                    total=b.total,
+                    currency=b.currency,
+                )
+                for b in changes.bills
+            ],
+        )
+    )
 
-    return [
-        DddBillResponse(
-            id=b.id,
-            billNumber=b.bill_number,
-            issuedAt=b.issued_at,
-            total=b.total,
-            currency=b.currency,
+
+# Held-back (pending) bills settle when an older transaction ends, which sends no notification, so waiters re-check
+# on this interval while any are pending.
+_CHANGE_FEED_PENDING_RECHECK_SEC = 0.2
+
+
+# Registered before /bills/{bill_id}, which would otherwise match /bills/changes.
+@app.get("/bills/changes", response_model=BillChangesResponse)
+async def get_bill_changes(
+    since: int = Query(default=0, ge=0, le=MAX_BILL_ID),
+    limit: int = Query(default=500, gt=0, le=5000),
+    wait_sec: float = Query(default=0.0, ge=0, le=60, alias="waitSec"),
+) -> Response:
+    deadline = time.monotonic() + wait_sec
+    while True:
+        seen_version = bill_change_notifier.version
+        changes = await run_in_threadpool(_read_bill_changes, since, limit)
+        remaining_sec = deadline - time.monotonic()
+        if changes.bills or remaining_sec <= 0:
+            break
+        if changes.pending:
+            await bill_change_notifier.wait(seen_version, min(remaining_sec, _CHANGE_FEED_PENDING_RECHECK_SEC))
+        elif not await bill_change_notifier.wait(seen_version, remaining_sec):
+            break
+
+    with stage("render"):
+        body = _render_bill_changes(changes)
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/bills/changes/stream")
+async def stream_bill_changes(
+    since: Optional[int] = Query(default=None, ge=0, le=MAX_BILL_ID),
+    limit: int = Query(default=500, gt=0, le=5000),
+    last_event_id: Optional[str] = Header(default=None),
+) -> Response:
+    # Reconnecting EventSource clients resume from the id of the last event they received.
+    if since is None and last_event_id is not None:
+        if not last_event_id.isdigit() or int(last_event_id) > MAX_BILL_ID:
+            return _problem(400, "Validation failed", {"Last-Event-ID": ["Last-Event-ID must be a bill cursor."]})
+        since = int(last_event_id)
+    heartbeat_sec = float(os.getenv("PY_CHANGE_FEED_HEARTBEAT_SEC", "15"))
+
+    async def events():
+        cursor = since or 0
+        yield b"retry: 2000\n\n"
+        last_sent = time.monotonic()
+        while True:
+            seen_version = bill_change_notifier.version
+            changes = await run_in_threadpool(_read_bill_changes, cursor, limit)
+            if changes.bills:
+                cursor = changes.cursor
+                yield b"id: %d\nevent: bills\ndata: %s\n\n" % (cursor, _render_bill_changes(changes))
+                last_sent = time.monotonic()
+                continue
+            idle_sec = time.monotonic() - last_sent
+            if idle_sec >= heartbeat_sec:
+                yield b": keep-alive\n\n"
+                last_sent, idle_sec = time.monotonic(), 0.0
+            wait_sec = heartbeat_sec - idle_sec
+            if changes.pending:
+                wait_sec = min(wait_sec, _CHANGE_FEED_PENDING_RECHECK_SEC)
+            await bill_change_notifier.wait(seen_version, wait_sec)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/bills/lookup", response_model=BillLookupResponse)
+def lookup_bills(request: BillLookupRequest) -> Response:
+    with _bill_repository() as repository:
+        use_case = LookupBillsUseCase(repository)
+        if request.ids is not None:
+            items = use_case.by_ids(request.ids)
+        else:
+            items = use_case.by_bill_numbers([number.strip() for number in request.billNumbers])
+
+    with stage("render"):
+        found = sum(1 for item in items if item.bill is not None)
+        body = _BILL_LOOKUP_ADAPTER.dump_json(
+            BillLookupResponse(
+                found=found,
+                missing=len(items) - found,
+                items=[
+                    BillLookupItemResponse(
+                        key=item.key,
+                        found=item.bill is not None,
+                        bill=(
+                            DddBillResponse(
+                                id=item.bill.id,
+                                billNumber=item.bill.bill_number,
+                                issuedAt=item.bill.issued_at,
+                                total=item.bill.total,
+                                currency=item.bill.currency,
+                            )
+                            if item.bill is not None
+                            else None
+                        ),
+                    )
+                    for item in items
+                ],
+            )
         )
-        for b in bills
-    ]
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/bills/{bill_id}", response_model=BillDetailResponse)
+def get_bill(bill_id: int = Path(le=MAX_BILL_ID)) -> Response:
+    with _bill_repository() as repository:
+        # A primary-key lookup of the version, instead of the bill and lines query plus rendering.
+        version = repository.get_version(bill_id)
+        body = bill_detail_cache.get((bill_id, version)) if version is not None else None
+        if body is None:
+            use_case = GetBillDetailUseCase(repository)
+            bill = use_case.execute(bill_id)
+    if body is None:
+        with stage("render"):
+            body = _BILL_DETAIL_ADAPTER.dump_json(
+                BillDetailResponse(
+                    id=bill.id,
+                    billNumber=bill.bill_number,
+                    issuedAt=bill.issued_at,
+                    customerName=bill.customer_name,
+                    currency=bill.currency,
+                    subtotal=bill.subtotal,
+                    tax=bill.tax,
+                    total=bill.total,
+                    lines=[
+                        BillLineResponse(
+                            lineNo=line.line_no,
+                            concept=line.concept,
+                            quantity=line.quantity,
+                            unitAmount=line.unit_amount,
+                            lineAmount=line.line_amount,
+                        )
+                        for line in bill.lines
+                    ],
+                )
+            )
+        bill_detail_cache.put((bill.id, bill.version), body)
+    return Response(content=body, media_type="application/json")
 
 
 @app.post("/bills", response_model=CreateBillResponse, status_code=201)
 def create_bill(request: CreateBillRequest) -> CreateBillResponse:
-    with create_session() as session:
-        repository = SqlAlchemyBillRepository(session)
-        use_case = CreateBillUseCase(repository, _get_event_publisher())
+    with _bill_repository() as repository:
+        use_case = CreateBillUseCase(repository, _get_event_publisher(), on_created=[bill_change_notifier.notify])
         command = CreateBillCommand(
             bill_number=request.billNumber,
             issued_at=request.issuedAt,
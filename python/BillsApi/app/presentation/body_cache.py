@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+# Bounded LRU of rendered response bodies, for resources that never change once created.
+class LruBodyCache:
+    def __init__(self, name: str, max_entries: int) -> None:
+        self._name = name
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size_bytes = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= len(previous)
+            self._entries[key] = body
+            self._size_bytes += len(body)
+            while len(self._entries) > self._max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._size_bytes = 0
+            return dropped
+
+    def metrics_lines(self) -> list[str]:
+        with self._lock:
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+            entries, size_bytes = len(self._entries), self._size_bytes
+        lookups = hits + misses
+        prefix = f"bills_api_{self._name}_cache"
+        return [
+            f"# HELP {prefix}_total {self._name} body cache lookups.",
+            f"# TYPE {prefix}_total counter",
+            f'{prefix}_total{{result="hit"}} {hits}',
+            f'{prefix}_total{{result="miss"}} {misses}',
+            f"# HELP {prefix}_hit_ratio Share of {self._name} body cache lookups served from the cache.",
+            f"# TYPE {prefix}_hit_ratio gauge",
+            f"{prefix}_hit_ratio {hits / lookups if lookups else 0.0:.4f}",
+            f"# HELP {prefix}_evictions_total {self._name} bodies evicted to stay within the size limit.",
+            f"# TYPE {prefix}_evictions_total counter",
+            f"{prefix}_evictions_total {evictions}",
+            f"# HELP {prefix}_entries {self._name} bodies currently cached.",
+            f"# TYPE {prefix}_entries gauge",
+            f"{prefix}_entries {entries}",
+            f"# HELP {prefix}_bytes Total size of the cached {self._name} bodies.",
+            f"# TYPE {prefix}_bytes gauge",
+            f"{prefix}_bytes {size_bytes}",
+        ]
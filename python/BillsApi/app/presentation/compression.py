@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import threading
+from typing import Optional
+
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+_SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value.strip())
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    selected: Optional[str] = None
+    selected_weight = 0.0
+    for encoding in _SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > selected_weight:
+            selected, selected_weight = encoding, weight
+    return selected
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def _etag_matches(if_none_match: str, digest: str) -> bool:
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == f'"{digest}"':
+            return True
+    return False
+
+
+class _CachedVariants:
+    __slots__ = ("digest", "bodies")
+
+    def __init__(self, digest: str) -> None:
+        self.digest = digest
+        self.bodies: dict[str, bytes] = {}
+
+
+class CompressedBodyCache:
+    def __init__(self, min_size_bytes: int = 1024, gzip_level: int = 6, brotli_quality: int = 5) -> None:
+        self._min_size_bytes = min_size_bytes
+        self._gzip_level = gzip_level
+        self._brotli_quality = brotli_quality
+        self._lock = threading.Lock()
+        self._entries: dict[str, _CachedVariants] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def respond(
+        self,
+        key: str,
+        body: bytes,
+        accept_encoding: Optional[str],
+        if_none_match: Optional[str] = None,
+        media_type: str = "application/json",
+    ) -> Response:
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        headers = {"ETag": f'W/"{digest}"', "Vary": "Accept-Encoding"}
+        if if_none_match and _etag_matches(if_none_match, digest):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(accept_encoding) if len(body) >= self._min_size_bytes else None
+        if encoding is None:
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        headers["Content-Encoding"] = encoding
+        return Response(content=self._variant(key, digest, body, encoding), media_type=media_type, headers=headers)
+
+    def _variant(self, key: str, digest: str, body: bytes, encoding: str) -> bytes:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.digest == digest:
+                compressed = entry.bodies.get(encoding)
+                if compressed is not None:
+                    self.hits += 1
+                    return compressed
+        compressed = compress_body(body, encoding, self._gzip_level, self._brotli_quality)
+        with self._lock:
+            self.misses += 1
+            entry = self._entries.get(key)
+            if entry is None or entry.digest != digest:
+                entry = _CachedVariants(digest)
+                self._entries[key] = entry
+            entry.bodies[encoding] = compressed
+        return compressed
+
+    def metrics_lines(self) -> list[str]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return [
+            "# HELP bills_api_compressed_body_cache_total Compressed list body cache lookups.",
+            "# TYPE bills_api_compressed_body_cache_total counter",
+            f'bills_api_compressed_body_cache_total{{result="hit"}} {hits}',
+            f'bills_api_compressed_body_cache_total{{result="miss"}} {misses}',
+        ]
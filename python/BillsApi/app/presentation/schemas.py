@@ -1,4 +1,5 @@
-from datetime import date
+from datetime import date, datetime
+from typing import Annotated, Optional, Union
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -11,6 +12,62 @@ class BillResponse(BaseModel):
     currency: str
 
 
+MAX_BILL_LOOKUP_KEYS = 5000
+# bill.id is a BIGINT; larger ids are rejected up front instead of failing in the driver.
+MAX_BILL_ID = 2**63 - 1
+
+
+class BillLookupRequest(BaseModel):
+    ids: Optional[list[Annotated[int, Field(ge=1, le=MAX_BILL_ID)]]] = Field(
+        default=None, min_length=1, max_length=MAX_BILL_LOOKUP_KEYS
+    )
+    billNumbers: Optional[list[str]] = Field(default=None, min_length=1, max_length=MAX_BILL_LOOKUP_KEYS)
+
+    @model_validator(mode="after")
+    def require_one_key_kind(self) -> "BillLookupRequest":
+        if (self.ids is None) == (self.billNumbers is None):
+            raise ValueError("Send either ids or billNumbers.")
+        return self
+
+
+class BillLookupItemResponse(BaseModel):
+    key: Union[int, str]
+    found: bool
+    bill: Optional[BillResponse]
+
+
+class BillLookupResponse(BaseModel):
+    found: int
+    missing: int
+    items: list[BillLookupItemResponse]
+
+
+class BillChangesResponse(BaseModel):
+    cursor: int
+    hasMore: bool
+    bills: list[BillResponse]
+
+
+class BillLineResponse(BaseModel):
+    lineNo: int
+    concept: str
+    quantity: float
+    unitAmount: float
+    lineAmount: float
+
+
+class BillDetailResponse(BaseModel):
+    id: int
+    billNumber: str
+    issuedAt: date
+    customerName: str
+    currency: str
+    subtotal: float
+    tax: float
+    total: float
+    lines: list[BillLineResponse]
+
+
 class CreateBillLineRequest(BaseModel):
     concept: str = Field(min_length=1, max_length=200)
     quantity: float = Field(gt=0)
@@ -39,3 +96,18 @@ class CreateBillResponse(BaseModel):
     tax: float
     total: float
     currency: str
+
+
+class CacheFlushResponse(BaseModel):
+    billDetailEntries: int
+
+
+class SlowQueryResponse(BaseModel):
+    capturedAtUtc: datetime
+    source: str
+    statement: str
+    parameters: str
+    durationMs: float
+    rows: int
+    planStatus: str
+    plan: Optional[str]
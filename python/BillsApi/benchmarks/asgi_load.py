@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app import main as api
+from app.domain.bills.entities import BillLineDraft, NewBill
+from app.infrastructure.messaging.null_publisher import NullIntegrationEventPublisher
+from app.infrastructure.persistence.in_memory import InMemoryBillRepository
+
+
+CONCEPTS = ["Cloud Hosting", "API Requests", "Data Processing", "Consulting Hours", "Support Plan"]
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    expected_status: int
+    # Returns the request body for the n-th request, or None for requests without one.
+    body_for: Callable[[int], Optional[bytes]]
+
+
+@dataclass
+class Response:
+    status: int = 0
+    body_bytes: int = 0
+
+
+def seeded_repository(bills: int, lines: int) -> InMemoryBillRepository:
+    repository = InMemoryBillRepository()
+    start = date(2026, 1, 1)
+    for idx in range(1, bills + 1):
+        drafts = [
+            BillLineDraft.create(CONCEPTS[(idx + line) % len(CONCEPTS)], Decimal("2"), Decimal("125.50"))
+            for line in range(lines)
+        ]
+        repository.create(
+            NewBill.create(f"SEED-{idx:07d}", start - timedelta(days=idx % 180), "Acme Corp", "USD", Decimal("12.50"), drafts)
+        )
+    return repository
+
+
+def create_bill_body(lines: int) -> Callable[[int], Optional[bytes]]:
+    line_payloads = [
+        {"concept": CONCEPTS[line % len(CONCEPTS)], "quantity": 2, "unitAmount": 125.5} for line in range(lines)
+    ]
+
+    def body_for(n: int) -> bytes:
+        return json.dumps(
+            {
+                "billNumber": f"ASGI-{n:09d}",
+                "issuedAt": "2026-01-01",
+                "customerName": "Acme Corp",
+                "currency": "usd",
+                "tax": 12.5,
+                "lines": line_payloads,
+            }
+        ).encode("utf-8")
+
+    return body_for
+
+
+def build_endpoints(lines: int) -> dict[str, Endpoint]:
+    return {
+        "list": Endpoint("GET /bills", "GET", "/bills", 200, lambda _: None),
+        "create": Endpoint("POST /bills", "POST", "/bills", 201, create_bill_body(lines)),
+    }
+
+
+def http_scope(method: str, path: str, body: Optional[bytes]) -> dict[str, Any]:
+    headers = [(b"host", b"asgi-load")]
+    if body is not None:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("ascii"))]
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("asgi-load", 80),
+        "state": {},
+    }
+
+
+async def call(app: Any, method: str, path: str, body: Optional[bytes]) -> Response:
+    response = Response()
+    complete = asyncio.Event()
+    body_sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body or b"", "more_body": False}
+        # Nothing more to read; report a disconnect only once the response is out, as a server would.
+        await complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            response.status = message["status"]
+        elif message["type"] == "http.response.body":
+            response.body_bytes += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                complete.set()
+
+    await app(http_scope(method, path, body), receive, send)
+    complete.set()
+    return response
+
+
+@asynccontextmanager
+async def lifespan(app: Any) -> AsyncIterator[None]:
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, inbox.get, outbox.put))
+    await inbox.put({"type": "lifespan.startup"})
+    message = await outbox.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise SystemExit(f"Application startup failed: {message.get('message', '')}")
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+
+async def drive(app: Any, endpoint: Endpoint, requests: int, concurrency: int, counter: Any) -> dict[str, Any]:
+    latencies_us: list[float] = []
+    failures = 0
+    statuses: dict[int, int] = {}
+    body_bytes = 0
+    remaining = itertools.count()
+
+    async def worker() -> None:
+        nonlocal failures, body_bytes
+        while next(remaining) < requests:
+            body = endpoint.body_for(next(counter))
+            started = time.perf_counter()
+            response = await call(app, endpoint.method, endpoint.path, body)
+            latencies_us.append((time.perf_counter() - started) * 1_000_000)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+            body_bytes += response.body_bytes
+            if response.status != endpoint.expected_status:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_sec = time.perf_counter() - started
+    latencies_us.sort()
+    return {
+        "requests": requests,
+        "failures": failures,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "wall_sec": round(wall_sec, 4),
+        "req_per_sec": round(requests / wall_sec, 1) if wall_sec > 0 else 0.0,
+        "latency_us": {
+            "mean": round(statistics.mean(latencies_us), 1),
+            "p50": round(latencies_us[len(latencies_us) // 2], 1),
+            "p99": round(latencies_us[min(len(latencies_us) - 1, int(len(latencies_us) * 0.99))], 1),
+        },
+        "avg_response_bytes": round(body_bytes / requests, 1),
+    }
+
+
+async def measure_allocations(app: Any, endpoint: Endpoint, requests: int, counter: Any) -> dict[str, Any]:
+    # Python has no allocation counter, so report what tracemalloc can see per request: the peak of memory allocated
+    # while it runs, plus the blocks still held once the whole batch is done (store growth, caches, leaks).
+    peaks = []
+    tracemalloc.start()
+    try:
+        # Both snapshots are taken while tracing, so only blocks allocated during the batch and still alive count.
+        before = tracemalloc.take_snapshot()
+        for _ in range(requests):
+            body = endpoint.body_for(next(counter))
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await call(app, endpoint.method, endpoint.path, body)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "requests": requests,
+        "peak_kib_per_request": {
+            "median": round(statistics.median(peaks) / 1024, 2),
+            "max": round(max(peaks) / 1024, 2),
+        },
+        "retained_blocks_per_request": round(retained_blocks / requests, 1),
+    }
+
+
+async def run_endpoint(args: argparse.Namespace, endpoint: Endpoint) -> dict[str, Any]:
+    # Every endpoint starts from the same store, so POST runs do not inflate the next GET /bills.
+    api.in_memory_repository = seeded_repository(args.bills, args.lines)
+    api.event_publisher = NullIntegrationEventPublisher()
+    api.bill_detail_cache.clear()
+    counter = itertools.count(1)
+    if args.warmup_requests > 0:
+        await drive(api.app, endpoint, args.warmup_requests, args.concurrency, counter)
+    result = await drive(api.app, endpoint, args.requests, args.concurrency, counter)
+    if args.alloc_requests > 0:
+        result["allocations"] = await measure_allocations(api.app, endpoint, args.alloc_requests, counter)
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    endpoints = build_endpoints(args.lines)
+    api.in_memory_repository = InMemoryBillRepository()
+    api.event_publisher = NullIntegrationEventPublisher()
+    results = {}
+    async with lifespan(api.app):
+        for key in args.endpoint:
+            endpoint = endpoints[key]
+            result = await run_endpoint(args, endpoint)
+            results[endpoint.name] = result
+            alloc = result.get("allocations")
+            print(
+                f"{endpoint.name:<12} {result['req_per_sec']:>10.1f} req/s  p50={result['latency_us']['p50']:>9.1f}us "
+                f"p99={result['latency_us']['p99']:>9.1f}us  failures={result['failures']}"
+                + (
+                    f"  alloc={alloc['peak_kib_per_request']['median']:.1f} KiB/req "
+                    f"retained={alloc['retained_blocks_per_request']:.1f} blocks/req"
+                    if alloc
+                    else ""
+                ),
+                flush=True,
+            )
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Drive app.main:app through ASGI with in-memory ports: no sockets, PostgreSQL or RabbitMQ"
+    )
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=["list", "create"],
+        help="Endpoint to load (repeatable): list = GET /bills, create = POST /bills. Default: both",
+    )
+    parser.add_argument("--bills", type=int, default=1000, help="Bills in the in-memory store before every endpoint")
+    parser.add_argument("--lines", type=int, default=3, help="Lines per seeded bill and per POST /bills payload")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per endpoint")
+    parser.add_argument("--warmup-requests", type=int, default=200, help="Unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight at once")
+    parser.add_argument(
+        "--alloc-requests",
+        type=int,
+        default=200,
+        help="Sequential requests traced with tracemalloc after the timed run; 0 skips allocation tracing",
+    )
+    parser.add_argument("--output-json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+    args.endpoint = args.endpoint or ["list", "create"]
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    if args.bills < 0:
+        raise SystemExit("--bills must be 0 or greater")
+    if args.lines <= 0:
+        raise SystemExit("--lines must be greater than 0")
+    if args.requests <= 0:
+        raise SystemExit("--requests must be greater than 0")
+    if args.warmup_requests < 0 or args.alloc_requests < 0:
+        raise SystemExit("--warmup-requests and --alloc-requests must be 0 or greater")
+    if args.concurrency <= 0:
+        raise SystemExit("--concurrency must be greater than 0")
+
+    print(
+        f"Python {platform.python_version()}, {args.bills} seeded bills x {args.lines} lines, "
+        f"concurrency {args.concurrency}"
+    )
+    results = asyncio.run(run(args))
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "bills": args.bills,
+                    "lines": args.lines,
+                    "concurrency": args.concurrency,
+                    "endpoints": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nReport written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+from app.application.bills.dtos import BillDto
+from app.application.bills.use_cases.create_bill import (
+    CreateBillCommand,
+    CreateBillLineCommand,
+    CreateBillUseCase,
+)
+from app.application.bills.use_cases.list_bills import ListBillsUseCase
+from app.domain.bills.entities import BillLineDraft, NewBill
+from app.infrastructure.messaging.envelope import encode_batch_envelope, encode_envelope
+from app.infrastructure.messaging.null_publisher import NullIntegrationEventPublisher
+from app.infrastructure.persistence.in_memory import InMemoryBillRepository
+from app.infrastructure.persistence.repositories import _LIST_BILLS_STMT, SqlAlchemyBillRepository
+from app.main import _DDD_BILLS_ADAPTER, _MINIMAL_BILLS_ADAPTER, DddBillResponse, MinimalBillResponse
+
+
+CONCEPTS = ["Cloud Hosting", "API Requests", "Data Processing", "Consulting Hours", "Support Plan"]
+
+# (case name, parameter name, builder). A builder takes the parameter value and returns the operation to time.
+Case = tuple[str, str, Callable[[int], Callable[[], Any]]]
+
+
+class _ListResult:
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+
+    def tuples(self) -> "_ListResult":
+        return self
+
+    def all(self) -> list[tuple]:
+        return self._rows
+
+
+# Stands in for the SQLAlchemy session so SqlAlchemyBillRepository.list() maps canned _LIST_BILLS_STMT rows.
+class _ListSession:
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+
+    def execute(self, statement: Any) -> _ListResult:
+        if statement is not _LIST_BILLS_STMT:
+            raise AssertionError("Only the list statement is supported.")
+        return _ListResult(self._rows)
+
+
+def list_rows(count: int) -> list[tuple]:
+    rng = random.Random(count)
+    today = date(2026, 1, 1)
+    return [
+        (
+            idx,
+            f"BILL-{idx:04d}",
+            today - timedelta(days=rng.randint(0, 180)),
+            Decimal(rng.randint(10_000, 5_000_000)) / 100,
+            "USD",
+        )
+        for idx in range(1, count + 1)
+    ]
+
+
+def bill_dtos(count: int) -> list[BillDto]:
+    return [
+        BillDto(id=row[0], bill_number=row[1], issued_at=row[2], total=float(row[3]), currency=row[4])
+        for row in list_rows(count)
+    ]
+
+
+def line_commands(count: int) -> list[CreateBillLineCommand]:
+    rng = random.Random(count)
+    return [
+        CreateBillLineCommand(
+            concept=rng.choice(CONCEPTS),
+            quantity=Decimal(str(round(rng.uniform(1.0, 5.0), 2))),
+            unit_amount=Decimal(str(round(rng.uniform(10.0, 500.0), 2))),
+        )
+        for _ in range(count)
+    ]
+
+
+def event_payload(idx: int) -> dict[str, Any]:
+    # Decimal and date values go through _json_default, as they would for a payload built from entities.
+    return {
+        "billId": idx,
+        "billNumber": f"BILL-{idx:04d}",
+        "issuedAt": date(2026, 1, 1),
+        "subtotal": Decimal("1234.50"),
+        "tax": Decimal("98.76"),
+        "total": Decimal("1333.26"),
+        "currency": "USD",
+        "occurredAtUtc": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "source": "python-api",
+    }
+
+
+def build_line_drafts(lines: int) -> Callable[[], Any]:
+    commands = line_commands(lines)
+    return lambda: [BillLineDraft.create(line.concept, line.quantity, line.unit_amount) for line in commands]
+
+
+def build_new_bill(lines: int) -> Callable[[], Any]:
+    commands = line_commands(lines)
+
+    def run() -> Decimal:
+        drafts = [BillLineDraft.create(line.concept, line.quantity, line.unit_amount) for line in commands]
+        new_bill = NewBill.create("BILL-0001", date(2026, 1, 1), "Acme Corp", "usd", Decimal("12.50"), drafts)
+        return new_bill.total
+
+    return run
+
+
+def build_create_use_case(lines: int) -> Callable[[], Any]:
+    commands = line_commands(lines)
+    counter = iter(range(1, sys.maxsize))
+
+    def run() -> Any:
+        # A fresh repository per call keeps the duplicate check and id assignment at constant cost.
+        use_case = CreateBillUseCase(InMemoryBillRepository(), NullIntegrationEventPublisher())
+        return use_case.execute(
+            CreateBillCommand(
+                bill_number=f"BILL-{next(counter)}",
+                issued_at=date(2026, 1, 1),
+                customer_name="Acme Corp",
+                currency="USD",
+                tax=Decimal("12.50"),
+                lines=commands,
+            )
+        )
+
+    return run
+
+
+def build_list_mapping(rows: int) -> Callable[[], Any]:
+    session = _ListSession(list_rows(rows))
+    return lambda: ListBillsUseCase(SqlAlchemyBillRepository(session)).execute()
+
+
+def build_minimal_render(rows: int) -> Callable[[], Any]:
+    data = list_rows(rows)
+    return lambda: _MINIMAL_BILLS_ADAPTER.dump_json(
+        [
+            MinimalBillResponse(id=row[0], billNumber=row[1], issuedAt=row[2], total=row[3], currency=row[4])
+            for row in data
+        ]
+    )
+
+
+def build_ddd_render(rows: int) -> Callable[[], Any]:
+    bills = bill_dtos(rows)
+    return lambda: _DDD_BILLS_ADAPTER.dump_json(
+        [
+            DddBillResponse(id=b.id, billNumber=b.bill_number, issuedAt=b.issued_at, total=b.total, currency=b.currency)
+            for b in bills
+        ]
+    )
+
+
+def build_json_envelopes(events: int) -> Callable[[], Any]:
+    payloads = [event_payload(idx) for idx in range(events)]
+    return lambda: [encode_envelope("bill.created", payload) for payload in payloads]
+
+
+def build_msgpack_batch(events: int) -> Callable[[], Any]:
+    payloads = [event_payload(idx) for idx in range(events)]
+    return lambda: encode_batch_envelope("bill.created", payloads)
+
+
+CASES: list[Case] = [
+    ("domain.bill_line_draft_create", "lines", build_line_drafts),
+    ("domain.new_bill_create", "lines", build_new_bill),
+    ("application.create_bill_use_case", "lines", build_create_use_case),
+    ("persistence.list_row_mapping", "rows", build_list_mapping),
+    ("presentation.minimal_response_render", "rows", build_minimal_render),
+    ("presentation.ddd_response_render", "rows", build_ddd_render),
+    ("messaging.json_envelopes", "events", build_json_envelopes),
+    ("messaging.msgpack_batch_envelope", "events", build_msgpack_batch),
+]
+
+
+def measure(operation: Callable[[], Any], repeat: int, min_time_sec: float) -> dict[str, float]:
+    timer = timeit.Timer(operation)
+    loops, elapsed = timer.autorange()
+    # autorange settles on a loop count taking at least 0.2s; rescale it to --min-time-sec per repetition.
+    loops = max(1, int(loops * min_time_sec / elapsed)) if elapsed > 0 else loops
+    per_op_us = [total / loops * 1_000_000 for total in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "loops": loops,
+        "best_us": round(min(per_op_us), 3),
+        "median_us": round(statistics.median(per_op_us), 3),
+        "stdev_us": round(statistics.stdev(per_op_us), 3) if len(per_op_us) > 1 else 0.0,
+    }
+
+
+def run_suite(sizes: dict[str, list[int]], name_filter: Optional[str], repeat: int, min_time_sec: float) -> dict:
+    results = {}
+    for name, parameter, builder in CASES:
+        for value in sizes[parameter]:
+            key = f"{name}[{parameter}={value}]"
+            if name_filter and name_filter not in key:
+                continue
+            result = measure(builder(value), repeat, min_time_sec)
+            result["per_item_ns"] = round(result["median_us"] * 1000 / value, 1)
+            results[key] = result
+            print(
+                f"{key:<58} {result['median_us']:>12.2f} us  (best {result['best_us']:.2f}, "
+                f"{result['per_item_ns']:.1f} ns/{parameter[:-1]})",
+                flush=True,
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold_pct: float) -> list[str]:
+    regressions = []
+    print()
+    # Best-of-repeats is the least noisy figure for short, CPU-bound operations.
+    print(f"Comparison with baseline (best of repeats, threshold {threshold_pct:g}%):")
+    for key, result in results.items():
+        old = baseline.get("results", {}).get(key)
+        if old is None:
+            print(f"  {key:<58} new")
+            continue
+        change = (result["best_us"] - old["best_us"]) / old["best_us"] * 100 if old["best_us"] else 0.0
+        regressed = change > threshold_pct
+        if regressed:
+            regressions.append(key)
+        print(
+            f"  {key:<58} {old['best_us']:>10.2f} -> {result['best_us']:>10.2f} us "
+            f"({change:+.1f}%){' REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def parse_sizes(value: str, name: str) -> list[int]:
+    try:
+        sizes = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise SystemExit(f"--{name} must be a comma-separated list of integers")
+    if not sizes or min(sizes) <= 0:
+        raise SystemExit(f"--{name} values must be greater than 0")
+    return sizes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time the Python API's hot paths in-process, without PostgreSQL or RabbitMQ"
+    )
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--lines", default="1,15,100", help="Line counts for the domain and use-case cases")
+    parser.add_argument("--rows", default="100,1000,10000", help="Row counts for the list mapping and render cases")
+    parser.add_argument("--events", default="1,100,500", help="Event counts for the envelope cases")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per case")
+    parser.add_argument("--min-time-sec", type=float, default=0.2, help="Minimum duration of every repetition")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file for later comparisons")
+    parser.add_argument("--compare", help="Compare against a baseline JSON file; exit 1 on regressions")
+    parser.add_argument("--threshold-pct", type=float, default=10.0, help="Slowdown of the best time that counts as a regression")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.repeat <= 0:
+        raise SystemExit("--repeat must be greater than 0")
+    if args.min_time_sec <= 0:
+        raise SystemExit("--min-time-sec must be greater than 0")
+    sizes = {
+        "lines": parse_sizes(args.lines, "lines"),
+        "rows": parse_sizes(args.rows, "rows"),
+        "events": parse_sizes(args.events, "events"),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"Python {platform.python_version()} on {platform.machine()} ({platform.system()})")
+    results = run_suite(sizes, args.filter, args.repeat, args.min_time_sec)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "created_at_utc": datetime.now(timezone.utc).isoformat(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if baseline is not None:
+        if baseline.get("python") != platform.python_version():
+            print(f"\nNote: baseline was recorded on Python {baseline.get('python')}.")
+        regressions = compare(results, baseline, args.threshold_pct)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold_pct:g}%.")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()